@@ -153,7 +153,7 @@ def fix_event_video(storage_dir, event, video_info, dry_run=False):
         event_json_path = os.path.join(event_dir, "event.json")
         
         # Get event data as dictionary
-        event_dict = event.dict() if hasattr(event, 'dict') else vars(event)
+        event_dict = event.model_dump() if hasattr(event, 'model_dump') else vars(event)
         
         # Update video information
         event_dict["has_video"] = True
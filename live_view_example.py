@@ -101,11 +101,8 @@ async def main():
         
         # Create sink and client
         sink = RecorderSink(video_path)
-        client = LiveViewClient(token, args.device_id, sink, auth_manager=auth_manager)
-        
-        # Set duration
-        if args.duration:
-            client.MAX_DURATION = min(590, args.duration)
+        client = LiveViewClient(token, args.device_id, sink, auth_manager=auth_manager,
+                                max_duration=args.duration)
             
         # Start client
         try:
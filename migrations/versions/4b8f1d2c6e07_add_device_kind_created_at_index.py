@@ -0,0 +1,25 @@
+"""add_device_kind_created_at_index
+
+Revision ID: 4b8f1d2c6e07
+Revises: 7c2e9a41d5b3
+Create Date: 2026-10-15 11:02:17.846215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b8f1d2c6e07'
+down_revision = '7c2e9a41d5b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_ring_events_device_kind_created_at', 'ring_events',
+                    ['device_id', 'kind', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_ring_events_device_kind_created_at', table_name='ring_events')
@@ -0,0 +1,49 @@
+"""compress_event_data
+
+Revision ID: 7c2e9a41d5b3
+Revises: 88ede934de01
+Create Date: 2026-10-15 10:12:41.508317
+
+"""
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e9a41d5b3'
+down_revision = '88ede934de01'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Compress the existing JSON text rows, then change the column type
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, event_data FROM ring_events")).fetchall()
+    for row_id, event_data in rows:
+        if isinstance(event_data, str):
+            conn.execute(
+                sa.text("UPDATE ring_events SET event_data = :data WHERE id = :id"),
+                {"data": zlib.compress(event_data.encode('utf-8'), 6), "id": row_id}
+            )
+
+    with op.batch_alter_table('ring_events') as batch_op:
+        batch_op.alter_column('event_data', type_=sa.LargeBinary(), existing_type=sa.Text(),
+                              existing_nullable=False)
+
+
+def downgrade():
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, event_data FROM ring_events")).fetchall()
+    for row_id, event_data in rows:
+        if isinstance(event_data, bytes):
+            conn.execute(
+                sa.text("UPDATE ring_events SET event_data = :data WHERE id = :id"),
+                {"data": zlib.decompress(event_data).decode('utf-8'), "id": row_id}
+            )
+
+    with op.batch_alter_table('ring_events') as batch_op:
+        batch_op.alter_column('event_data', type_=sa.Text(), existing_type=sa.LargeBinary(),
+                              existing_nullable=False)
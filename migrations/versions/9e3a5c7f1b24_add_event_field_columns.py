@@ -0,0 +1,30 @@
+"""add_event_field_columns
+
+Revision ID: 9e3a5c7f1b24
+Revises: 4b8f1d2c6e07
+Create Date: 2026-10-15 11:41:05.203968
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e3a5c7f1b24'
+down_revision = '4b8f1d2c6e07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows keep these fields in event_data, which still takes precedence on read
+    op.add_column('ring_events', sa.Column('answered', sa.Boolean(), nullable=True))
+    op.add_column('ring_events', sa.Column('motion_detection_score', sa.Float(), nullable=True))
+    op.add_column('ring_events', sa.Column('requester', sa.String(length=100), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('ring_events') as batch_op:
+        batch_op.drop_column('requester')
+        batch_op.drop_column('motion_detection_score')
+        batch_op.drop_column('answered')
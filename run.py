@@ -15,5 +15,6 @@ if project_root not in sys.path:
 sys.path.insert(0, project_root)
 
 if __name__ == "__main__":
-    from src.main import main
+    from src.main import install_event_loop_policy, main
+    install_event_loop_policy()
     sys.exit(asyncio.run(main()))
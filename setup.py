@@ -16,16 +16,19 @@ setup(
         "structlog",
         "aiosqlite",
         "sqlalchemy",
-        "pydantic",
+        "pydantic>=2.11",
         "fastapi",
         "uvicorn",
         "python-dotenv",
         "fsspec",  # Adding fsspec as a dependency
+        "orjson",
+        "msgspec",
+        "numpy",
     ],
     entry_points={
         "console_scripts": [
             "myringdoorbell=src.main:main",
         ],
     },
-    python_requires=">=3.8",
+    python_requires=">=3.10",
 )
@@ -2,7 +2,8 @@
 
 import sys
 import asyncio
-from src.main import main
+from src.main import install_event_loop_policy, main
 
 if __name__ == "__main__":
+    install_event_loop_policy()
     sys.exit(asyncio.run(main()))
@@ -2,6 +2,7 @@
 
 import asyncio
 import gc
+import logging
 from typing import Any, Callable, Dict, List, Optional
 import json
 import weakref
@@ -13,6 +14,8 @@ from ring_doorbell.listen.eventlistener import RingEventListener as RingApiEvent
 from ..core.interfaces import IEventListener
 from ..auth.auth_manager import RingAuthManager
 
+logger = logging.getLogger("ring.events")
+
 
 class RingEventListener(IEventListener):
     """Event Listener for Ring API events."""
@@ -149,7 +152,7 @@ class RingEventListener(IEventListener):
             device_name = event.device_name if hasattr(event, 'device_name') else "Unknown Device"
             event_id = event.id if hasattr(event, 'id') else "unknown-id"
             
-            print(f"📩 Received {event_type} event from {device_name} (ID: {event_id})")
+            logger.info("📩 Received %s event from %s (ID: %s)", event_type, device_name, event_id)
             
             # Emit the specific event type
             self._emitter.emit(event_type, event)
@@ -162,10 +165,7 @@ class RingEventListener(IEventListener):
             # Also emit 'all' for listeners that want all events
             # self._emitter.emit('all', event)
         except Exception as e:
-            import traceback
-            print(f"× Error dispatching event: {e}")
-            print("Stack trace:")
-            traceback.print_exc()
+            logger.error("× Error dispatching event: %s", e, exc_info=True)
     
     async def _cleanup_fcm_resources(self) -> None:
         """Clean up Firebase Cloud Messaging resources to prevent resource leaks."""
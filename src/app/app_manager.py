@@ -214,7 +214,7 @@ class AppManager:
             
             # Start sleep prevention if enabled
             if self._sleep_prevention:
-                if self._sleep_prevention.start():
+                if await self._sleep_prevention.start():
                     mode_name = str(self._sleep_prevention.mode).split('.')[-1]
                     if self._sleep_prevention.mode == SleepMode.PREVENT_ALL:
                         logger.info(f"Sleep prevention activated with mode: {mode_name} - "
@@ -286,7 +286,7 @@ class AppManager:
             for chime in self._devices["chimes"]:
                 logger.info(f"Found Ring chime - id: {chime.id}, name: {chime.name}, type: chime")
     
-    def set_sleep_mode(self, mode: SleepMode) -> bool:
+    async def set_sleep_mode(self, mode: SleepMode) -> bool:
         """
         Change the sleep prevention mode dynamically.
         
@@ -304,7 +304,7 @@ class AppManager:
         was_active = self._sleep_prevention.is_active
         
         if was_active:
-            self._sleep_prevention.stop()
+            await self._sleep_prevention.stop_async()
             
         # Set the new mode
         self._sleep_prevention.set_mode(mode)
@@ -313,7 +313,7 @@ class AppManager:
         # If it was active, restart it
         result = True
         if was_active:
-            result = self._sleep_prevention.start()
+            result = await self._sleep_prevention.start()
             if result:
                 mode_name = str(mode).split('.')[-1]
                 if mode == SleepMode.PREVENT_ALL:
@@ -1,6 +1,7 @@
 """Authentication Manager for Ring API."""
 
 import asyncio
+import contextlib
 import getpass
 import json
 import logging
@@ -11,6 +12,7 @@ from typing import Any, Callable, Dict, Optional
 from ring_doorbell import Auth, Ring, Requires2FAError, AuthenticationError
 
 from ..core.interfaces import IAuthManager
+from ..utils.aiohttp_registry import track
 
 # Configure structured logging
 logger = logging.getLogger("ring.auth")
@@ -25,7 +27,8 @@ class RingAuthManager(IAuthManager):
         token_path: str,
         email: Optional[str] = None,
         password: Optional[str] = None,
-        fcm_token_path: Optional[str] = None
+        fcm_token_path: Optional[str] = None,
+        session: Optional[aiohttp.ClientSession] = None
     ):
         """
         Initialize the RingAuthManager.
@@ -36,11 +39,15 @@ class RingAuthManager(IAuthManager):
             email: Ring account email (optional)
             password: Ring account password (optional)
             fcm_token_path: Path to store FCM credentials (optional)
+            session: Shared aiohttp session for Ring API calls (optional). The
+                caller keeps ownership and is responsible for closing it.
         """
         self._user_agent = user_agent
         self._token_path = token_path
         self._email = email
         self._password = password
+        self._session = session
+        self._owns_session = session is None
         self._auth = None
         self._ring = None
         self._fcm_token_path = fcm_token_path or token_path.replace('.cache', '_fcm.cache')
@@ -59,6 +66,10 @@ class RingAuthManager(IAuthManager):
         # Load cached account ID if it exists
         self._load_cached_account_id()
     
+    def _http_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, or a new tracked one if none was provided."""
+        return self._session or track(aiohttp.ClientSession())
+    
     def _create_token_callback(self, token_path: str) -> Callable:
         """
         Create a token callback function.
@@ -142,7 +153,8 @@ class RingAuthManager(IAuthManager):
                 self._auth = Auth(
                     self._user_agent, 
                     json.loads(token_path_obj.read_text()), 
-                    self._token_callback
+                    self._token_callback,
+                    http_client_session=self._http_session()
                 )
                 self._ring = Ring(self._auth)
                 await self._ring.async_create_session()
@@ -188,7 +200,10 @@ class RingAuthManager(IAuthManager):
         Raises:
             AuthenticationError: If authentication fails and raise_error is True
         """
-        self._auth = Auth(self._user_agent, None, self._token_callback)
+        self._auth = Auth(
+            self._user_agent, None, self._token_callback,
+            http_client_session=self._http_session()
+        )
         self._ring = Ring(self._auth)
         
         try:
@@ -263,8 +278,8 @@ class RingAuthManager(IAuthManager):
                 # Close the auth session first
                 await self._auth.async_close()
                 
-                # Explicitly close the aiohttp session if it's still open
-                if session and not session.closed:
+                # Explicitly close the aiohttp session if it's ours and still open
+                if self._owns_session and session and not session.closed:
                     await asyncio.sleep(0.5)  # Small delay to allow other tasks to finish
                     await session.close()
                     # Wait for all connections to be closed
@@ -324,12 +339,15 @@ class RingAuthManager(IAuthManager):
         """
         # Return cached account ID if available
         if self._cached_account_id:
-            logger.info(f"Using cached account ID: {self._cached_account_id}")
+            logger.debug(f"Using cached account ID: {self._cached_account_id}")
             return self._cached_account_id
             
         try:
-            # Get the account ID directly from the API using the reliable devices endpoint
-            async with aiohttp.ClientSession() as session:
+            # Get the account ID directly from the API using the reliable devices endpoint,
+            # reusing the shared session (left open) when one was provided
+            session_cm = (contextlib.nullcontext(self._session) if self._session
+                          else track(aiohttp.ClientSession()))
+            async with session_cm as session:
                 headers = {"Authorization": f"Bearer {self.get_token()}"}
                 
                 logger.info("Getting account ID from ring_devices endpoint")
@@ -3,11 +3,13 @@
 import logging
 import time
 import os
-import json
 import asyncio
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Optional, Any, Type, Union, Tuple
 
+import aiohttp
+import orjson
 from pydantic import ValidationError
 from ring_doorbell.event import RingEvent
 from ring_doorbell import Ring
@@ -33,7 +35,11 @@ logger = logging.getLogger(__name__)
 class CaptureEngine:
     """Engine for processing Ring events and storing them."""
     
-    def __init__(self, storages: List[IStorage], ring_api: Optional[Ring] = None, auth_manager: Optional[IAuthManager] = None):
+    # Seconds a finished event's completion signal is kept for late waiters
+    COMPLETION_TTL = 300
+    
+    def __init__(self, storages: List[IStorage], ring_api: Optional[Ring] = None, auth_manager: Optional[IAuthManager] = None,
+                 session: Optional[aiohttp.ClientSession] = None):
         """
         Initialize the CaptureEngine.
         
@@ -41,10 +47,12 @@ class CaptureEngine:
             storages: List of storage implementations to use
             ring_api: Optional authenticated Ring API instance for direct API calls
             auth_manager: Optional authentication manager for token management
+            session: Optional shared aiohttp session passed on to live view clients
         """
         self._storages = storages
         self._ring_api = ring_api
         self._auth_manager = auth_manager
+        self._session = session
         self._event_types = {
             "ding": DingEventData,
             "motion": MotionEventData,
@@ -59,6 +67,34 @@ class CaptureEngine:
         
         # Track active recording sessions to prevent duplicates
         self._active_recordings = {}
+        
+        # Set once an event needs no further processing (video stored or none coming)
+        self._event_done: Dict[str, asyncio.Event] = {}
+    
+    def _completion(self, event_id: str) -> asyncio.Event:
+        """Get or create the completion signal for an event."""
+        event_id = str(event_id)
+        done = self._event_done.get(event_id)
+        if done is None:
+            done = self._event_done[event_id] = asyncio.Event()
+        return done
+    
+    def _mark_done(self, event_id: str) -> None:
+        """Signal that an event is fully processed, and forget it after COMPLETION_TTL."""
+        self._completion(event_id).set()
+        asyncio.get_running_loop().call_later(self.COMPLETION_TTL, self._event_done.pop, str(event_id), None)
+    
+    async def wait_for_completion(self, event_id: str) -> None:
+        """
+        Wait until an event passed to capture() is fully processed.
+        
+        That is once its recording has been copied to the event directory, or
+        as soon as it's known no recording will be made for it.
+        
+        Args:
+            event_id: ID of the captured event
+        """
+        await self._completion(event_id).wait()
     
     async def capture(self, event: Union[Dict[str, Any], RingEvent]) -> None:
         """
@@ -68,6 +104,8 @@ class CaptureEngine:
             event: Event data from the Ring API (either a RingEvent object or raw dictionary)
         """
         start_time = time.time()
+        event_id = None
+        recording = False
         
         try:
             # Determine the event type and get basic info for logging
@@ -84,6 +122,7 @@ class CaptureEngine:
                 event_id = event.get("id", "unknown-id")
             
             logger.info(f"Received event of type: {event_type} - device: {device_name}, event_id: {event_id}")
+            self._completion(event_id)
             
             # Map common fields
             processed_event = self._process_event(event)
@@ -92,15 +131,14 @@ class CaptureEngine:
                 # Store the event in all configured storages
                 success_count = 0
                 already_exists_count = 0
-                for storage in self._storages:
-                    try:
-                        result = await storage.save_event(processed_event)
-                        if result is True:  # Successfully saved
-                            success_count += 1
-                        elif result is False:  # Already exists or other issue
-                            already_exists_count += 1
-                    except Exception as e:
-                        logger.error(f"Failed to save event to storage: {e} - event_id: {processed_event.id}, storage: {storage.__class__.__name__}")
+                results = await self._save_event_to_all(processed_event)
+                for storage, result in zip(self._storages, results):
+                    if result is True:  # Successfully saved
+                        success_count += 1
+                    elif result is False:  # Already exists or other issue
+                        already_exists_count += 1
+                    elif isinstance(result, Exception):
+                        logger.error(f"Failed to save event to storage: {result} - event_id: {processed_event.id}, storage: {storage.__class__.__name__}")
                 
                 processing_time = round((time.time() - start_time) * 1000)
                 
@@ -116,6 +154,7 @@ class CaptureEngine:
                             "device_name": device_name
                         }
                         self._event_bus.emit(event_type, event_data)
+                        recording = event_type in ("ding", "motion")
                         
                 elif already_exists_count > 0:
                     logger.info(f"Event already exists in storage - event_id: {processed_event.id}, type: {event_type}, time: {processing_time}ms")
@@ -126,6 +165,10 @@ class CaptureEngine:
             trace = traceback.format_exc()
             logger.error(f"Event processing failed: {e} - event_type: {event_type if 'event_type' in locals() else 'unknown'}")
             logger.debug(f"Error details: {trace}")
+        finally:
+            # Without a recording on the way there's nothing left to wait for
+            if event_id is not None and not recording:
+                self._mark_done(event_id)
     
     async def _handle_ding_event(self, event_data: Dict[str, Any]) -> None:
         """
@@ -144,6 +187,7 @@ class CaptureEngine:
         # Check if we're already recording for this device
         if device_id in self._active_recordings:
             logger.info(f"Recording already in progress for device {device_id}")
+            self._mark_done(event.id)
             return
             
         logger.info(f"Starting video recording for ding event {event.id} on device {device_id}")
@@ -155,10 +199,12 @@ class CaptureEngine:
             # Start recording for 30 seconds
             # Note: It's critical to pass the event_id parameter here so the recording
             # callback knows which event to associate the video with
-            await self.start_live_view(device_id, duration_sec=30, event_id=event.id)
+            if not await self.start_live_view(device_id, duration_sec=30, event_id=event.id):
+                self._mark_done(event.id)
 
         except Exception as e:
             logger.error(f"Error recording video for ding event: {e}")
+            self._mark_done(event.id)
         finally:
             # Remove from active recordings
             self._active_recordings.pop(device_id, None)
@@ -180,6 +226,7 @@ class CaptureEngine:
         # Check if we're already recording for this device
         if device_id in self._active_recordings:
             logger.info(f"Recording already in progress for device {device_id}")
+            self._mark_done(event.id)
             return
             
         logger.info(f"Starting video recording for motion event {event.id} on device {device_id}")
@@ -189,10 +236,12 @@ class CaptureEngine:
         
         try:
             # Start recording for about 20 seconds (typical motion event duration)
-            await self.start_live_view(device_id, duration_sec=20, event_id=event.id)
+            if not await self.start_live_view(device_id, duration_sec=20, event_id=event.id):
+                self._mark_done(event.id)
             
         except Exception as e:
             logger.error(f"Error recording video for motion event: {e}", exc_info=True)
+            self._mark_done(event.id)
         finally:
             # Remove from active recordings
             self._active_recordings.pop(device_id, None)
@@ -332,10 +381,13 @@ class CaptureEngine:
                 "live_view",
                 f"{timestamp}.mp4"
             )
-            os.makedirs(os.path.dirname(video_path), exist_ok=True)
+            # RecorderSink creates the directory
             
             # Define callback for when recording completes
+            completion_scheduled = False
             def recording_completed(path, size):
+                nonlocal completion_scheduled
+                completion_scheduled = True
                 # Use asyncio.create_task to call the async method from a sync context
                 logger.info(f"Recording callback triggered for {path} with size {size}, event_id: {event_id}")
                 task = asyncio.create_task(self._handle_recording_completed(path, size, event_id, device_id))
@@ -347,16 +399,21 @@ class CaptureEngine:
                     except Exception as e:
                         logger.error(f"Error in recording completion task: {e}", exc_info=True)
                 task.add_done_callback(on_done)
+                
+            def recording_closed():
+                # Without a usable file (missing, too small, close cancelled) the
+                # completion callback never runs, so the event is done here
+                if event_id and not completion_scheduled:
+                    self._mark_done(event_id)
             
-            # Create recorder sink with callback and live view client
-            sink = RecorderSink(video_path, callback=recording_completed)
-            
-            # Pass auth_manager to LiveViewClient for token refreshing
-            client = LiveViewClient(token, device_id, sink, auth_manager=self._auth_manager)
+            # Create recorder sink with callbacks and live view client
+            sink = RecorderSink(video_path, callback=recording_completed, on_closed=recording_closed)
             
-            # Modify max duration if requested
-            if duration_sec is not None and isinstance(duration_sec, int):
-                client.MAX_DURATION = min(590, duration_sec)  # Cap at 590 seconds
+            # Pass auth_manager to LiveViewClient for token refreshing, and the
+            # requested duration (the client caps it at 590 seconds)
+            max_duration = duration_sec if isinstance(duration_sec, int) else None
+            client = LiveViewClient(token, device_id, sink, auth_manager=self._auth_manager,
+                                    max_duration=max_duration, session=self._session)
             
             # Start the client with retry logic handled inside LiveViewClient
             logger.info(f"Starting live view capture for device {device_id} with duration {duration_sec}s")
@@ -379,6 +436,33 @@ class CaptureEngine:
             
     
     
+    async def _save_event_to_all(self, event: EventData) -> List[Union[bool, BaseException]]:
+        """
+        Save an event to every storage concurrently.
+        
+        Storages are independent, so a slow or failing one doesn't hold up or
+        cancel the others.
+        
+        Args:
+            event: Event data to save
+            
+        Returns:
+            Per-storage results in storage order: the save_event return value,
+            or the exception it raised
+        """
+        return await asyncio.gather(
+            *(storage.save_event(event) for storage in self._storages),
+            return_exceptions=True
+        )
+    
+    def _log_video_update_results(self, event_id: str, results: List[Union[bool, BaseException]]) -> None:
+        """Log the outcome of saving a video-updated event to each storage."""
+        for storage, result in zip(self._storages, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error updating event with video info in {storage.__class__.__name__}: {result}")
+            else:
+                logger.info(f"Updated event {event_id} with video information in {storage.__class__.__name__}")
+    
     async def _update_event_with_video_info(self, event_id: str, video_path: str) -> None:
         """
         Update an event record with video information.
@@ -420,18 +504,18 @@ class CaptureEngine:
             )
             
             # Create the directory if it doesn't exist
-            os.makedirs(event_dir, exist_ok=True)
+            await asyncio.to_thread(os.makedirs, event_dir, exist_ok=True)
             
             # Create the destination path for the video
             event_video_path = os.path.join(event_dir, "video.mp4")
             
             # Copy the video file from the live_view directory to the event directory
             import shutil
-            shutil.copy2(video_path, event_video_path)
+            await asyncio.to_thread(shutil.copy2, video_path, event_video_path)
             logger.info(f"Copied video from {video_path} to {event_video_path}")
             
             # Update the event with the new video path
-            event_dict = event.dict()
+            event_dict = event.model_dump()
             event_dict["has_video"] = True
             event_dict["video_path"] = event_video_path
             
@@ -439,19 +523,14 @@ class CaptureEngine:
         except Exception as e:
             logger.error(f"Error copying video file to event directory: {e}")
             # Still update the event with the original video path
-            event_dict = event.dict()
+            event_dict = event.model_dump()
             event_dict["has_video"] = True
             event_dict["video_path"] = video_path
         event_class = self._event_types.get(event_type, EventData)
         updated_event = event_class(**event_dict)
         
         # Save the updated event back to all storages
-        for storage in self._storages:
-            try:
-                await storage.save_event(updated_event)
-                logger.info(f"Updated event {event_id} with video information in {storage.__class__.__name__}")
-            except Exception as e:
-                logger.error(f"Error updating event with video info in {storage.__class__.__name__}: {e}")
+        self._log_video_update_results(event_id, await self._save_event_to_all(updated_event))
     
     async def _handle_recording_completed(self, video_path: str, file_size: int, event_id: Optional[str], device_id: str) -> None:
         """
@@ -465,6 +544,14 @@ class CaptureEngine:
         """
         logger.info(f"Recording completed: {video_path} ({file_size} bytes)")
         
+        try:
+            await self._store_recording(video_path, file_size, event_id, device_id)
+        finally:
+            if event_id:
+                self._mark_done(event_id)
+    
+    async def _store_recording(self, video_path: str, file_size: int, event_id: Optional[str], device_id: str) -> None:
+        """Copy a finished recording to its event directory, or store it as a live view clip."""
         # Skip if the file is too small or doesn't exist
         if not os.path.exists(video_path):
             logger.warning(f"Video file doesn't exist: {video_path}")
@@ -505,20 +592,20 @@ class CaptureEngine:
             
             # Create the directory if it doesn't exist
             try:
-                os.makedirs(event_dir, exist_ok=True)
+                await asyncio.to_thread(os.makedirs, event_dir, exist_ok=True)
                 
                 # Create the destination path for the video
                 event_video_path = os.path.join(event_dir, "video.mp4")
                 
                 # Copy the video file from the live_view directory to the event directory
                 import shutil
-                shutil.copy2(video_path, event_video_path)
+                await asyncio.to_thread(shutil.copy2, video_path, event_video_path)
                 logger.info(f"Copied video from {video_path} to {event_video_path}")
                 
                 # Update the event with video information
                 if event:
                     # Create updated event object
-                    event_dict = event.dict()
+                    event_dict = event.model_dump()
                     event_dict["has_video"] = True
                     event_dict["video_path"] = event_video_path
                     
@@ -527,12 +614,7 @@ class CaptureEngine:
                     updated_event = event_class(**event_dict)
                     
                     # Save the updated event to all storages
-                    for storage in self._storages:
-                        try:
-                            await storage.save_event(updated_event)
-                            logger.info(f"Updated event {event_id} with video information in {storage.__class__.__name__}")
-                        except Exception as e:
-                            logger.error(f"Error updating event with video info in {storage.__class__.__name__}: {e}")
+                    self._log_video_update_results(event_id, await self._save_event_to_all(updated_event))
                 else:
                     # If we couldn't retrieve the event, at least create an event.json file
                     event_json_path = os.path.join(event_dir, "event.json")
@@ -546,8 +628,10 @@ class CaptureEngine:
                     }
                     
                     try:
-                        with open(event_json_path, 'w') as f:
-                            json.dump(event_data, f, default=str, indent=2)
+                        await asyncio.to_thread(
+                            Path(event_json_path).write_bytes,
+                            orjson.dumps(event_data, default=str)
+                        )
                         logger.info(f"Created event.json for {event_id} with video information")
                     except Exception as e:
                         logger.error(f"Error creating event.json: {e}")
@@ -566,13 +650,16 @@ class CaptureEngine:
                 "capture_date": datetime.now().isoformat()
             }
             
-            # Store in all storages
-            for storage in self._storages:
-                try:
-                    await storage.save_video(generic_id, video_path, metadata)
+            # Store in all storages concurrently
+            results = await asyncio.gather(
+                *(storage.save_video(generic_id, video_path, metadata) for storage in self._storages),
+                return_exceptions=True
+            )
+            for storage, result in zip(self._storages, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error saving video to storage {storage.__class__.__name__}: {result}")
+                else:
                     logger.info(f"Saved video to storage {storage.__class__.__name__}")
-                except Exception as e:
-                    logger.error(f"Error saving video to storage {storage.__class__.__name__}: {e}")
                     
         # Emit an event for the completed recording
         self._event_bus.emit("recording_completed", {
@@ -1,26 +1,154 @@
 """LiveViewClient for WebRTC-based Ring doorbell live view streaming."""
 
 import asyncio
-import json
+import contextlib
 import logging
+import os
+import random
+import re
 import time
 import uuid
+from typing import Optional, Union
+
 import aiohttp
+import msgspec
+import orjson
 from websockets.asyncio.client import connect
 
 from aiortc import (
     RTCPeerConnection, RTCSessionDescription,
-    RTCConfiguration, RTCIceServer, 
-    RTCIceCandidate
+    RTCConfiguration, RTCIceServer
 )
+from aiortc.sdp import candidate_from_sdp
 
 from ..core.interfaces import VideoSink, IAuthManager
+from ..utils.aiohttp_registry import track
 from ..utils.connection_monitor import ConnectionMonitor
 from .video_sinks import RecorderSink
 
 # Configure structured logging
 logger = logging.getLogger("ring.live")
 
+# Exception messages that indicate the signalling/media connection was lost
+_CONN_ERR_RE = re.compile(r"connection|closed|shutdown|reset|404", re.IGNORECASE)
+# Connection losses that are likely caused by an expired ticket
+_RESET_RE = re.compile(r"reset by peer|\b404\b", re.IGNORECASE)
+
+
+# ——————————————————————————— signalling message schema ——————————————————————————— #
+# Only the fields the client reads are declared; anything else Ring sends is ignored.
+
+class _Reason(msgspec.Struct):
+    """Reason attached to a close message."""
+    code: Optional[int] = None
+    text: Optional[str] = None
+
+
+class _Candidate(msgspec.Struct):
+    """ICE candidate trickled by Ring."""
+    candidate: str
+    sdpMid: Optional[str] = None
+    sdpMLineIndex: Optional[int] = None
+
+
+class _Body(msgspec.Struct):
+    """Body of a signalling message."""
+    session_id: Optional[str] = None
+    sdp: Optional[str] = None
+    text: Optional[str] = None
+    reason: Union[_Reason, str, None] = None
+    candidate: Optional[_Candidate] = None
+
+
+class _Message(msgspec.Struct):
+    """Signalling message received over the WebSocket."""
+    method: Optional[str] = None
+    body: Optional[_Body] = None
+
+
+_EMPTY_BODY = _Body()
+_MESSAGE_DECODER = msgspec.json.Decoder(_Message)
+
+
+def _convert_or_none(value, type_):
+    """Convert a decoded JSON value to a schema type, or None if it doesn't fit."""
+    try:
+        return msgspec.convert(value, type_, strict=False)
+    except msgspec.ValidationError:
+        return None
+
+
+def _decode_message(packet) -> _Message:
+    """
+    Decode a signalling message, salvaging what it can from unexpected shapes.
+    
+    A message that is valid JSON but doesn't match the schema (e.g. a close
+    reason whose code is a string) is decoded leniently: fields that can be
+    coerced are kept and the rest are dropped, so handlers still see the
+    method and can act on it.
+    
+    Args:
+        packet: Raw WebSocket message
+        
+    Returns:
+        The decoded message
+        
+    Raises:
+        msgspec.DecodeError: If the packet isn't JSON at all
+    """
+    try:
+        return _MESSAGE_DECODER.decode(packet)
+    except msgspec.ValidationError as e:
+        logger.warning(f"Unexpected message from Ring ({e}): {packet[:120]}")
+    
+    data = orjson.loads(packet)
+    if not isinstance(data, dict):
+        return _Message()
+    body = data.get("body")
+    if isinstance(body, dict):
+        body = _Body(**{
+            field.name: _convert_or_none(body.get(field.name), field.type)
+            for field in msgspec.structs.fields(_Body)
+        })
+    else:
+        body = None
+    return _Message(method=_convert_or_none(data.get("method"), Optional[str]), body=body)
+
+
+class UUIDPool:
+    """
+    Pool of pre-generated random (version 4) UUIDs.
+    
+    ``uuid.uuid4()`` reads 16 bytes from ``os.urandom`` on every call. The pool
+    reads the entropy for a whole batch of UUIDs at once and slices it, refilling
+    when the batch is exhausted.
+    """
+    
+    def __init__(self, size: int = 32):
+        """
+        Initialize the UUIDPool.
+        
+        Args:
+            size: Number of UUIDs to generate per entropy read
+        """
+        self._size = size
+        self._buf = b""
+        self._index = size  # Force a refill on first use
+        
+    def uuid4(self) -> uuid.UUID:
+        """
+        Get the next random UUID from the pool.
+        
+        Returns:
+            A version 4 UUID
+        """
+        if self._index >= self._size:
+            self._buf = os.urandom(16 * self._size)
+            self._index = 0
+        start = self._index * 16
+        self._index += 1
+        return uuid.UUID(bytes=self._buf[start:start + 16], version=4)
+
 
 class LiveViewClient:
     """
@@ -48,9 +176,39 @@ class LiveViewClient:
     CONNECTION_CHECK_INTERVAL = 15
     # Maximum consecutive errors before triggering reconnection
     MAX_CONSECUTIVE_ERRORS = 3
+    # Host probed after a system wake to detect that the network is back
+    NETWORK_PROBE_HOST = "app.ring.com"
+    # Maximum seconds to wait for the network after a system wake
+    NETWORK_PROBE_TIMEOUT = 2.0
+    # Seconds allowed for one probe connection, including its DNS lookup
+    NETWORK_PROBE_ATTEMPT_TIMEOUT = 1.0
+    # Seconds to collect a burst of remote ICE candidates before adding them
+    ICE_BATCH_DELAY = 0.01
+    # Background tasks cancelled by stop()
+    TASK_NAMES = ('_keepalive_task', '_timeout_task', '_monitor_task', '_track_task',
+                  '_message_handler_task', '_ticket_refresh_task', '_ice_drain_task')
+    # Seconds to wait for cancelled tasks to finish during stop()
+    TASK_STOP_TIMEOUT = 2.0
+    # Seconds to wait for the connections to close during stop()
+    CLOSE_TIMEOUT = 3.0
+    # Seconds to wait for the sink to close during stop(); a recording sink
+    # flushes its encoders and finalizes the file, which takes longer
+    SINK_CLOSE_TIMEOUT = 30.0
+    
+    # Fixed attribute layout - one client exists per camera, so skip the per-instance __dict__
+    __slots__ = (
+        "_token", "_dev", "_sink", "_auth_manager", "_pc", "_ws", "_stop",
+        "_track_added", "_uuid_pool", "_dialog_id", "_session_id", "_account_id",
+        "_seq", "_connection_attempts", "_connection_backoff", "_ticket", "_region",
+        "_ticket_updated_at", "_enable_wake_detection", "_connection_monitor",
+        "_max_duration", "_track_task", "_monitor_task", "_keepalive_task",
+        "_timeout_task", "_message_handler_task", "_ticket_refresh_task",
+        "_pending_ice", "_ice_drain_task", "_restart_task", "_http_session",
+    )
 
     def __init__(self, auth_token: str, device_id: str, video_sink: VideoSink, auth_manager: IAuthManager = None, 
-                 enable_wake_detection: bool = True):
+                 enable_wake_detection: bool = True, max_duration: Optional[int] = None,
+                 session: Optional[aiohttp.ClientSession] = None):
         """
         Initialize the LiveViewClient.
         
@@ -60,17 +218,21 @@ class LiveViewClient:
             video_sink: Sink implementation for receiving video frames
             auth_manager: Optional authentication manager for advanced auth operations
             enable_wake_detection: Whether to enable wake detection to reconnect after system sleep
+            max_duration: Optional session duration in seconds, capped at MAX_DURATION
+            session: Optional shared aiohttp session for ticket requests, owned by the caller
         """
         self._token = auth_token
         self._dev = device_id
         self._sink = video_sink
         self._auth_manager = auth_manager
+        self._http_session = session
         self._pc = None
         self._ws = None
         self._stop = asyncio.Event()
         self._track_added = False
-        self._dialog_id = str(uuid.uuid4())
-        self._session_id = str(uuid.uuid4())
+        self._uuid_pool = UUIDPool()
+        self._dialog_id = str(self._uuid_pool.uuid4())
+        self._session_id = str(self._uuid_pool.uuid4())
         self._account_id = None
         self._seq = 1
         self._connection_attempts = 0
@@ -80,6 +242,16 @@ class LiveViewClient:
         self._ticket_updated_at = 0  # Start with immediate refresh
         self._enable_wake_detection = enable_wake_detection
         self._connection_monitor = None
+        self._pending_ice = []
+        self._track_task = None
+        self._monitor_task = None
+        self._keepalive_task = None
+        self._timeout_task = None
+        self._message_handler_task = None
+        self._ticket_refresh_task = None
+        self._ice_drain_task = None
+        self._restart_task = None
+        self._max_duration = min(self.MAX_DURATION, max_duration) if max_duration else self.MAX_DURATION
         
     async def _check_and_refresh_ticket(self) -> tuple:
         """
@@ -181,6 +353,9 @@ class LiveViewClient:
         """
         Get the Ring account ID using the authentication token or auth manager.
         
+        The auth manager persists the account ID to disk after the first lookup,
+        so this does not hit the Ring API on restarts once the cache exists.
+        
         Returns:
             int: The Ring account ID
             
@@ -220,7 +395,9 @@ class LiveViewClient:
         """
         logger.info("Requesting signalsocket ticket...")
         try:
-            async with aiohttp.ClientSession() as session:
+            session_cm = (contextlib.nullcontext(self._http_session) if self._http_session
+                          else track(aiohttp.ClientSession()))
+            async with session_cm as session:
                 response = await session.post(
                     "https://app.ring.com/api/v1/clap/ticket/request/signalsocket",
                     headers={"Authorization": f"Bearer {self._token}"}
@@ -283,7 +460,7 @@ class LiveViewClient:
     async def start(self):
         """
         Start a WebRTC live view session with Ring:
-        1. Create WebRTC peer connection and generate offer
+        1. Create WebRTC peer connection and generate offer (while fetching the ticket)
         2. Connect to WebSocket and send the offer
         3. Handle SDP answer and ICE candidates
         4. Start media pipeline
@@ -320,45 +497,28 @@ class LiveViewClient:
                 raise ValueError("Account ID is required for Ring WebRTC streaming")
             
             # Generate session and dialog IDs
-            self._session_id = str(uuid.uuid4())
-            self._dialog_id = str(uuid.uuid4())
+            self._session_id = str(self._uuid_pool.uuid4())
+            self._dialog_id = str(self._uuid_pool.uuid4())
             self._seq = 1
             
             logger.info(f"Generated session IDs: session_id={self._session_id[:8]}, dialog_id={self._dialog_id[:8]}")
             
-            # Get fresh auth ticket and determine WebSocket URL
-            self._ticket, self._region = await self._check_and_refresh_ticket()
+            # Get a fresh auth ticket while the peer connection builds its offer,
+            # so the ticket request overlaps with SDP generation and ICE gathering
+            peer_task = asyncio.create_task(self._create_peer_connection())
+            try:
+                self._ticket, self._region = await self._check_and_refresh_ticket()
+                await peer_task
+            except BaseException:
+                # Don't leave the offer building after a failed ticket or a cancel
+                peer_task.cancel()
+                await asyncio.gather(peer_task, return_exceptions=True)
+                raise
+            
+            # Determine WebSocket URL
             ws_url = await self._build_ws_url(self._ticket, self._region)
             logger.info(f"Connecting to WebSocket URL: {ws_url[:60]}...")
             
-            # Create RTCPeerConnection with ICE servers for better connectivity
-            rtc_config = RTCConfiguration([
-                RTCIceServer(urls=["stun:stun.l.google.com:19302"]),
-                RTCIceServer(urls=["stun:stun1.l.google.com:19302"]),
-                RTCIceServer(urls=["stun:stun2.l.google.com:19302"]),
-            ])
-            self._pc = RTCPeerConnection(configuration=rtc_config)
-            
-            # Add transceiver in receive-only mode for video
-            self._pc.addTransceiver("video", direction="recvonly")
-            
-            # Set up track handler
-            @self._pc.on("track")
-            async def on_track(track):
-                logger.info(f"Track received - kind: {track.kind}")
-                # Create a task and store it for proper cleanup later
-                self._track_task = asyncio.create_task(self._on_track(track))
-                self._track_task.add_done_callback(
-                    lambda _: logger.debug("Track task completed")
-                )
-            
-            # Create offer
-            offer = await self._pc.createOffer()
-            await self._pc.setLocalDescription(offer)
-            
-            # Wait for ICE gathering to complete
-            await self._wait_for_ice_gathering()
-            
             # Connect to WebSocket and start signaling
             try:
                 self._ws = await connect(
@@ -481,6 +641,56 @@ class LiveViewClient:
                 await self.stop()
                 return False
 
+    async def _create_peer_connection(self):
+        """
+        Create the RTCPeerConnection and generate the local SDP offer.
+        
+        This sets up a receive-only video transceiver, registers the track
+        handler, creates and applies the offer, then waits for enough ICE
+        candidates to be gathered.
+        
+        If this fails or is cancelled, or stop() clears self._pc meanwhile,
+        the connection it created is closed here.
+        
+        Raises:
+            Exception: If the peer connection or offer cannot be created
+        """
+        # Create RTCPeerConnection with ICE servers for better connectivity
+        rtc_config = RTCConfiguration([
+            RTCIceServer(urls=["stun:stun.l.google.com:19302"]),
+            RTCIceServer(urls=["stun:stun1.l.google.com:19302"]),
+            RTCIceServer(urls=["stun:stun2.l.google.com:19302"]),
+        ])
+        pc = self._pc = RTCPeerConnection(configuration=rtc_config)
+        try:
+            # Add transceiver in receive-only mode for video
+            pc.addTransceiver("video", direction="recvonly")
+            
+            # Set up track handler
+            @pc.on("track")
+            async def on_track(track):
+                logger.info(f"Track received - kind: {track.kind}")
+                # Create a task and store it for proper cleanup later
+                self._track_task = asyncio.create_task(self._on_track(track))
+                self._track_task.add_done_callback(
+                    lambda _: logger.debug("Track task completed")
+                )
+            
+            # Create offer
+            offer = await pc.createOffer()
+            await pc.setLocalDescription(offer)
+            
+            # Wait for ICE gathering to complete
+            await self._wait_for_ice_gathering(pc)
+            
+            if self._pc is not pc:
+                raise RuntimeError("Peer connection was closed while creating the offer")
+        except BaseException:
+            if self._pc is pc:
+                self._pc = None
+            await self._close_peer_connection(pc)
+            raise
+
     async def _build_ws_url(self, ticket, region):
         """
         Build the WebSocket URL based on ticket and region.
@@ -500,7 +710,7 @@ class LiveViewClient:
             raise ValueError("No ticket available for WebSocket connection")
             
         # Create a client ID
-        client_id = f"ring_site-{uuid.uuid4()}"
+        client_id = f"ring_site-{self._uuid_pool.uuid4()}"
         
         # Determine the host based on region
         if region:
@@ -517,7 +727,7 @@ class LiveViewClient:
         
         return ws_url
 
-    async def _wait_for_ice_gathering(self):
+    async def _wait_for_ice_gathering(self, pc):
         """
         Wait for ICE gathering to complete or until we have usable candidates.
         
@@ -531,6 +741,9 @@ class LiveViewClient:
         
         We proceed when either condition is met, with a timeout as fallback.
         
+        Args:
+            pc: The peer connection gathering candidates
+            
         Raises:
             Exception: If an error occurs during the ICE gathering process
         """
@@ -542,21 +755,22 @@ class LiveViewClient:
         candidate_count = 0
         
         # Track candidates as they come in
-        @self._pc.on("icecandidate")
+        @pc.on("icecandidate")
         def on_ice_candidate(candidate):
             nonlocal candidate_count
             if candidate:
                 candidate_count += 1
-                logger.debug(f"ICE candidate gathered: {candidate.candidate}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("ICE candidate gathered: %s", candidate.candidate)
                 
                 # After we have at least 2 candidates, we can proceed
                 if candidate_count >= 2 and not have_candidates.done():
                     have_candidates.set_result(None)
         
         # Handle ICE gathering state changes
-        @self._pc.on("icegatheringstatechange")
+        @pc.on("icegatheringstatechange")
         def on_ice_gathering_state_change():
-            if self._pc.iceGatheringState == "complete":
+            if pc.iceGatheringState == "complete":
                 if not gather_complete.done():
                     gather_complete.set_result(None)
         
@@ -597,12 +811,13 @@ class LiveViewClient:
         if not self._ws or self._stop.is_set():
             return
             
-        logger.debug(f"Sending ICE candidate: {candidate.candidate}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sending ICE candidate: %s", candidate.candidate)
         
         try:
-            await self._ws.send(json.dumps({
+            await self._ws.send(orjson.dumps({
                 "dialog_id": self._dialog_id,
-                "riid": uuid.uuid4().hex,
+                "riid": self._uuid_pool.uuid4().hex,
                 "method": "icecandidate",
                 "body": {
                     "doorbot_id": int(self._dev),
@@ -612,7 +827,7 @@ class LiveViewClient:
                         "sdpMLineIndex": candidate.sdpMLineIndex,
                     }
                 }
-            }))
+            }).decode())
         except Exception as e:
             logger.error(f"Error sending ICE candidate: {e}")
     
@@ -631,9 +846,9 @@ class LiveViewClient:
         logger.info("Starting WebRTC session with SDP offer")
         
         # Send the initial live_view request with our SDP offer
-        await self._ws.send(json.dumps({
+        await self._ws.send(orjson.dumps({
             "dialog_id": self._dialog_id,
-            "riid": uuid.uuid4().hex,
+            "riid": self._uuid_pool.uuid4().hex,
             "method": "live_view",
             "body": {
                 "doorbot_id": int(self._dev),
@@ -644,100 +859,156 @@ class LiveViewClient:
                     "ptz_enabled": False
                 }
             }
-        }))            # Handle responses from Ring
-        session_jwt = None
-        camera_started = False
+        }).decode())
+        
+        # Handle responses from Ring until the session is established
+        state = {"session_jwt": None, "camera_started": False}
         while True:
             if self._stop.is_set():
                 raise RuntimeError("Client stopped during session setup")
                 
             packet = await self._ws.recv()
             try:
-                data = json.loads(packet)
-            except json.JSONDecodeError:
+                message = _decode_message(packet)
+            except msgspec.DecodeError:
                 logger.error(f"Non-JSON reply: {packet[:120]}")
                 raise ValueError("Invalid response from Ring server")
                 
-            logger.debug(f"Received message: {data.get('method')}")
-            
-            method = data.get("method")
+            method = message.method
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Received message: %s", method)
             
-            # Handle session created message
-            if method == "session_created":
-                session_jwt = data["body"]["session_id"]
-                logger.info(f"Received session JWT: {session_jwt[:10]}...")
-                continue
-                
-            # Handle SDP answer in live_view response
-            if method == "live_view" and "sdp" in data["body"]:
-                logger.info("Received SDP answer in live_view response")
-                await self._pc.setRemoteDescription(
-                    RTCSessionDescription(data["body"]["sdp"], "answer")
-                )
-                # We don't return yet - we wait for camera_started
-                continue
-                
-            # Direct SDP message
-            if method == "sdp":
-                logger.info("Received direct SDP message")
-                if "sdp" in data.get("body", {}):
-                    await self._pc.setRemoteDescription(
-                        RTCSessionDescription(data["body"]["sdp"], "answer")
-                    )
+            handler = self._SETUP_HANDLERS.get(method)
+            if handler is None:
+                # Unknown message - log it but don't fail
+                logger.info(f"Unrecognized message method: {method} - {packet[:100]}")
                 continue
                 
-            # Handle camera_started event - this indicates we're ready to receive video
-            if method == "camera_started":
-                logger.info("📷 Camera started and ready to stream")
-                camera_started = True
-                if session_jwt:
-                    # Only return after we've both established the session and 
-                    # confirmed the camera is started
-                    return session_jwt
-                continue
-                
-            # Handle notification messages
-            if method == "notification":
-                notification = data.get("body", {})
-                text = notification.get("text", "No text")
-                logger.info(f"📢 Received notification: {text}")
-                
-                # Check for important status notifications
-                if "ready" in text.lower():
-                    logger.info("Camera indicates it's ready")
-                continue
-                
-            # Handle ICE candidates from Ring
-            if method == "icecandidate":
-                try:
-                    c = data["body"]["candidate"]
-                    await self._pc.addIceCandidate(
-                        RTCIceCandidate(
-                            sdpMid=c["sdpMid"],
-                            sdpMLineIndex=c["sdpMLineIndex"],
-                            candidate=c["candidate"]
-                        )
-                    )
-                    logger.debug("Added ICE candidate from Ring")
-                    continue
-                except Exception as e:
-                    logger.warning(f"Error adding ICE candidate: {e}")
-                    continue
-                    
-            # Handle close messages
-            if method == "close":
-                if data.get("body", {}).get("reason", {}).get("code") == 26:
-                    # Not ready yet, wait and continue
-                    logger.debug("Got 'not ready yet' (code 26), waiting 300ms")
-                    await asyncio.sleep(0.3)
-                    continue
-                else:
-                    # Other close reason
-                    reason = data.get("body", {}).get("reason", "No reason given")
-                    raise RuntimeError(f"Ring closed connection: {reason}")
-                    
-            # Unknown message - log it but don't fail
-            logger.info(f"Unrecognized message method: {method} - {json.dumps(data)[:100]}")
+            session_jwt = await handler(self, message.body or _EMPTY_BODY, state)
+            if session_jwt:
+                return session_jwt
+    
+    # ——————————————————————————— session setup message handlers ——————————————————————————— #
+    # Each handler receives the message body and the shared setup state, and returns the
+    # session JWT once the session is ready to stream (None to keep waiting).
+    
+    async def _setup_session_created(self, body, state):
+        """Store the session JWT from a session_created message."""
+        state["session_jwt"] = body.session_id
+        logger.info(f"Received session JWT: {state['session_jwt'][:10]}...")
+        # The camera may already have reported that it started
+        if state["camera_started"]:
+            return state["session_jwt"]
+        
+    async def _setup_live_view(self, body, state):
+        """Apply the SDP answer carried in a live_view response."""
+        sdp = body.sdp
+        if sdp:
+            logger.info("Received SDP answer in live_view response")
+            await self._pc.setRemoteDescription(
+                RTCSessionDescription(sdp, "answer")
+            )
+        # We don't return yet - we wait for camera_started
+        
+    async def _setup_sdp(self, body, state):
+        """Apply the SDP answer from a direct sdp message."""
+        logger.info("Received direct SDP message")
+        sdp = body.sdp
+        if sdp:
+            await self._pc.setRemoteDescription(
+                RTCSessionDescription(sdp, "answer")
+            )
+            
+    async def _setup_camera_started(self, body, state):
+        """Handle camera_started - this indicates we're ready to receive video."""
+        logger.info("📷 Camera started and ready to stream")
+        state["camera_started"] = True
+        # Only return after we've both established the session and
+        # confirmed the camera is started
+        return state["session_jwt"]
+        
+    async def _setup_notification(self, body, state):
+        """Log notification messages received during setup."""
+        text = body.text or "No text"
+        logger.info(f"📢 Received notification: {text}")
+        
+        # Check for important status notifications
+        if "ready" in text.lower():
+            logger.info("Camera indicates it's ready")
+            
+    async def _setup_icecandidate(self, body, state):
+        """Queue an ICE candidate sent by Ring to be added with the rest of its burst."""
+        try:
+            c = body.candidate
+            # Parse the SDP "candidate:..." line straight into an RTCIceCandidate
+            sdp_line = c.candidate
+            if sdp_line.startswith("candidate:"):
+                sdp_line = sdp_line[len("candidate:"):]
+            candidate = candidate_from_sdp(sdp_line)
+            candidate.sdpMid = c.sdpMid
+            candidate.sdpMLineIndex = c.sdpMLineIndex
+            self._pending_ice.append(candidate)
+        except Exception as e:
+            logger.warning(f"Error parsing ICE candidate: {e}")
+            return
+            
+        if self._ice_drain_task is None or self._ice_drain_task.done():
+            self._ice_drain_task = asyncio.create_task(self._drain_ice())
+            
+    async def _drain_ice(self):
+        """Add all queued ICE candidates to the peer connection in one batch."""
+        # Let the rest of the burst arrive before draining
+        await asyncio.sleep(self.ICE_BATCH_DELAY)
+        
+        # Candidates queued while a batch is being added are picked up by the next pass
+        while self._pending_ice and self._pc:
+            batch, self._pending_ice = self._pending_ice, []
+            results = await asyncio.gather(
+                *(self._pc.addIceCandidate(c) for c in batch), return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.warning(f"Error adding ICE candidate: {result}")
+            logger.debug(f"Added {len(batch)} ICE candidate(s) from Ring")
+            
+    async def _setup_close(self, body, state):
+        """Handle close messages, waiting out 'not ready yet' and failing otherwise."""
+        reason = body.reason
+        code = reason.code if isinstance(reason, _Reason) else None
+        if code == 26:
+            # Not ready yet, wait and continue
+            logger.debug("Got 'not ready yet' (code 26), waiting 300ms")
+            await asyncio.sleep(0.3)
+            return None
+        # Other close reason
+        raise RuntimeError(f"Ring closed connection: {reason or 'No reason given'}")
+    
+    # Session setup handlers keyed by message method
+    _SETUP_HANDLERS = {
+        "session_created": _setup_session_created,
+        "live_view": _setup_live_view,
+        "sdp": _setup_sdp,
+        "camera_started": _setup_camera_started,
+        "notification": _setup_notification,
+        "icecandidate": _setup_icecandidate,
+        "close": _setup_close,
+    }
+        
+    async def _wait_for_stop(self, timeout):
+        """
+        Wait until the client is stopped or the timeout elapses.
+        
+        Args:
+            timeout: Maximum number of seconds to wait
+            
+        Returns:
+            bool: True if the client was stopped, False if the timeout elapsed
+        """
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
         
     async def _keepalive_webrtc_session(self, session_jwt):
         """
@@ -750,31 +1021,33 @@ class LiveViewClient:
             session_jwt: The session JWT token received during connection setup
         """
         consecutive_errors = 0
+        backoff_time = 1.0  # Start with 1 second backoff
+        
+        # Only the request ID changes between pings, so serialize the rest once
+        ping_prefix, ping_suffix = orjson.dumps({
+            "method": "ping",
+            "dialog_id": self._dialog_id,
+            "riid": "__RIID__",
+            "body": {
+                "doorbot_id": int(self._dev),
+                "session_id": session_jwt
+            }
+        }).decode().split('"__RIID__"')
         
         while not self._stop.is_set():
             try:
                 # Send the ping message with a unique request ID
-                await self._ws.send(json.dumps({
-                    "method": "ping",
-                    "dialog_id": self._dialog_id,
-                    "riid": uuid.uuid4().hex,  # Adding unique request ID for each ping
-                    "body": {
-                        "doorbot_id": int(self._dev),
-                        "session_id": session_jwt
-                    }
-                }))
+                await self._ws.send(f'{ping_prefix}"{self._uuid_pool.uuid4().hex}"{ping_suffix}')
                 
                 logger.debug("Sent ping keepalive")
                 
-                # Reset error counter on successful ping
+                # Reset error counter and backoff on successful ping
                 consecutive_errors = 0
+                backoff_time = 1.0
                 
-                # Wait for next ping interval with short timeouts to be responsive to cancellation
-                remaining = self.PING_INTERVAL
-                while remaining > 0 and not self._stop.is_set():
-                    sleep_time = min(0.5, remaining)  # Sleep at most 0.5 seconds at a time
-                    await asyncio.sleep(sleep_time)
-                    remaining -= sleep_time
+                # Wait for next ping interval, waking early if the client is stopped
+                if await self._wait_for_stop(self.PING_INTERVAL):
+                    break
                 
             except asyncio.CancelledError:
                 logger.info("Keepalive task cancelled")
@@ -793,8 +1066,9 @@ class LiveViewClient:
                     await self.stop()
                     break
                 
-                # For fewer consecutive errors, wait a bit and continue
-                await asyncio.sleep(1)
+                # For fewer consecutive errors, back off with jitter and continue
+                await asyncio.sleep(backoff_time + random.random() * 0.25 * backoff_time)
+                backoff_time = min(backoff_time * 2, self.MAX_BACKOFF)
 
     async def _ticket_refresh_loop(self):
         """Periodically check and refresh the signalsocket ticket."""
@@ -808,12 +1082,9 @@ class LiveViewClient:
                 # Reset backoff on success
                 backoff_time = 5
                 
-                # Wait for next check interval with short timeouts to be responsive to cancellation
-                remaining = self.TICKET_CHECK_INTERVAL
-                while remaining > 0 and not self._stop.is_set():
-                    sleep_time = min(1.0, remaining)  # Sleep at most 1 second at a time
-                    await asyncio.sleep(sleep_time)
-                    remaining -= sleep_time
+                # Wait for next check interval, waking early if the client is stopped
+                if await self._wait_for_stop(self.TICKET_CHECK_INTERVAL):
+                    break
                     
             except asyncio.CancelledError:
                 logger.debug("Ticket refresh loop cancelled")
@@ -836,60 +1107,87 @@ class LiveViewClient:
         self._stop.set()
         logger.info("Stopping LiveViewClient")
         
-        # Cancel all running tasks first
-        for task_name in ('_keepalive_task', '_timeout_task', '_monitor_task', '_track_task', 
-                         '_message_handler_task', '_ticket_refresh_task'):
-            if hasattr(self, task_name) and getattr(self, task_name):
-                task = getattr(self, task_name)
-                if not task.done():
-                    logger.debug(f"Canceling {task_name} task")
-                    task.cancel()
-                    try:
-                        await asyncio.wait_for(task, timeout=2.0)
-                    except (asyncio.CancelledError, asyncio.TimeoutError):
-                        logger.debug(f"Task {task_name} canceled or timed out")
-                    except Exception as e:
-                        logger.warning(f"Error waiting for {task_name} task: {e}")
-                setattr(self, task_name, None)
-        
-        # Close WebRTC connection with a timeout to prevent hanging
-        if self._pc:
-            logger.debug("Closing RTCPeerConnection")
+        # Cancel all running tasks first, then wait for them together. The task
+        # calling stop() (e.g. keepalive giving up) is left to finish on its own.
+        current = asyncio.current_task()
+        tasks = []
+        for task_name in self.TASK_NAMES:
+            task = getattr(self, task_name)
+            if task and not task.done() and task is not current:
+                logger.debug(f"Canceling {task_name} task")
+                task.cancel()
+                tasks.append(task)
+            setattr(self, task_name, None)
+            
+        if tasks:
             try:
-                close_task = asyncio.create_task(self._pc.close())
-                await asyncio.wait_for(close_task, timeout=3.0)
+                await asyncio.wait_for(
+                    asyncio.gather(*tasks, return_exceptions=True),
+                    timeout=self.TASK_STOP_TIMEOUT
+                )
             except asyncio.TimeoutError:
-                logger.warning("RTCPeerConnection close timed out")
-            except Exception as e:
-                logger.warning(f"Error closing RTCPeerConnection: {e}")
+                logger.debug(f"Some tasks did not stop within {self.TASK_STOP_TIMEOUT} seconds")
+        
+        # The sink closes alongside the connections but on its own, longer timeout,
+        # so a slow network close can't cut a recording off before it's finalized
+        sink_closer = asyncio.create_task(self._close_sink())
+        
+        # Close the peer connection, WebSocket and connection monitor concurrently
+        # under a single timeout to prevent hanging
+        closers = []
+        if self._pc:
+            closers.append(self._close_peer_connection(self._pc))
             self._pc = None
-            
-        # Close WebSocket connection
         if self._ws:
-            logger.debug("Closing WebSocket connection")
-            try:
-                await self._ws.close()
-            except Exception as e:
-                logger.warning(f"Error closing WebSocket connection: {e}")
+            closers.append(self._close_websocket(self._ws))
             self._ws = None
+        if self._connection_monitor:
+            closers.append(self._stop_connection_monitor(self._connection_monitor))
+            self._connection_monitor = None
             
-        # Close video sink
         try:
-            logger.debug("Closing video sink")
+            await asyncio.wait_for(asyncio.gather(*closers), timeout=self.CLOSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Closing connections timed out after {self.CLOSE_TIMEOUT} seconds")
+            
+        try:
+            await asyncio.wait_for(sink_closer, timeout=self.SINK_CLOSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Closing video sink timed out after {self.SINK_CLOSE_TIMEOUT} seconds")
+        
+        logger.info("LiveViewClient stopped")
+
+    async def _close_peer_connection(self, pc):
+        """Close the RTCPeerConnection, logging any error."""
+        logger.debug("Closing RTCPeerConnection")
+        try:
+            await pc.close()
+        except Exception as e:
+            logger.warning(f"Error closing RTCPeerConnection: {e}")
+            
+    async def _close_websocket(self, ws):
+        """Close the WebSocket connection, logging any error."""
+        logger.debug("Closing WebSocket connection")
+        try:
+            await ws.close()
+        except Exception as e:
+            logger.warning(f"Error closing WebSocket connection: {e}")
+            
+    async def _close_sink(self):
+        """Close the video sink, logging any error."""
+        logger.debug("Closing video sink")
+        try:
             await self._sink.close()
         except Exception as e:
             logger.warning(f"Error closing video sink: {e}")
             
-        # Stop connection monitor if active
-        if self._connection_monitor:
-            try:
-                await self._connection_monitor.stop()
-                self._connection_monitor = None
-                logger.debug("Connection monitor stopped")
-            except Exception as e:
-                logger.warning(f"Error stopping connection monitor: {e}")
-        
-        logger.info("LiveViewClient stopped")
+    async def _stop_connection_monitor(self, monitor):
+        """Stop the connection monitor, logging any error."""
+        try:
+            await monitor.stop()
+            logger.debug("Connection monitor stopped")
+        except Exception as e:
+            logger.warning(f"Error stopping connection monitor: {e}")
 
     # ——————————————————————————————————— internal helpers ——————————————————————————————————— #
 
@@ -926,25 +1224,27 @@ class LiveViewClient:
             logger.info("Started video sink")
         
         frame_count = 0
-        start_time = time.time()
+        start_time = time.monotonic()
+        next_frame = None
         
         try:
             while not self._stop.is_set():
                 try:
-                    # Use wait_for with a timeout to make cancellation more responsive
-                    frame = await asyncio.wait_for(track.recv(), timeout=1.0)
+                    # stop() cancels this task, which interrupts recv()
+                    if next_frame is None:
+                        next_frame = asyncio.ensure_future(track.recv())
+                    frame = await next_frame
+                    # Receive the next frame while this one is written to the sink
+                    next_frame = asyncio.ensure_future(track.recv())
                     frame_count += 1
                     
-                    # Log frame info at reasonable intervals
-                    if frame_count == 1 or frame_count % 100 == 0:
-                        elapsed = time.time() - start_time
+                    # Log frame info every 128 frames
+                    if frame_count == 1 or (frame_count & 0x7F) == 0:
+                        elapsed = time.monotonic() - start_time
                         fps = frame_count / elapsed if elapsed > 0 else 0
                         logger.info(f"Receiving video - frames: {frame_count}, fps: {fps:.1f}")
                     
                     await self._sink.write(frame)
-                except asyncio.TimeoutError:
-                    # Just a timeout, check stop flag and continue
-                    continue
                 except asyncio.CancelledError:
                     logger.info("Track receiving cancelled")
                     break
@@ -953,13 +1253,18 @@ class LiveViewClient:
                         # If we're stopping, don't log expected errors
                         break
                     
-                    logger.error(f"Error receiving frame: {e}")
-                    if "Connection" in str(e) or any(x in str(e).lower() for x in ["closed", "shutdown", "reset"]):
+                    # A failed receive must be restarted; a failed write keeps the pending receive
+                    if next_frame is not None and next_frame.done():
+                        next_frame = None
+                    
+                    msg = str(e)
+                    logger.error(f"Error receiving frame: {msg}")
+                    if _CONN_ERR_RE.search(msg):
                         # Connection errors should trigger a stop
                         logger.warning("Connection error in track handling, stopping client")
                         
                         # If this is a connection reset error, force ticket refresh on next attempt
-                        if "reset by peer" in str(e).lower():
+                        if _RESET_RE.search(msg):
                             logger.warning("Connection reset by peer detected - forcing ticket refresh on next attempt")
                             
                             # Try to explicitly refresh the auth token if we have an auth manager
@@ -983,6 +1288,8 @@ class LiveViewClient:
                     # For other errors, we'll log but continue trying
                     await asyncio.sleep(0.1)
         finally:
+            if next_frame is not None and not next_frame.done():
+                next_frame.cancel()
             logger.info(f"Track handler exiting after {frame_count} frames")
             if hasattr(track, 'stop') and callable(track.stop):
                 try:
@@ -991,14 +1298,13 @@ class LiveViewClient:
                     logger.debug(f"Error stopping track: {e}")
             
             # Release any resources associated with the track
-            if hasattr(self, '_track_task') and self._track_task:
-                self._track_task = None
+            self._track_task = None
 
     async def _monitor_connection_state(self):
         """
         Monitor the ICE connection state and take action when it changes.
         
-        This method continuously checks the WebRTC connection state and:
+        This method wakes on each iceconnectionstatechange event and:
         - Logs state changes for debugging and monitoring
         - Attempts to recover from failed states with a recovery timeout
         - Stops the client when the connection fails permanently
@@ -1013,16 +1319,30 @@ class LiveViewClient:
         """
         prev_state = None
         connection_established = False
+        state_changed = asyncio.Event()
+        
+        # Wake only on ICE state transitions instead of polling the state
+        @self._pc.on("iceconnectionstatechange")
+        def on_ice_connection_state_change():
+            state_changed.set()
+            
+        async def wait_for_change(timeout=None):
+            change_wait = asyncio.ensure_future(state_changed.wait())
+            stop_wait = asyncio.ensure_future(self._stop.wait())
+            try:
+                await asyncio.wait({change_wait, stop_wait}, timeout=timeout,
+                                   return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                change_wait.cancel()
+                stop_wait.cancel()
         
         try:
             while not self._stop.is_set():
+                state_changed.clear()
                 state = self._pc.iceConnectionState if self._pc else None
-                if not state:
-                    await asyncio.sleep(0.5)
-                    continue
                     
                 # Log state changes
-                if state != prev_state:
+                if state and state != prev_state:
                     logger.info(f"ICE connection state changed to: {state}")
                     prev_state = state
                     
@@ -1036,13 +1356,16 @@ class LiveViewClient:
                             recovery_timeout = 10  # seconds
                             recovery_deadline = asyncio.get_event_loop().time() + recovery_timeout
                             
-                            while (asyncio.get_event_loop().time() < recovery_deadline and 
-                                   not self._stop.is_set()):
-                                await asyncio.sleep(1)
+                            while not self._stop.is_set():
+                                state_changed.clear()
                                 # Check if state has improved
                                 if self._pc and self._pc.iceConnectionState in ["connected", "completed"]:
                                     logger.info("✅ ICE connection recovered")
                                     break
+                                remaining = recovery_deadline - asyncio.get_event_loop().time()
+                                if remaining <= 0:
+                                    break
+                                await wait_for_change(remaining)
                             
                             # If we're still failed after the timeout, stop
                             if self._pc and self._pc.iceConnectionState == "failed" and not self._stop.is_set():
@@ -1051,14 +1374,15 @@ class LiveViewClient:
                                 break
                         except Exception as e:
                             logger.error(f"Error during connection recovery: {e}")
+                        continue
                         
                     elif state == "connected" or state == "completed":
                         if not connection_established:
                             connection_established = True
                             logger.info("🎉 WebRTC connection established successfully")
                     
-                # Use shorter sleep time for better responsiveness to cancellation
-                await asyncio.sleep(0.5)
+                # Sleep until the next state transition or until the client is stopped
+                await wait_for_change()
         except asyncio.CancelledError:
             logger.debug("Connection monitor task cancelled")
         except Exception as e:
@@ -1089,53 +1413,34 @@ class LiveViewClient:
         try:
             while not self._stop.is_set() and self._ws:
                 try:
-                    # Set a timeout to make this responsive to cancellation
-                    message_task = asyncio.create_task(self._ws.recv())
+                    # Cancellation from stop() propagates straight into recv()
+                    packet = await self._ws.recv()
+                    
+                    # Reset error counter on successful message
+                    consecutive_errors = 0
+                    
+                    # Parse the message
                     try:
-                        packet = await asyncio.wait_for(message_task, timeout=2.0)
-                        
-                        # Reset error counter on successful message
-                        consecutive_errors = 0
+                        message = _decode_message(packet)
+                    except msgspec.DecodeError:
+                        # Nothing to act on in a non-JSON message
+                        logger.warning(f"Skipping non-JSON message from Ring: {packet[:120]}")
+                        continue
+                    
+                    # Handle various message types
+                    if message.method:
+                        method = message.method
                         
-                        # Parse the message
-                        try:
-                            data = json.loads(packet)
-                        except json.JSONDecodeError:
-                            # Skip non-JSON messages silently
+                        # Skip logging for ping and pong messages
+                        if method in ("ping", "pong"):
                             continue
-                        
-                        # Handle various message types
-                        if "method" in data:
-                            method = data["method"]
-                            
-                            # Skip logging for ping and pong messages
-                            if method in ["ping", "pong"]:
-                                continue
-                                
-                            logger.debug(f"Received message method: {method}")
-                            
-                            # Handle close messages as critical
-                            if method == "close":
-                                reason = data.get("body", {}).get("reason", {})
-                                code = reason.get("code")
-                                text = reason.get("text", "Unknown reason")
-                                
-                                logger.warning(f"Received close message: code={code}, reason={text}")
-                                if code not in [26]:  # 26 is "not ready" which is handled elsewhere
-                                    logger.error(f"Ring closed connection: {reason}")
-                                    await self.stop()
-                                    break
                             
-                            # Log important messages at info level
-                            if method in ["notification", "camera_started"]:
-                                body = data.get("body", {})
-                                text = body.get("text", "")
-                                if text:
-                                    logger.info(f"📢 Received notification: {text}")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Received message method: %s", method)
                         
-                    except asyncio.TimeoutError:
-                        # Just a timeout, continue checking stop flag
-                        continue
+                        handler = self._MONITOR_HANDLERS.get(method)
+                        if handler is not None and await handler(self, message.body or _EMPTY_BODY):
+                            break
                         
                 except asyncio.CancelledError:
                     logger.debug("Message monitor cancelled")
@@ -1149,16 +1454,15 @@ class LiveViewClient:
                     consecutive_errors += 1
                     
                     # Check if it's a known connection error
-                    is_connection_error = "Connection" in str(e) or any(
-                        x in str(e).lower() for x in ["closed", "shutdown", "reset", "404", "connection reset"]
-                    )
+                    msg = str(e)
+                    is_connection_error = bool(_CONN_ERR_RE.search(msg))
                     
                     # Log connection errors but not too verbosely
                     if is_connection_error:
-                        logger.warning(f"WebSocket connection error: {e} (attempt {consecutive_errors} of {max_errors})")
+                        logger.warning(f"WebSocket connection error: {msg} (attempt {consecutive_errors} of {max_errors})")
                         
                         # If we detect a connection reset or 404 error, it might be related to an expired ticket
-                        if "reset by peer" in str(e).lower() or "404" in str(e):
+                        if _RESET_RE.search(msg):
                             logger.warning("Connection reset or 404 detected - likely expired ticket. Forcing refresh.")
                             
                             # Try to explicitly refresh the auth token if we have an auth manager
@@ -1183,7 +1487,7 @@ class LiveViewClient:
                             break
                     else:
                         # For other errors, log once but not repeatedly
-                        logger.warning(f"WebSocket message error: {e}")
+                        logger.warning(f"WebSocket message error: {msg}")
                         
                     # Wait a bit then continue
                     await asyncio.sleep(0.2)
@@ -1195,33 +1499,62 @@ class LiveViewClient:
                 logger.error(f"Unhandled error in message monitor: {e}")
                 await self.stop()
 
+    # ——————————————————————————— monitor message handlers ——————————————————————————— #
+    # Each handler receives the message body and returns True to stop monitoring.
+    
+    async def _monitor_close(self, body):
+        """Handle close messages as critical, stopping the client unless 'not ready'."""
+        reason = body.reason
+        if not isinstance(reason, _Reason):
+            reason = _Reason(text=reason)
+        code = reason.code
+        text = reason.text or "Unknown reason"
+        
+        logger.warning(f"Received close message: code={code}, reason={text}")
+        if code not in [26]:  # 26 is "not ready" which is handled elsewhere
+            logger.error(f"Ring closed connection: {reason}")
+            await self.stop()
+            return True
+        return False
+        
+    async def _monitor_notification(self, body):
+        """Log important messages at info level."""
+        text = body.text
+        if text:
+            logger.info(f"📢 Received notification: {text}")
+        return False
+    
+    # Monitor handlers keyed by message method
+    _MONITOR_HANDLERS = {
+        "close": _monitor_close,
+        "notification": _monitor_notification,
+        "camera_started": _monitor_notification,
+    }
+        
     async def _timeout_guard(self):
         """
         Enforce a maximum duration for the WebRTC session to conserve resources.
         
-        This method automatically stops the session after MAX_DURATION seconds to:
+        This method automatically stops the session after the configured duration to:
         - Prevent battery drain on battery-powered Ring devices (they disconnect 
           after 10 minutes anyway)
         - Ensure resources are properly released even during long-running sessions
         - Allow for periodic reconnection to maintain stable streams
         
         Implementation:
-        - Sets a timer for MAX_DURATION (default: 590 seconds/9.8 minutes)
+        - Sets a timer for the session duration (default: MAX_DURATION, 590 seconds/9.8 minutes)
         - On timeout expiration, logs info and stops the client gracefully
         - Can be cancelled early if the client is stopped for other reasons
         
         The method is automatically started when a live view session begins.
         """
-        logger.info(f"Timeout guard started - session will end after {self.MAX_DURATION} seconds")
+        logger.info(f"Timeout guard started - session will end after {self._max_duration} seconds")
         try:
-            # Wait for the maximum duration
-            await asyncio.sleep(self.MAX_DURATION)
-            
-            # If we reach here without being cancelled, it's time to stop
-            if not self._stop.is_set():
-                logger.info(f"Maximum session duration reached, stopping after {self.MAX_DURATION} seconds")
+            # Wait for the maximum duration, ending early if the client is stopped
+            if not await self._wait_for_stop(self._max_duration):
+                logger.info(f"Maximum session duration reached, stopping after {self._max_duration} seconds")
                 # User-facing message with emoji for visibility in console output
-                logger.warning(f"⏱️ Maximum session duration reached, disconnecting after {self.MAX_DURATION} seconds")
+                logger.warning(f"⏱️ Maximum session duration reached, disconnecting after {self._max_duration} seconds")
                 await self.stop()
                 
         except asyncio.CancelledError:
@@ -1292,10 +1625,16 @@ class LiveViewClient:
         
         # Try to stop gracefully, then restart
         try:
+            # Only one restart at a time - a newer wake supersedes a pending one
+            if self._restart_task and not self._restart_task.done():
+                self._restart_task.cancel()
+                await asyncio.gather(self._restart_task, return_exceptions=True)
+                
             await self.stop()
             
-            # Wait a moment for network to stabilize
-            await asyncio.sleep(2)
+            # Wait for the network to come back, but no longer than needed
+            if not await self._wait_for_network():
+                logger.warning("Network still unreachable after wake, restarting anyway")
             
             # Reset connection counters to avoid hitting limits
             self._connection_attempts = 0
@@ -1303,6 +1642,49 @@ class LiveViewClient:
             
             # Attempt to restart
             logger.info("Attempting to restart livestream after wake")
-            restart_task = asyncio.create_task(self.start())
+            self._restart_task = asyncio.create_task(self.start(), name="ring-wake-restart")
+            self._restart_task.add_done_callback(self._on_restart_done)
         except Exception as e:
             logger.error(f"Error handling wake event: {e}")
+            
+    async def _wait_for_network(self) -> bool:
+        """
+        Probe Ring's API host until it accepts a TCP connection.
+        
+        Each attempt gets up to NETWORK_PROBE_ATTEMPT_TIMEOUT, which also
+        covers the DNS lookup. Attempts that fail fast (e.g. no route yet)
+        are retried after a delay backing off from 50 ms to 400 ms, so a fast
+        wake reconnects almost immediately.
+        
+        Returns:
+            bool: True if the host became reachable within NETWORK_PROBE_TIMEOUT
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.NETWORK_PROBE_TIMEOUT
+        delay = 0.05
+        
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.NETWORK_PROBE_HOST, 443),
+                    timeout=min(self.NETWORK_PROBE_ATTEMPT_TIMEOUT, remaining)
+                )
+            except (OSError, asyncio.TimeoutError):
+                await asyncio.sleep(min(delay, max(0.0, deadline - loop.time())))
+                delay = min(delay * 2, 0.4)
+                continue
+            
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+            return True
+        return False
+        
+    def _on_restart_done(self, task: asyncio.Task) -> None:
+        """Log the outcome of a wake-triggered restart."""
+        if task.cancelled():
+            logger.debug("Wake restart cancelled")
+        elif task.exception():
+            logger.error(f"Failed to restart livestream after wake: {task.exception()}")
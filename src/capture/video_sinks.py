@@ -1,40 +1,439 @@
 """Video sink implementations for the LiveViewClient."""
 
 import asyncio
+import collections
+import functools
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
-from aiortc.contrib.media import MediaRecorder
+import av
+import numpy as np
+from aiortc.mediastreams import MediaStreamError, MediaStreamTrack
+from av import VideoFrame
 
 from ..core.interfaces import VideoSink, IStorage
+from ..utils.fs import ensure_dir, in_parent_dir
 
 logger = logging.getLogger("ring.video")
 
+# H.264 encoders in order of preference: hardware first, libx264 as the fallback
+H264_ENCODERS = ("h264_videotoolbox", "h264_nvenc", "h264_qsv", "h264_v4l2m2m", "libx264")
+
+def _preallocate(path: str, size: int) -> bool:
+    """
+    Reserve disk blocks for a file that is about to be written incrementally.
+    
+    Args:
+        path: Existing file to extend
+        size: Number of bytes to reserve from the start of the file
+        
+    Returns:
+        True if the space was reserved, False if unsupported here
+    """
+    if not hasattr(os, "posix_fallocate"):
+        return False
+    try:
+        fd = os.open(path, os.O_RDWR)
+    except OSError:
+        return False
+    try:
+        os.posix_fallocate(fd, 0, size)
+        return True
+    except OSError:
+        # Filesystems without fallocate support (some network mounts)
+        return False
+    finally:
+        os.close(fd)
+
+
+def _mp4_end(path: str) -> int:
+    """
+    Find where the MP4 data in a file ends by walking its top-level boxes.
+    
+    Anything after the last box (e.g. zeroed preallocated space) is not
+    part of the movie.
+    
+    Args:
+        path: MP4 file to inspect
+        
+    Returns:
+        Offset just past the last complete top-level box
+    """
+    end = 0
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        while end + 8 <= file_size:
+            f.seek(end)
+            header = f.read(16)
+            size, box_type = int.from_bytes(header[:4], "big"), header[4:8]
+            if not box_type.isalnum():
+                break
+            if size == 1:
+                # 64-bit size follows the type
+                size = int.from_bytes(header[8:16], "big")
+            elif size == 0:
+                # Box runs to the end of the file
+                return file_size
+            if size < 8 or end + size > file_size:
+                break
+            end += size
+    return end
+
+
+def _as_view(frame) -> Tuple[np.ndarray, Optional[int]]:
+    """
+    Expose a video frame's luma plane as a read-only ndarray without copying.
+    
+    Args:
+        frame: Planar video frame (av.VideoFrame) from aiortc
+        
+    Returns:
+        Tuple of (height x width uint8 view of plane 0, presentation timestamp)
+    """
+    plane = frame.planes[0]
+    # Rows may be padded beyond the visible width, so slice the padding off the view
+    view = np.frombuffer(plane, dtype=np.uint8).reshape(plane.height, plane.line_size)[:, :plane.width]
+    view.flags.writeable = False
+    return view, frame.pts
+
+
+@functools.lru_cache(maxsize=None)
+def _encoder_opens(name: str, width: int, height: int, options: Tuple[Tuple[str, str], ...] = ()) -> bool:
+    """
+    Check whether an encoder can be opened for a frame size.
+    
+    An encoder compiled into FFmpeg may still be unusable (no GPU, no device
+    node), and hardware encoders often reject sizes they can't handle. The
+    result is cached for the life of the process.
+    
+    Args:
+        name: FFmpeg encoder name
+        width: Frame width in pixels
+        height: Frame height in pixels
+        options: Encoder options, as sorted (key, value) pairs
+        
+    Returns:
+        bool: True if the encoder opened
+    """
+    try:
+        ctx = av.CodecContext.create(name, "w")
+        ctx.width, ctx.height = width, height
+        ctx.pix_fmt = "yuv420p"
+        ctx.time_base = Fraction(1, 30)
+        ctx.options = dict(options)
+        ctx.open()
+    except Exception as e:
+        logger.debug(f"H.264 encoder {name} unavailable at {width}x{height}: {e}")
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def _select_h264_encoder() -> str:
+    """
+    Pick the first H.264 encoder from H264_ENCODERS that can actually be opened.
+    
+    Each candidate is opened on a tiny test frame size, which rules out
+    encoders without usable hardware. The result is cached for the life of
+    the process.
+    
+    Returns:
+        str: The codec name to record with
+    """
+    for name in H264_ENCODERS:
+        if _encoder_opens(name, 64, 64):
+            logger.info(f"Preferred H.264 encoder: {name}")
+            return name
+    return "libx264"
+
+
+class _TrackContext:
+    """Recording state for one track."""
+    
+    __slots__ = ("stream", "task", "started")
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.task: Optional[asyncio.Task] = None
+        self.started = False
+
+
+class BatchingMediaRecorder:
+    """
+    Records aiortc tracks to a file, encoding and muxing on a dedicated worker thread.
+    
+    Offers the same addTrack/start/stop interface as aiortc's MediaRecorder,
+    but is written standalone: MediaRecorder keeps its container and
+    per-track loop private, so changing how it encodes meant overriding
+    name-mangled internals that any aiortc release could rename.
+    
+    aiortc's MediaRecorder encodes every frame and muxes every packet on the
+    event loop, where H.264 encoding competes with signalling and keepalives.
+    This recorder encodes each frame on a single-threaded executor and
+    collects the packets until FLUSH_BYTES have built up or FLUSH_INTERVAL
+    has passed, then muxes the whole batch on the same executor. One worker
+    keeps encode and mux calls in order without extra locking.
+    
+    H.264 video streams are added when a track's first frame arrives, once
+    the frame size is known. The preferred encoder is opened at that size
+    first, and libx264 is used if it fails. Muxing waits until every track
+    has its stream, since streams can't be added after the header is written.
+    
+    For MP4 output written to a path, ``preallocate`` bytes are reserved once
+    the file exists, so the filesystem allocates the clip's blocks in one go
+    rather than frame by frame. The unused tail is trimmed on stop().
+    """
+    
+    # Bytes of encoded packets to collect before muxing them
+    FLUSH_BYTES = 64 * 1024
+    # Maximum seconds packets wait before being muxed
+    FLUSH_INTERVAL = 0.5
+    
+    def __init__(self, file, format: Optional[str] = None, options: Optional[Dict[str, str]] = None,
+                 *, preallocate: int = 0, encoder_options: Optional[Dict[str, Dict[str, str]]] = None):
+        """
+        Initialize the recorder.
+        
+        Args:
+            file: Path of the file to write, or a writable file-like object
+            format: Container format; guessed from the file name if None
+            options: Additional options passed to FFmpeg
+            preallocate: Bytes to reserve up front when file is a path
+            encoder_options: FFmpeg options per video encoder name, e.g.
+                {"libx264": {"preset": "veryfast"}}; unlisted encoders use
+                their defaults
+        """
+        self._container = av.open(file=file, format=format, mode="w", options=options)
+        self._tracks: Dict[MediaStreamTrack, _TrackContext] = {}
+        # Only a file path can be reserved and trimmed
+        self._path = file if isinstance(file, str) else None
+        self._preallocate_path = self._path if preallocate else None
+        self._preallocate = preallocate
+        self._preallocated = False
+        self._encoder_options = encoder_options or {}
+        self._file_created = False
+        self._stopping = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ring-mux")
+        self._pending = []
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+        
+    def addTrack(self, track: MediaStreamTrack) -> None:
+        """
+        Add a track to be recorded, encoding video with the best available H.264 encoder.
+        
+        Args:
+            track: The aiortc MediaStreamTrack to record
+        """
+        container = self._container
+        format_name = container.format.name
+        if track.kind == "audio":
+            if format_name in ("wav", "alsa", "pulse"):
+                stream = container.add_stream("pcm_s16le")
+            elif format_name == "mp3":
+                stream = container.add_stream("mp3")
+            elif format_name in ("ogg", "opus", "webm"):
+                stream = container.add_stream("libopus")
+            else:
+                stream = container.add_stream("aac")
+        elif format_name == "image2":
+            stream = container.add_stream("png", rate=30)
+            stream.pix_fmt = "rgb24"
+        elif format_name == "webm":
+            stream = container.add_stream("libvpx", rate=30)
+            stream.pix_fmt = "yuv420p"
+        else:
+            # Added by _add_h264_stream once the first frame's size is known
+            stream = None
+        self._tracks[track] = _TrackContext(stream)
+        
+    def _add_h264_stream(self, width: int, height: int):
+        """
+        Add an H.264 stream for a frame size, on the worker thread.
+        
+        Args:
+            width: Frame width in pixels
+            height: Frame height in pixels
+            
+        Returns:
+            The new video stream
+        """
+        preferred = _select_h264_encoder()
+        codec = "libx264"
+        if preferred != codec:
+            options = tuple(sorted(self._encoder_options.get(preferred, {}).items()))
+            if _encoder_opens(preferred, width, height, options):
+                codec = preferred
+            else:
+                logger.warning(f"H.264 encoder {preferred} failed to open at {width}x{height}, using libx264")
+        
+        stream = self._container.add_stream(codec, rate=30, options=self._encoder_options.get(codec, {}))
+        stream.pix_fmt = "yuv420p"
+        stream.width, stream.height = width, height
+        return stream
+        
+    async def start(self) -> None:
+        """Start recording every added track."""
+        for track, context in self._tracks.items():
+            if context.task is None:
+                context.task = asyncio.ensure_future(self._run_track(track, context))
+        
+    async def _flush(self, force: bool = False) -> None:
+        """
+        Mux the pending packets on the worker thread.
+        
+        Args:
+            force: Mux even if some track has no stream yet (when stopping)
+        """
+        if not force and any(c.stream is None for c in self._tracks.values()):
+            return
+        batch, self._pending, self._pending_bytes = self._pending, [], 0
+        self._last_flush = time.monotonic()
+        if batch:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._mux, batch)
+            
+    def _mux(self, batch) -> None:
+        """Mux packets on the worker thread, reserving the file's space after the first batch."""
+        if self._file_created or self._path is None:
+            self._container.mux(batch)
+        else:
+            # The first mux creates the file, so its directory must still exist
+            in_parent_dir(self._path, self._container.mux, batch)
+            self._file_created = True
+        # The container only creates the file when it writes the header on the first mux
+        if self._preallocate_path and not self._preallocated:
+            self._preallocated = True
+            if not _preallocate(self._preallocate_path, self._preallocate):
+                self._preallocate_path = None
+            
+    async def _run_track(self, track: MediaStreamTrack, context: _TrackContext) -> None:
+        """Receive, encode and queue a track's frames until the track ends."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                frame = await track.recv()
+            except MediaStreamError:
+                break
+                
+            if not context.started:
+                if context.stream is None:
+                    context.stream = await loop.run_in_executor(
+                        self._executor, self._add_h264_stream, frame.width, frame.height
+                    )
+                elif isinstance(frame, VideoFrame):
+                    # Adjust the output size to match the first frame
+                    context.stream.width = frame.width
+                    context.stream.height = frame.height
+                context.started = True
+                
+            for packet in await loop.run_in_executor(self._executor, context.stream.encode, frame):
+                self._pending.append(packet)
+                self._pending_bytes += packet.size
+                
+            if (self._pending_bytes >= self.FLUSH_BYTES
+                    or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL):
+                await self._flush()
+        await self._flush()
+        
+    def _close(self) -> None:
+        """Flush the encoders and write the container trailer, on the worker thread."""
+        for context in self._tracks.values():
+            if context.started:
+                packets = context.stream.encode(None)
+                if packets:
+                    self._mux(packets)
+        self._tracks = {}
+        self._container.close()
+        self._container = None
+        
+    def _trim(self) -> None:
+        """Drop the unused preallocated tail of the file, on the worker thread."""
+        if not (self._preallocate_path and self._preallocated):
+            return
+        try:
+            os.truncate(self._preallocate_path, _mp4_end(self._preallocate_path))
+        except OSError as e:
+            logger.warning(f"Could not trim preallocated space from {self._preallocate_path}: {e}")
+        
+    async def stop(self) -> None:
+        """
+        Stop recording, muxing any batched packets before the file is closed.
+        
+        Finalizing runs in its own task, so cancelling stop() doesn't leave a
+        half-written file behind: the file is still closed and trimmed.
+        """
+        if self._stopping is None:
+            self._stopping = asyncio.ensure_future(self._stop())
+        await asyncio.shield(self._stopping)
+        
+    async def _stop(self) -> None:
+        """Finalize the recording; see stop()."""
+        try:
+            tasks = [c.task for c in self._tracks.values() if c.task is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            
+            # Queued after any encode/mux a cancelled task left on the worker
+            if self._container is not None:
+                await self._flush(force=True)
+                await asyncio.get_running_loop().run_in_executor(self._executor, self._close)
+        finally:
+            # Queued behind any mux still on the worker, so the trim runs even if
+            # finalizing fails and never races a write
+            trim = self._executor.submit(self._trim)
+            self._executor.shutdown(wait=False)
+            await asyncio.shield(asyncio.wrap_future(trim))
+
 
 class RecorderSink(VideoSink):
     """
-    Video sink that records to an MP4 file using aiortc's MediaRecorder.
+    Video sink that records to an MP4 file using BatchingMediaRecorder.
     
-    This is the simplest sink that just delegates to MediaRecorder.
+    This is the simplest sink that just delegates to the recorder.
     """
     
-    def __init__(self, path: Union[str, Path], callback=None):
+    # Seconds after the last frame to let BatchingMediaRecorder catch up before
+    # stopping it: frames its track already holds get encoded on its executor, and
+    # one full flush period lets the regular flush mux them. stop() cancels the
+    # track tasks, which would drop an encode still in flight, then muxes the rest.
+    FLUSH_DELAY = BatchingMediaRecorder.FLUSH_INTERVAL
+    
+    # Bytes reserved up front for an MP4 recording (about a 30 second clip)
+    PREALLOCATE_BYTES = 5 << 20
+    
+    __slots__ = ("_path", "_callback", "_on_closed", "_rec", "frame_count", "_last_frame_at", "_started")
+    
+    def __init__(self, path: Union[str, Path], callback=None,
+                 encoder_options: Optional[Dict[str, Dict[str, str]]] = None, on_closed=None):
         """
         Initialize the RecorderSink.
         
         Args:
             path: Path to the MP4 file to create
             callback: Optional callback function to call when recording completes
+            encoder_options: FFmpeg options per video encoder name, passed to
+                BatchingMediaRecorder
+            on_closed: Optional callback, with no arguments, called when close()
+                finishes whatever the outcome: also when the file is missing or
+                too small for callback, or close() is cancelled
         """
         self._path = str(path)
         self._callback = callback
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        self._on_closed = on_closed
+        # Ensure the directory exists; the recorder recreates it if it's removed before the first write
+        ensure_dir(os.path.dirname(self._path))
         # Create the MediaRecorder
-        self._rec = MediaRecorder(self._path)
+        preallocate = self.PREALLOCATE_BYTES if self._path.endswith(".mp4") else 0
+        self._rec = BatchingMediaRecorder(self._path, preallocate=preallocate,
+                                          encoder_options=encoder_options)
         self.frame_count = 0  # Track the number of frames processed
+        self._last_frame_at = None  # Monotonic time of the last frame, for the close flush
         self._started = False
         logger.info(f"RecorderSink initialized with path: {self._path}")
         
@@ -59,14 +458,28 @@ class RecorderSink(VideoSink):
         # MediaRecorder wants tracks, not frames
         # LiveViewClient._on_track calls self._rec.addTrack(track) instead
         self.frame_count += 1  # Increment frame counter
+        self._last_frame_at = time.monotonic()
         
-        # Log frame count at useful intervals
-        if self.frame_count == 1 or self.frame_count % 100 == 0:
-            logger.debug(f"RecorderSink received {self.frame_count} frames")
+        # Log frame count at useful intervals; isEnabledFor is cached by logging
+        # and still follows level changes made after import
+        if logger.isEnabledFor(logging.DEBUG) and (self.frame_count == 1 or self.frame_count % 100 == 0):
+            logger.debug("RecorderSink received %d frames", self.frame_count)
 
     async def close(self) -> None:
         """Close the sink and finalize the MP4 file."""
-        if hasattr(self, '_rec') and self._rec:
+        try:
+            return await self._close()
+        finally:
+            on_closed, self._on_closed = self._on_closed, None
+            if on_closed is not None:
+                try:
+                    on_closed()
+                except Exception as e:
+                    logger.error(f"Error in recorder close callback: {e}")
+                    
+    async def _close(self) -> Optional[str]:
+        """Stop the recorder and report the finished file; see close()."""
+        if self._rec:
             try:
                 logger.info(f"Stopping MediaRecorder for {self._path}")
                 
@@ -76,8 +489,12 @@ class RecorderSink(VideoSink):
                         logger.debug("MediaRecorder was never started, starting it now")
                         await self.start()
                         
-                    # Give a small delay to ensure any buffered frames are written
-                    await asyncio.sleep(0.5)
+                    # Give buffered frames time to be written, but only what's left of
+                    # FLUSH_DELAY since the last frame (nothing if no frames arrived)
+                    if self._last_frame_at is not None:
+                        remaining = self.FLUSH_DELAY - (time.monotonic() - self._last_frame_at)
+                        if remaining > 0:
+                            await asyncio.sleep(remaining)
                     
                     # Create a task to stop the recorder
                     await self._rec.stop()
@@ -88,9 +505,13 @@ class RecorderSink(VideoSink):
                 
                 self._rec = None
                 
-                # Verify file exists and has content
-                file_exists = os.path.exists(self._path)
-                file_size = os.path.getsize(self._path) if file_exists else 0
+                # Verify file exists and has content, off the event loop since the
+                # path may be on a slow network mount
+                try:
+                    st = await asyncio.to_thread(os.stat, self._path)
+                    file_exists, file_size = True, st.st_size
+                except FileNotFoundError:
+                    file_exists, file_size = False, 0
                 
                 if file_exists:
                     logger.info(f"MediaRecorder completed. Output file size: {file_size} bytes")
@@ -133,40 +554,132 @@ class CVFanoutSink(VideoSink):
     
     This is useful for both storing video and processing frames for
     computer vision tasks simultaneously.
+    
+    Each backend gets its own fixed-capacity ring buffer drained by a
+    long-lived task, so a slow backend loses its oldest frames instead of
+    stalling the WebRTC receive loop or the other backends, and memory
+    stays bounded.
+    
+    Backends receive each frame through ``write_frame(frame)``. A backend
+    that only needs pixel data can define ``write_frame_view(view, pts)``
+    instead, which takes precedence: ``view`` is a read-only ndarray over the
+    decoded frame's luma plane, built once and shared by every such backend.
+    The buffer belongs to the decoder; backends that keep the view beyond the
+    call must ``.copy()`` it.
     """
     
-    def __init__(self, *storage_backends: IStorage):
+    # Frames buffered per backend before the oldest is evicted (~2 s at 15 fps)
+    FRAME_BUFFER_SIZE = 30
+    # Seconds to wait for buffered frames to be written on close
+    DRAIN_TIMEOUT = 2.0
+    
+    __slots__ = ("_subs", "_closers", "_subs_q", "_buffer_size", "_drain_tasks", "_closing", "dropped_frames")
+    
+    def __init__(self, *storage_backends: IStorage, buffer_size: int = FRAME_BUFFER_SIZE):
         """
         Initialize the CVFanoutSink.
         
         Args:
             *storage_backends: Multiple storage backends to receive frames
+            buffer_size: Frames buffered per backend before the oldest is evicted
         """
         self._subs = storage_backends
+        # Resolve backend capabilities once rather than probing them per frame
+        self._closers = tuple(
+            s.close for s in storage_backends if callable(getattr(s, 'close', None))
+        )
+        # (write, ring, ready, wants_view) for each backend that accepts frames
+        self._subs_q = []
+        for s in storage_backends:
+            write_view = getattr(s, 'write_frame_view', None)
+            write = write_view if callable(write_view) else getattr(s, 'write_frame', None)
+            if callable(write):
+                self._subs_q.append(
+                    (write, collections.deque(maxlen=buffer_size), asyncio.Event(), write is write_view)
+                )
+        self._buffer_size = buffer_size
+        self._drain_tasks = []
+        self._closing = False  # Set by close(); drain tasks exit once their ring is empty
+        self.dropped_frames = 0  # Frames evicted from a full ring before being written
         logger.info(f"CVFanoutSink initialized with {len(storage_backends)} backends")
 
+    async def _drain(self, write, ring: collections.deque, ready: asyncio.Event) -> None:
+        """
+        Write buffered frames to a single backend until the sink closes and the ring is empty.
+        
+        Args:
+            write: The backend's write_frame or write_frame_view coroutine function
+            ring: The backend's frame ring buffer
+            ready: Event set whenever a frame is appended to the ring
+        """
+        while True:
+            if not ring:
+                if self._closing:
+                    return
+                ready.clear()
+                await ready.wait()
+                continue
+                
+            item = ring.popleft()
+            try:
+                await write(*item)
+            except Exception as e:
+                logger.error(f"Error writing frame to storage backend: {e}")
+
     async def write(self, frame) -> None:
         """
         Distribute frame to all storage backends.
         
+        The frame is buffered for every backend without waiting for them to
+        write it. Backends taking views share one zero-copy view of it.
+        
         Args:
-            frame: Video frame from aiortc
+            frame: Video frame (av.VideoFrame) from the aiortc video track
         """
         # Fan-out to N coroutines (e.g., NAS + disk + in-memory queue for CV model)
-        if hasattr(frame, "to_ndarray") and callable(frame.to_ndarray):
-            # For VideoFrame objects, convert to something storage can handle
-            tasks = []
-            for s in self._subs:
-                if hasattr(s, 'write_frame') and callable(s.write_frame):
-                    tasks.append(s.write_frame(frame))
-            if tasks:
-                await asyncio.gather(*tasks)
+        if not self._subs_q or not callable(getattr(frame, "to_ndarray", None)):
+            return
+            
+        # Drain tasks need a running loop, so start them with the first frame
+        if not self._drain_tasks:
+            self._drain_tasks = [
+                asyncio.create_task(self._drain(write, ring, ready))
+                for write, ring, ready, _ in self._subs_q
+            ]
+            
+        view = None
+        for _, ring, ready, wants_view in self._subs_q:
+            if wants_view:
+                if view is None:
+                    view = _as_view(frame)
+                item = view
+            else:
+                item = (frame,)
+            if len(ring) == self._buffer_size:
+                self.dropped_frames += 1
+            # A full deque evicts its oldest frame on append
+            ring.append(item)
+            ready.set()
 
     async def close(self) -> None:
-        """Close all storage backends."""
-        tasks = []
-        for s in self._subs:
-            if hasattr(s, 'close') and callable(s.close):
-                tasks.append(s.close())
-        if tasks:
-            await asyncio.gather(*tasks)
+        """Flush buffered frames and close all storage backends."""
+        if self._drain_tasks:
+            # Each drain task exits after writing what's buffered. No sentinel is
+            # queued, since appending one to a full ring would evict a frame.
+            self._closing = True
+            for _, _, ready, _ in self._subs_q:
+                ready.set()
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*self._drain_tasks, return_exceptions=True),
+                    timeout=self.DRAIN_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Timed out writing buffered frames to storage backends")
+            self._drain_tasks = []
+            
+        if self.dropped_frames:
+            logger.warning(f"CVFanoutSink dropped {self.dropped_frames} frames for slow backends")
+            
+        if self._closers:
+            await asyncio.gather(*(close() for close in self._closers))
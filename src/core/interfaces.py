@@ -2,9 +2,14 @@
 
 import abc
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable, Union
+from typing import Any, Dict, List, Optional, Protocol, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+__all__ = [
+    "EventData", "DingEventData", "MotionEventData", "OnDemandEventData",
+    "IStorage", "IEventListener", "VideoSink", "IAuthManager",
+]
 
 
 class EventData(BaseModel):
@@ -17,9 +22,7 @@ class EventData(BaseModel):
     has_video: bool = False
     video_path: Optional[str] = None
     
-    class Config:
-        """Pydantic configuration."""
-        extra = "allow"  # Allow extra fields
+    model_config = ConfigDict(extra="allow")  # Allow extra fields
 
 
 class DingEventData(EventData):
@@ -37,9 +40,15 @@ class OnDemandEventData(EventData):
     requester: Optional[str] = None
 
 
-@runtime_checkable
 class IStorage(Protocol):
-    """Interface for storage implementations."""
+    """
+    Interface for storage implementations.
+    
+    This is a static typing contract only. It is deliberately not
+    runtime_checkable, because isinstance() against a protocol probes every
+    member with hasattr on each call. Callers that need optional capabilities
+    should resolve the bound methods once, as CVFanoutSink does.
+    """
     
     async def save_event(self, event: EventData) -> bool:
         """
@@ -105,6 +114,9 @@ class IEventListener(abc.ABC):
 class VideoSink(abc.ABC):
     """Abstract interface for video sinks in WebRTC-based live view."""
     
+    # Lets sink implementations declare __slots__ without gaining a __dict__ here
+    __slots__ = ()
+    
     @abc.abstractmethod
     async def write(self, frame) -> None:
         """
@@ -1,29 +1,57 @@
 """Database initialization and session management."""
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import functools
+from contextlib import asynccontextmanager
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from src.config import get_config
 from src.models.base import Base
 
-# Create the SQLAlchemy engine
-config = get_config()
-SQLALCHEMY_DATABASE_URL = config.get("database_url", "sqlite:///ringdoorbell.db")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL journaling with relaxed syncing for many small event inserts.
+
+    Register as a "connect" listener on an engine's sync_engine.
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma in (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA busy_timeout=5000",
+    ):
+        cursor.execute(pragma)
+    cursor.close()
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+@functools.lru_cache(maxsize=None)
+def _database():
+    """Create the engine and sessionmaker on first use, so importing this module reads no config."""
+    url = f"sqlite+aiosqlite:///{get_config().database_path}"
+    # Async engine so queries don't block the event loop
+    engine = create_async_engine(url, pool_size=5)
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+    session_local = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    return url, engine, session_local
 
-# Create a sessionmaker
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def __getattr__(name: str):
+    """Build SQLALCHEMY_DATABASE_URL, engine and SessionLocal lazily."""
+    names = ("SQLALCHEMY_DATABASE_URL", "engine", "SessionLocal")
+    if name in names:
+        return _database()[names.index(name)]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def get_db():
+@asynccontextmanager
+async def get_db():
     """Get a database session.
-    
+
+    Usage:
+        async with get_db() as db:
+            await db.execute(...)
+
     Yields:
-        Session: A SQLAlchemy database session
+        AsyncSession: A SQLAlchemy async database session
     """
-    db = SessionLocal()
-    try:
+    async with _database()[2]() as db:
         yield db
-    finally:
-        db.close()
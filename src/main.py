@@ -3,12 +3,13 @@
 import os
 import sys
 import asyncio
+import gc
 import logging
 import signal
+import aiohttp
 import structlog
-import gc
-import weakref
 from pathlib import Path
+from structlog.stdlib import LoggerFactory
 
 # Add the project root to sys.path
 project_root = str(Path(__file__).parent.parent)
@@ -21,58 +22,59 @@ from src.api.event_listener import RingEventListener
 from src.storage.storage_impl import DatabaseStorage, FileStorage, NetworkStorage
 from src.capture.capture_engine import CaptureEngine
 from src.app.app_manager import AppManager
+from src.utils import aiohttp_registry
 from src.utils.sleep_prevention import SleepMode
-from src.config import Config as AppConfig
-
-
-# Configure structured logging
-import sys
-from structlog.stdlib import LoggerFactory
-
-# Set up the log file handler
-log_file_path = Path(__file__).parent / "ring_doorbell.log"
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler(str(log_file_path))
-    ]
-)
+from src.config import Config as AppConfig, get_config
 
-# Configure structlog
-shared_processors = [
-    structlog.contextvars.merge_contextvars,
-    structlog.processors.add_log_level,
-    structlog.processors.TimeStamper(fmt="iso"),
-]
 
-structlog.configure(
-    processors=shared_processors + [
-        structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
-    ],
-    logger_factory=LoggerFactory(),
-    cache_logger_on_first_use=True,
-)
+# Default log file, next to this module
+LOG_FILE_PATH = Path(__file__).parent / "ring_doorbell.log"
 
-# Set up different renderers for console and file outputs
-console_formatter = structlog.stdlib.ProcessorFormatter(
-    processor=structlog.dev.ConsoleRenderer(),
-    foreign_pre_chain=shared_processors,
-)
 
-file_formatter = structlog.stdlib.ProcessorFormatter(
-    processor=structlog.processors.JSONRenderer(),
-    foreign_pre_chain=shared_processors,
-)
-
-# Get console handler and apply formatter
-console_handler = logging.getLogger().handlers[0]
-console_handler.setFormatter(console_formatter)
+def init_logging(log_file: Path = LOG_FILE_PATH) -> None:
+    """
+    Configure stdlib logging and structlog for the application.
+    
+    Console output is rendered for humans and the log file gets JSON lines.
+    Called from main() rather than at import, so importing this module has no
+    side effects on logging or the filesystem.
+    
+    Args:
+        log_file: Path of the JSON log file
+    """
+    shared_processors = [
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
+        structlog.processors.TimeStamper(fmt="iso"),
+    ]
+    
+    structlog.configure(
+        processors=shared_processors + [
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        logger_factory=LoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+    
+    # Set up different renderers for console and file outputs
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(structlog.stdlib.ProcessorFormatter(
+        processor=structlog.dev.ConsoleRenderer(),
+        foreign_pre_chain=shared_processors,
+    ))
+    
+    file_handler = logging.FileHandler(str(log_file))
+    file_handler.setFormatter(structlog.stdlib.ProcessorFormatter(
+        processor=structlog.processors.JSONRenderer(),
+        foreign_pre_chain=shared_processors,
+    ))
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        handlers=[console_handler, file_handler],
+        force=True,
+    )
 
-# Get file handler and apply formatter
-file_handler = logging.getLogger().handlers[1]
-file_handler.setFormatter(file_formatter)
 
 logger = structlog.get_logger()
 
@@ -126,58 +128,61 @@ def parse_arguments():
     }
 
 
+def install_event_loop_policy() -> bool:
+    """
+    Use uvloop's faster libuv-based event loop when it is installed.
+    
+    Must be called before asyncio.run().
+    
+    Returns:
+        True if uvloop was installed, False if the default loop is used
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 async def cleanup_aiohttp_resources():
     """Clean up any remaining aiohttp resources."""
-    # Find and close any unclosed aiohttp client sessions
+    # Close any unclosed aiohttp sessions and connectors the application created
     try:
-        import aiohttp
-        import importlib
-        import sys
-        import gc
-        
-        # Force a garbage collection to ensure all objects are properly tracked
-        gc.collect()
-        
-        # Try to access the internal _sessions list in aiohttp
-        try:
-            # In newer versions of aiohttp, access to internal resources may work differently
-            if hasattr(aiohttp, '_sessions') and isinstance(aiohttp._sessions, set):
-                for session in list(aiohttp._sessions):
-                    if not session.closed:
-                        print(f"Closing session from aiohttp._sessions: {session!r}")
-                        await session.close()
-        except (AttributeError, ImportError):
-            pass  # Not available in this version
-        
-        # Get all objects in memory
-        closed_sessions = 0
-        closed_connectors = 0
+        sessions = {s for s in list(aiohttp_registry.SESSIONS) if not s.closed}
+        connectors = {c for c in list(aiohttp_registry.CONNECTORS) if not c.closed}
         
+        # Third-party libraries (e.g. ring_doorbell) open sessions the registry never
+        # sees, so sweep live objects once for any of those still open
         for obj in gc.get_objects():
-            # Look for aiohttp client sessions
             if isinstance(obj, aiohttp.ClientSession):
                 if not obj.closed:
-                    try:
-                        print(f"Closing unclosed aiohttp ClientSession: {obj!r}")
-                        await obj.close()
-                        closed_sessions += 1
-                    except Exception as e:
-                        print(f"Error closing aiohttp ClientSession: {e}")
-            
-            # Look for TCPConnector objects
+                    sessions.add(obj)
             elif isinstance(obj, aiohttp.TCPConnector):
                 if not obj.closed:
-                    try:
-                        print(f"Closing unclosed aiohttp TCPConnector: {obj!r}")
-                        await obj.close()
-                        closed_connectors += 1
-                    except Exception as e:
-                        print(f"Error closing aiohttp TCPConnector: {e}")
+                    connectors.add(obj)
+        
+        for session in sessions:
+            print(f"Closing unclosed aiohttp ClientSession: {session!r}")
+        for connector in connectors:
+            print(f"Closing unclosed aiohttp TCPConnector: {connector!r}")
+        
+        # close() returns once the underlying transports are closed, so no grace sleep is needed
+        results = await asyncio.gather(
+            *(session.close() for session in sessions),
+            *(connector.close() for connector in connectors),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Error closing aiohttp resource: {result}")
         
+        closed_sessions = sum(s.closed for s in sessions)
+        closed_connectors = sum(c.closed for c in connectors)
         print(f"Cleanup summary: closed {closed_sessions} sessions and {closed_connectors} connectors")
         
-        # Allow asyncio to run briefly to finalize closures
-        await asyncio.sleep(0.5)
+        # Let connection-lost callbacks scheduled by the closes run
+        await asyncio.sleep(0)
         
     except Exception as e:
         print(f"Error during aiohttp cleanup: {e}")
@@ -185,6 +190,7 @@ async def cleanup_aiohttp_resources():
 
 async def main():
     """Main application function."""
+    init_logging()
     print("Starting main() function execution")
     logger.info("🔔 Ring Doorbell Capture Application")
     logger.info("-------------------------------------")
@@ -195,7 +201,22 @@ async def main():
     auth_manager = None
     
     # Initialize the application configuration
-    config = AppConfig()
+    config = get_config()
+    
+    # One HTTP session for the whole application, so connections (and their
+    # TCP/TLS handshakes) are reused across storages, auth and live view
+    # aiohttp's default cap of 100 pooled connections throttles bursts of
+    # concurrent storage requests, so leave the total unbounded and only bound
+    # per host. Keep-alive stays on, but idle connections are dropped after 75s.
+    connector = aiohttp_registry.track(aiohttp.TCPConnector(
+        limit=0,
+        limit_per_host=64,
+        force_close=False,
+        keepalive_timeout=75,
+        ttl_dns_cache=300,
+        enable_cleanup_closed=True,
+    ))
+    shared_session = aiohttp_registry.track(aiohttp.ClientSession(connector=connector))
     
     # Create storage implementations
     storages = []
@@ -209,7 +230,7 @@ async def main():
     
     # Add network storage if configured
     if hasattr(config, 'network_storage_url') and config.network_storage_url:
-        storages.append(NetworkStorage(config.network_storage_url))
+        storages.append(NetworkStorage(config.network_storage_url, session=shared_session))
     
     # Create the auth manager
     auth_manager = RingAuthManager(
@@ -217,7 +238,8 @@ async def main():
         token_path=config.token_path,
         email=config.ring_email,
         password=config.ring_password,
-        fcm_token_path=os.path.join(os.path.dirname(config.token_path), 'ring_fcm.cache')
+        fcm_token_path=os.path.join(os.path.dirname(config.token_path), 'ring_fcm.cache'),
+        session=shared_session
     )
     
     # Setup signal handlers for graceful shutdown
@@ -227,8 +249,14 @@ async def main():
     
     # Register signal handlers
     loop = asyncio.get_running_loop()
+    use_loop_signals = True
     for sig in (signal.SIGINT, signal.SIGTERM):
-        loop.add_signal_handler(sig, signal_handler)
+        try:
+            loop.add_signal_handler(sig, signal_handler)
+        except NotImplementedError:
+            # Windows event loops don't support add_signal_handler
+            use_loop_signals = False
+            signal.signal(sig, lambda signum, frame: loop.call_soon_threadsafe(signal_handler))
     
     try:
         # Initialize core components
@@ -238,7 +266,7 @@ async def main():
         ring_api = auth_manager.api
         
         # Create the capture engine with the authenticated Ring API and auth manager
-        capture_engine = CaptureEngine(storages, ring_api, auth_manager)
+        capture_engine = CaptureEngine(storages, ring_api, auth_manager, session=shared_session)
         
         # Create the event listener
         event_listener = RingEventListener(ring_api, auth_manager)
@@ -275,7 +303,10 @@ async def main():
     finally:
         # Remove signal handlers
         for sig in (signal.SIGINT, signal.SIGTERM):
-            loop.remove_signal_handler(sig)
+            if use_loop_signals:
+                loop.remove_signal_handler(sig)
+            else:
+                signal.signal(sig, signal.SIG_DFL)
         
         logger.info("Performing cleanup...")
         
@@ -297,6 +328,12 @@ async def main():
             except Exception as e:
                 logger.error(f"Error closing authentication session: {e}")
         
+        # Close the shared HTTP session once everything using it has stopped
+        try:
+            await shared_session.close()
+        except Exception as e:
+            logger.error(f"Error closing shared HTTP session: {e}")
+        
         # Clean up aiohttp resources
         await cleanup_aiohttp_resources()
         
@@ -317,6 +354,7 @@ if __name__ == "__main__":
         # Update config with parsed arguments
         AppConfig.update(args)
         
+        install_event_loop_policy()
         exit_code = asyncio.run(main())
         sys.exit(exit_code or 0)
     except KeyboardInterrupt:
@@ -1,6 +1,6 @@
 """SQLAlchemy models for Ring event data."""
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, LargeBinary
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime, Float, Boolean, LargeBinary
 from sqlalchemy.sql import func
 from src.models.base import Base
 
@@ -9,6 +9,10 @@ class RingEvent(Base):
     """SQLAlchemy model for Ring events."""
     
     __tablename__ = "ring_events"
+    __table_args__ = (
+        # Per-device, per-kind time window lookups
+        Index("ix_ring_events_device_kind_created_at", "device_id", "kind", "created_at"),
+    )
     
     # Primary key and basic identification
     id = Column(String(50), primary_key=True, index=True)
@@ -21,8 +25,13 @@ class RingEvent(Base):
     device_id = Column(String(50), nullable=False, index=True)
     device_name = Column(String(100), nullable=False)
     
-    # Event specific data stored as JSON
-    event_data = Column(Text, nullable=False)
+    # Kind-specific fields, NULL for other kinds
+    answered = Column(Boolean, nullable=True)  # ding
+    motion_detection_score = Column(Float, nullable=True)  # motion
+    requester = Column(String(100), nullable=True)  # on_demand
+    
+    # Remaining event fields stored as DEFLATE-compressed JSON (empty if none)
+    event_data = Column(LargeBinary, nullable=False)
     
     # Video related fields
     has_video = Column(Boolean, nullable=False, server_default='0', index=True)
@@ -1,88 +1,602 @@
 """Storage implementations for the Ring Doorbell application."""
 
-import json
+import asyncio
+import collections
+import functools
+import glob
+import itertools
+import logging
 import os
+import shutil
+import time
+import zlib
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Type
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union, Type
 
 import sqlalchemy as sa
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.future import select
+from sqlalchemy import event as sa_event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+import aiohttp
 import fsspec
+import orjson
+from fsspec.implementations.asyn_wrapper import AsyncFileSystemWrapper
 
 from ..core.interfaces import EventData, DingEventData, MotionEventData, OnDemandEventData, IStorage
+from ..db import set_sqlite_pragmas
+from ..utils.aiohttp_registry import track
+from ..utils.fs import atomic_open
 from ..models.ring_events import RingEvent
 
+logger = logging.getLogger("ring.storage")
+
+
+# EventData model for each event kind; other kinds use the EventData base
+_EVENT_CLASSES: Mapping[str, Type[EventData]] = MappingProxyType({
+    "ding": DingEventData,
+    "motion": MotionEventData,
+    "on_demand": OnDemandEventData,
+})
+
+# EventData fields stored in their own ring_events columns
+_STANDARD_FIELDS = frozenset({"id", "kind", "created_at", "device_id", "device_name"})
+
+# Recognised video file extensions, most preferred first
+_VIDEO_EXTS = (".mp4", ".mkv", ".mov", ".avi")
+
+# Optional EventData fields promoted out of event_data -> their ring_events column
+_COLUMN_FIELDS: Mapping[str, str] = MappingProxyType({
+    "has_video": "has_video",
+    "video_path": "video_url",
+    "answered": "answered",
+    "motion_detection_score": "motion_detection_score",
+    "requester": "requester",
+})
+
+
+# Dialect INSERT constructs supporting ON CONFLICT, by dialect name
+_DIALECT_INSERTS = MappingProxyType({
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+})
+
+
+@functools.lru_cache(maxsize=None)
+def _promoted_fields(event_class: Type[EventData]) -> frozenset:
+    """Fields of an EventData class that are kept out of the event_data blob."""
+    return _STANDARD_FIELDS | (_COLUMN_FIELDS.keys() & event_class.model_fields.keys())
+
+
+def _pick_video_file(paths: List[str]) -> Optional[str]:
+    """Return the path with the most preferred video extension, or None if none match."""
+    best, best_rank = None, len(_VIDEO_EXTS)
+    for path in paths:
+        lowered = path.lower()
+        if not lowered.endswith(_VIDEO_EXTS):
+            continue
+        rank = _VIDEO_EXTS.index(os.path.splitext(lowered)[1])
+        if rank < best_rank:
+            best, best_rank = path, rank
+    return best
+
+
+def _dumps(obj) -> bytes:
+    """Serialize to compact JSON bytes, stringifying anything orjson can't encode."""
+    return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _pack_event_data(event: EventData) -> bytes:
+    """Encode an event's remaining fields as DEFLATE-compressed JSON for the database column."""
+    # Pydantic serializes straight to JSON, skipping the intermediate dict
+    payload = event.model_dump_json(exclude=_promoted_fields(type(event)), fallback=str)
+    # Events with no extra fields store an empty blob, so reads skip decoding
+    if payload == "{}":
+        return b""
+    return zlib.compress(payload.encode('utf-8'), 6)
+
+
+def _unpack_event_data(value: Union[bytes, str]):
+    """Decode an event_data column value, accepting legacy uncompressed JSON text."""
+    if not value:
+        return {}
+    if isinstance(value, str):
+        return orjson.loads(value)
+    return orjson.loads(zlib.decompress(value))
+
+
+@functools.lru_cache(maxsize=8)
+def _get_fs(protocol: str, session: Optional[aiohttp.ClientSession] = None) -> fsspec.AbstractFileSystem:
+    """
+    Build the async filesystem for a protocol, shared by all NetworkStorage instances.
+    
+    fsspec's async API is used so calls run on the application's event loop (and
+    can reuse its session) instead of fsspec's private IO thread.
+    
+    Args:
+        protocol: fsspec protocol name, e.g. "http" or "s3"
+        session: Optional shared aiohttp session for HTTP backends
+        
+    Returns:
+        A filesystem exposing fsspec's async (underscore) methods
+    """
+    options = {}
+    if protocol in ("http", "https"):
+        async def get_client(**kwargs) -> aiohttp.ClientSession:
+            # Sessions fsspec would create itself are tracked for shutdown cleanup
+            return session if session is not None else track(aiohttp.ClientSession(**kwargs))
+        options["get_client"] = get_client
+    
+    fs = fsspec.filesystem(protocol, asynchronous=True, **options)
+    return fs if fs.async_impl else AsyncFileSystemWrapper(fs)
+
+
+def _read_json_file(path: str) -> Optional[Dict]:
+    """
+    Read and decode a JSON file in a worker thread.
+    
+    Args:
+        path: File to read
+        
+    Returns:
+        The decoded document, or None if the file doesn't exist
+    """
+    try:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def _read_event_files(pattern: str) -> List[Dict]:
+    """Read every event.json matching a glob pattern in one worker-thread call."""
+    documents = []
+    for path in glob.glob(pattern):
+        try:
+            document = _read_json_file(path)
+        except orjson.JSONDecodeError:
+            logger.warning("Skipping unreadable event file %s", path)
+            continue
+        if document is not None:
+            documents.append(document)
+    return documents
+
+
+def _copy_file(src: str, dst: str) -> None:
+    """Atomically copy a file, creating the destination directory if needed."""
+    with open(src, 'rb') as fsrc, atomic_open(dst) as fdst:
+        if not _kernel_copy(fsrc, fdst):
+            shutil.copyfileobj(fsrc, fdst)
+
+
+def _kernel_copy(fsrc, fdst) -> bool:
+    """
+    Copy between open files inside the kernel.
+    
+    Prefers os.copy_file_range, which can reflink or copy server-side on
+    filesystems that support it, then falls back to os.sendfile.
+    
+    Args:
+        fsrc: Source file opened for binary reading
+        fdst: Destination file opened for binary writing
+        
+    Returns:
+        True if the file was copied, False if neither call is available or
+        supported here and nothing was written
+    """
+    infd, outfd = fsrc.fileno(), fdst.fileno()
+    size = os.fstat(infd).st_size
+    
+    copiers = []
+    if hasattr(os, "copy_file_range"):
+        copiers.append(lambda offset: os.copy_file_range(infd, outfd, size - offset, offset, offset))
+    if hasattr(os, "sendfile"):
+        copiers.append(lambda offset: os.sendfile(outfd, infd, offset, size - offset))
+    
+    for copy in copiers:
+        offset = 0
+        try:
+            while offset < size:
+                copied = copy(offset)
+                if copied == 0:
+                    break
+                offset += copied
+        except OSError:
+            # e.g. EXDEV or ENOSYS; try the next call if nothing was written yet
+            if offset == 0:
+                continue
+            raise
+        return True
+    return False
+
+
+def _write_file(path: str, data: bytes) -> None:
+    """
+    Atomically write a file, creating its directory if needed.
+    
+    Runs in a worker thread so slow disks and NAS mounts don't block the event loop.
+    
+    Args:
+        path: Destination file path
+        data: File contents
+    """
+    with atomic_open(path) as f:
+        f.write(data)
+
+
+def _write_files(writes: List[Tuple[str, Union[bytes, Callable]]]) -> Dict[str, Exception]:
+    """
+    Atomically write several files in one worker-thread call.
+    
+    Each file is written once, with the result of all its writes in list
+    order. A callable in place of the contents updates a JSON document: it
+    gets the document as the earlier writes left it (read from disk if
+    there were none, None if the file doesn't exist) and returns the new
+    document, or None to leave it as it is.
+    
+    Args:
+        writes: (destination path, contents or update) pairs, in call order
+        
+    Returns:
+        Destination path -> error, for the files that could not be written
+    """
+    contents: Dict[str, bytes] = {}
+    errors = {}
+    for path, data in writes:
+        if path in errors:
+            continue
+        try:
+            if callable(data):
+                if path in contents:
+                    document = orjson.loads(contents[path])
+                else:
+                    document = _read_json_file(path)
+                document = data(document)
+                if document is None:
+                    continue
+                data = _dumps(document)
+            contents[path] = data
+        except Exception as e:
+            errors[path] = e
+    
+    for path, data in contents.items():
+        if path in errors:
+            continue
+        try:
+            _write_file(path, data)
+        except Exception as e:
+            errors[path] = e
+    return errors
+
+
+def _drain(queue: asyncio.Queue) -> List:
+    """Take every item still waiting in a batch writer's queue, skipping stop markers."""
+    items = []
+    while not queue.empty():
+        item = queue.get_nowait()
+        if item is not None:
+            items.append(item)
+    return items
+
+
+def _writer_running(task: Optional[asyncio.Task], owner: str) -> bool:
+    """
+    Check whether a batch writer task can take work from the running loop.
+    
+    Futures and queues belong to one event loop, so a writer still running
+    on another loop would never see work queued here.
+    
+    Args:
+        task: The current batch writer task, if any
+        owner: Storage class name for the error message
+        
+    Returns:
+        True if the writer is running on this loop, False if a new one is needed
+        
+    Raises:
+        RuntimeError: If the writer is running on another, still open loop
+    """
+    if task is None or task.done() or task.get_loop().is_closed():
+        return False
+    if task.get_loop() is not asyncio.get_running_loop():
+        raise RuntimeError(f"{owner} is already writing from another event loop")
+    return True
+
 
 class DatabaseStorage(IStorage):
     """SQLAlchemy-based database storage implementation."""
     
+    # Maximum number of events written in one transaction
+    BATCH_SIZE = 64
+    
+    # Seconds to wait for more events before committing a partial batch
+    BATCH_WINDOW = 0.05
+    
+    # Connection pool sizing for file-backed databases
+    POOL_SIZE = 10
+    POOL_MAX_OVERFLOW = 20
+    
+    # Number of recently retrieved events kept in memory
+    EVENT_CACHE_SIZE = 256
+    
+    # Rows per executemany call when bulk importing
+    IMPORT_CHUNK_SIZE = 1000
+    
     def __init__(self, database_url: str):
         """
         Initialize the DatabaseStorage.
         
         Args:
-            database_url: SQLAlchemy database URL
+            database_url: SQLAlchemy database URL for SQLite or PostgreSQL
+            
+        Raises:
+            ValueError: If the URL is for any other database
+        """
+        # A file database gets a pool sized for bursts, reusing the most recently
+        # returned connection first. In-memory databases keep SQLAlchemy's single
+        # shared connection, since every new connection would be an empty database.
+        pool_options = {}
+        if make_url(database_url).database not in (None, "", ":memory:"):
+            pool_options = dict(
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=self.POOL_SIZE,
+                max_overflow=self.POOL_MAX_OVERFLOW,
+                pool_use_lifo=True,
+            )
+        
+        # Queries here are single-table, so skip the cartesian-product lint pass
+        self._engine = create_async_engine(database_url, enable_from_linting=False, **pool_options)
+        if self._engine.dialect.name == "sqlite":
+            sa_event.listen(self._engine.sync_engine, "connect", set_sqlite_pragmas)
+        self._init_sessions(self._engine)
+    
+    @classmethod
+    def from_engine(cls, bind: Union[AsyncEngine, AsyncConnection]) -> "DatabaseStorage":
+        """
+        Create a storage on an existing engine or connection.
+        
+        The caller keeps ownership of the bind: close() flushes pending writes
+        but doesn't dispose it. When bound to a connection with a transaction
+        in progress, writes commit to savepoints inside that transaction, so
+        the caller can roll them all back (e.g. between tests).
+        
+        Args:
+            bind: The engine or connection to run sessions on
+            
+        Returns:
+            A DatabaseStorage sharing the given bind
+            
+        Raises:
+            ValueError: If the bind isn't a SQLite or PostgreSQL database
         """
-        self._engine = create_async_engine(database_url)
-        self._session_factory = sessionmaker(
-            self._engine, 
-            class_=AsyncSession, 
-            expire_on_commit=False
-        )
+        storage = cls.__new__(cls)
+        storage._engine = None
+        storage._init_sessions(bind, join_transaction_mode="create_savepoint")
+        return storage
+    
+    def _init_sessions(self, bind: Union[AsyncEngine, AsyncConnection], **session_options) -> None:
+        """Set up the session factory, caches and batch writer state for a bind."""
+        # Saves rely on INSERT ... ON CONFLICT, which only some dialects spell the same way
+        try:
+            self._insert = _DIALECT_INSERTS[bind.dialect.name]
+        except KeyError:
+            raise ValueError(
+                f"DatabaseStorage needs a SQLite or PostgreSQL database, not {bind.dialect.name!r}"
+            ) from None
+        self._session_factory = async_sessionmaker(bind, expire_on_commit=False, autoflush=False,
+                                                   **session_options)
+        # Retrieved events, dropped again whenever their row is rewritten
+        self._event_cache: "collections.OrderedDict[str, EventData]" = collections.OrderedDict()
+        # Pending (row, future) pairs, drained by the batch writer task
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
         
     async def save_event(self, event: EventData) -> bool:
         """
         Save event data to the database.
         
+        Events are queued and written in batches, one transaction per batch,
+        so bursts of events share a single commit. Saving an event that
+        already exists only rewrites it when the new copy has a video, which
+        is how recordings are attached to their event.
+        
         Args:
             event: Event data to save
             
         Returns:
-            True if saved successfully, False if already exists or failed
+            True if saved or updated with video info, False if already
+            exists or failed
+        """
+        return await self._enqueue(self._event_row(event))
+    
+    async def bulk_import(self, events: Iterable[EventData]) -> int:
         """
-        # Convert Pydantic model to dict
-        event_dict = event.dict()
+        Import a large number of events, e.g. when backfilling history.
         
-        # Extract standard fields and put the rest in event_data JSON
-        standard_fields = {"id", "kind", "created_at", "device_id", "device_name"}
-        event_data = {k: v for k, v in event_dict.items() if k not in standard_fields}
+        Rows bypass the batch writer and are written in chunks of
+        IMPORT_CHUNK_SIZE within a single transaction, so the whole import
+        commits once. Events whose id already exists are skipped unless the
+        imported copy has a video, which is then recorded on the stored event.
         
-        async with self._session_factory() as session:
-            try:
-                # Use SQLAlchemy's merge instead of add to handle existing records gracefully
-                # This performs an INSERT or UPDATE as needed
-                db_event = RingEvent(
-                    id=event.id,
-                    kind=event.kind,
-                    created_at=event.created_at,
-                    device_id=event.device_id,
-                    device_name=event.device_name,
-                    event_data=json.dumps(event_data)
-                )
-                
-                # Merge will update existing record or create new one
-                db_event = await session.merge(db_event)
-                
-                # Commit changes
-                await session.commit()
-                return True  # Indicate success
-            except sa.exc.IntegrityError as e:
-                await session.rollback()
-                if "UNIQUE constraint failed" in str(e):
-                    # This is an expected case when processing duplicate events
-                    # Log at debug level since this isn't an actual error
-                    return False  # Indicate the event already exists
-                else:
-                    # Log other integrity errors as they might indicate real issues
-                    print(f"Database integrity error saving event: {e}")
-                    return False
-            except Exception as e:
-                await session.rollback()
-                print(f"Error saving event to database: {e}")
-                return False  # Indicate failure
+        Args:
+            events: Events to import; consumed lazily, one chunk at a time
+            
+        Returns:
+            Number of events inserted or updated with video info
+            
+        Raises:
+            SQLAlchemyError: If the import fails; nothing is committed
+        """
+        stmt = self._upsert()
+        imported = 0
+        events = iter(events)
+        async with self._session_factory() as session, session.begin():
+            while chunk := list(itertools.islice(events, self.IMPORT_CHUNK_SIZE)):
+                # One row per id, so no statement touches the same row twice
+                rows = {event.id: self._event_row(event) for event in chunk}
+                result = await session.execute(stmt, list(rows.values()))
+                imported += len(result.scalars().all())
+                for event_id in rows:
+                    self._event_cache.pop(event_id, None)
+        return imported
+    
+    @staticmethod
+    def _event_row(event: EventData) -> Dict:
+        """Build the ring_events column values for an event."""
+        # Standard and promoted fields get their own columns; the rest goes in event_data JSON
+        row = {
+            "id": event.id,
+            "kind": event.kind,
+            "created_at": event.created_at,
+            "device_id": event.device_id,
+            "device_name": event.device_name,
+            "event_data": _pack_event_data(event),
+        }
+        # Every row needs the same keys for the multi-row INSERT
+        fields = type(event).model_fields
+        for field, column in _COLUMN_FIELDS.items():
+            row[column] = getattr(event, field) if field in fields else None
+        return row
+    
+    async def _enqueue(self, row: Dict) -> bool:
+        """
+        Queue a row for the batch writer and wait for its result.
+        
+        Raises:
+            RuntimeError: If the batch writer is running on another event loop
+        """
+        if not _writer_running(self._writer_task, type(self).__name__):
+            self._queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._write_batches(), name="db-batch-writer")
+            self._writer_task.add_done_callback(functools.partial(self._writer_done, self._queue))
+        
+        result = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((row, result))
+        return await result
+    
+    @staticmethod
+    def _writer_done(queue: asyncio.Queue, task: asyncio.Task) -> None:
+        """Fail the saves left in the queue when the batch writer ends, so no caller waits forever."""
+        error = None if task.cancelled() else task.exception()
+        if error is not None:
+            logger.error("Database batch writer failed: %s", error)
+        for _, result in _drain(queue):
+            if not result.done():
+                result.set_result(False)
+    
+    async def _write_batches(self) -> None:
+        """Collect queued events into batches and write each in one transaction."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        
+        # Rows taken off the queue but not written yet, failed if this task dies
+        batch: List = []
+        
+        # Only this task writes, so it can keep one session for its whole lifetime
+        try:
+            async with self._session_factory() as session:
+                while not stopping:
+                    item = await self._queue.get()
+                    if item is None:
+                        break
+                    batch = [item]
+                    
+                    # Gather more events until the batch is full or the window closes
+                    deadline = loop.time() + self.BATCH_WINDOW
+                    while len(batch) < self.BATCH_SIZE:
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            break
+                        try:
+                            item = await asyncio.wait_for(self._queue.get(), remaining)
+                        except asyncio.TimeoutError:
+                            break
+                        if item is None:
+                            stopping = True
+                            break
+                        batch.append(item)
+                    
+                    await self._write_batch(session, batch)
+                    # Don't hold the last batch's rows and futures while idle
+                    batch, item = [], None
+        finally:
+            for _, result in batch:
+                if not result.done():
+                    result.set_result(False)
+    
+    def _upsert(self):
+        """
+        Build the event INSERT used by every save path.
+        
+        Existing rows are left alone unless the new row has a video, in which
+        case its video columns and event_data replace the stored ones. The ids
+        of inserted and updated rows are returned.
+        """
+        stmt = self._insert(RingEvent)
+        return stmt.on_conflict_do_update(
+            index_elements=[RingEvent.id],
+            set_={
+                "has_video": stmt.excluded.has_video,
+                "video_url": stmt.excluded.video_url,
+                "event_data": stmt.excluded.event_data,
+            },
+            where=stmt.excluded.has_video,
+        ).returning(RingEvent.id)
+    
+    async def _write_batch(self, session: AsyncSession, batch: List) -> None:
+        """
+        Upsert a batch of event rows and resolve their futures.
+        
+        Rows whose id already exists are skipped in the same statement, so
+        duplicate events cost no extra SELECT or IntegrityError rollback.
+        A row that carries a video replaces the stored one's video columns
+        and event_data instead.
+        
+        An id queued more than once in the batch goes into a later statement
+        for each repeat, in queue order. That way every copy gets the result
+        it would have had if saved on its own, and no statement touches the
+        same row twice (PostgreSQL rejects that).
+        
+        Args:
+            session: The batch writer's long-lived session
+            batch: (row, future) pairs queued by save_event
+        """
+        rounds: List[List] = []
+        copies = collections.Counter()
+        for item in batch:
+            index = copies[item[0]["id"]]
+            copies[item[0]["id"]] += 1
+            if index == len(rounds):
+                rounds.append([])
+            rounds[index].append(item)
+        
+        saved: List[Set[str]] = []
+        try:
+            # Commits on success, rolls back on error
+            async with session.begin():
+                for items in rounds:
+                    stmt = self._upsert().values([row for row, _ in items])
+                    saved.append(set((await session.execute(stmt)).scalars().all()))
+        except Exception as e:
+            if len(batch) > 1:
+                # One bad row rolls back the whole batch, so retry each row on its
+                # own and let only the failing saves report False
+                logger.warning("Saving a batch of %d events failed, retrying one by one: %s", len(batch), e)
+                for item in batch:
+                    await self._write_batch(session, [item])
+                return
+            logger.error("Error saving events to database: %s", e)
+            saved = [set() for _ in rounds]
+        
+        for items, ids in zip(rounds, saved):
+            for row, result in items:
+                if row["id"] in ids:
+                    self._event_cache.pop(row["id"], None)
+                if not result.done():
+                    result.set_result(row["id"] in ids)
             
     async def retrieve_event(self, event_id: str) -> Optional[EventData]:
         """
@@ -94,16 +608,19 @@ class DatabaseStorage(IStorage):
         Returns:
             Event data if found, None otherwise
         """
+        cached = self._event_cache.get(event_id)
+        if cached is not None:
+            self._event_cache.move_to_end(event_id)
+            return cached.model_copy()
+        
         async with self._session_factory() as session:
-            # Query the database using SQLAlchemy
-            query = select(RingEvent).where(RingEvent.id == event_id)
-            result = await session.execute(query)
-            db_event = result.scalar_one_or_none()
+            # Primary-key lookup, no query building needed
+            db_event = await session.get(RingEvent, event_id)
             
             if not db_event:
                 return None
                 
-            # Combine standard fields with event_data JSON
+            # Combine standard and promoted columns with event_data JSON
             event_dict = {
                 "id": db_event.id,
                 "kind": db_event.kind,
@@ -111,32 +628,42 @@ class DatabaseStorage(IStorage):
                 "device_id": db_event.device_id,
                 "device_name": db_event.device_name
             }
+            for field, column in _COLUMN_FIELDS.items():
+                value = getattr(db_event, column)
+                if value is not None:
+                    event_dict[field] = value
             
-            # Parse the JSON event_data and merge with event_dict
-            try:
-                event_data = json.loads(db_event.event_data)
-                event_dict.update(event_data)
-            except (json.JSONDecodeError, TypeError):
-                # Handle case where event_data is not valid JSON
-                print(f"Warning: Could not parse event_data for event {event_id}")
-            
-            # Return appropriate EventData subclass based on kind
-            event_classes = {
-                "ding": DingEventData,
-                "motion": MotionEventData,
-                "on_demand": OnDemandEventData
-            }
-            event_class = event_classes.get(db_event.kind, EventData)
-            return event_class.parse_obj(event_dict)
+            # Only events with extra fields (or older rows) have event_data to parse
+            if db_event.event_data:
+                try:
+                    event_dict.update(_unpack_event_data(db_event.event_data))
+                except (orjson.JSONDecodeError, zlib.error, TypeError):
+                    # Handle case where event_data is not valid JSON
+                    logger.warning("Could not parse event_data for event %s", event_id)
+            
+            # Return appropriate EventData subclass based on kind. Rows were
+            # validated when saved, so build the model without revalidating.
+            event_class = _EVENT_CLASSES.get(db_event.kind, EventData)
+            event = event_class.model_construct(**event_dict)
+        
+        self._event_cache[event_id] = event
+        if len(self._event_cache) > self.EVENT_CACHE_SIZE:
+            self._event_cache.popitem(last=False)
+        return event.model_copy()
 
     async def close(self) -> None:
         """Close database connections and release resources."""
+        # Let the batch writer flush anything still queued
+        if self._writer_task is not None and not self._writer_task.done():
+            await self._queue.put(None)
+            await self._writer_task
+        
         if hasattr(self, '_engine') and self._engine is not None:
             try:
                 await self._engine.dispose()
-                print("✓ Database connections disposed successfully")
+                logger.info("✓ Database connections disposed successfully")
             except Exception as e:
-                print(f"× Error disposing database connections: {e}")
+                logger.error("× Error disposing database connections: %s", e)
                 
     async def save_video(self, event_id: str, video_data: Union[bytes, str, Path], 
                          metadata: Optional[Dict] = None) -> str:
@@ -172,8 +699,10 @@ class DatabaseStorage(IStorage):
             
             await session.execute(stmt)
             await session.commit()
-            
-            return video_url
+        
+        # The cached copy predates the video columns being set
+        self._event_cache.pop(event_id, None)
+        return video_url
     
     async def retrieve_video(self, event_id: str) -> Optional[str]:
         """
@@ -186,10 +715,8 @@ class DatabaseStorage(IStorage):
             URL to the video if found, None otherwise
         """
         async with self._session_factory() as session:
-            # Query the event to get the video URL
-            query = select(RingEvent).where(RingEvent.id == event_id)
-            result = await session.execute(query)
-            event = result.scalar_one_or_none()
+            # Look up the event by primary key to get the video URL
+            event = await session.get(RingEvent, event_id)
             
             if not event or not event.has_video or not event.video_url:
                 return None
@@ -199,6 +726,21 @@ class DatabaseStorage(IStorage):
 class FileStorage(IStorage):
     """File system-based storage implementation."""
     
+    # Seconds a failed event lookup is remembered before the tree is searched again
+    MISSING_TTL = 300
+    
+    # Maximum number of remembered failed lookups
+    MISSING_CACHE_SIZE = 10_000
+    
+    # Number of recently retrieved events kept in memory
+    EVENT_CACHE_SIZE = 256
+    
+    # Maximum number of event.json files written per worker-thread call
+    BATCH_SIZE = 64
+    
+    # Seconds to wait for more events before writing a partial batch
+    BATCH_WINDOW = 0.005
+    
     def __init__(self, storage_path: Union[str, Path]):
         """
         Initialize the FileStorage.
@@ -206,29 +748,83 @@ class FileStorage(IStorage):
         Args:
             storage_path: Base path for storing event data
         """
-        self._storage_path = str(storage_path)
+        # Paths are built with f-strings, so drop any trailing separator once here
+        self._storage_path = str(storage_path).rstrip("/\\")
+        # event_id -> event directory, filled on save and on lookup
+        self._event_dirs: Dict[str, str] = {}
+        # event_id -> saved video file, filled by save_video
+        self._video_paths: Dict[str, str] = {}
+        # event_id -> expiry time of a lookup that found nothing, oldest first
+        self._missing: Dict[str, float] = {}
+        # event_id -> parsed event, dropped whenever this instance rewrites its event.json
+        self._event_cache: "collections.OrderedDict[str, EventData]" = collections.OrderedDict()
+        # Pending (path, payload, future) writes, drained by the batch writer task
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+    
+    def _glob_event_dirs(self, event_id: str) -> List[str]:
+        """Find directories for an event at the fixed <device>/<kind>/<event_id> depth."""
+        return glob.glob(f"{glob.escape(self._storage_path)}/*/*/{glob.escape(event_id)}")
+    
+    async def _find_event_dirs(self, event_id: str) -> List[str]:
+        """
+        Locate the storage directories for an event.
+        
+        Uses the in-memory index when possible and otherwise lists only the
+        device/kind levels of the tree instead of walking every stored file.
+        
+        Args:
+            event_id: ID of the event to look up
+            
+        Returns:
+            Matching event directories, possibly empty
+        """
+        event_dir = self._event_dirs.get(event_id)
+        if event_dir and await asyncio.to_thread(os.path.isdir, event_dir):
+            return [event_dir]
+        
+        # Repeated probes for an absent event skip the directory listing
+        now = time.monotonic()
+        expires = self._missing.get(event_id)
+        if expires is not None:
+            if expires > now:
+                return []
+            del self._missing[event_id]
+        
+        dirs = await asyncio.to_thread(self._glob_event_dirs, event_id)
+        if dirs:
+            self._event_dirs[event_id] = dirs[0]
+        else:
+            if len(self._missing) >= self.MISSING_CACHE_SIZE:
+                del self._missing[next(iter(self._missing))]
+            self._missing[event_id] = now + self.MISSING_TTL
+        return dirs
         
     async def save_event(self, event: EventData) -> bool:
         """
         Save event data to the file system.
         
+        Writes are queued and handed to a worker thread in batches, so bursts
+        of events share one thread hop instead of paying one each.
+        
         Args:
             event: Event data to save
             
         Returns:
             True if saved successfully, False if already exists or failed
         """
-        # Convert the entire Pydantic model to dict, keeping all fields
-        event_dict = event.dict()
+        # Serialize the entire Pydantic model, keeping all fields
+        payload = event.model_dump_json(fallback=str).encode('utf-8')
         
         # Create a directory for the event if it doesn't exist
-        event_dir = os.path.join(self._storage_path, event.device_id, event.kind, event.id)
-        os.makedirs(event_dir, exist_ok=True)
+        event_dir = f"{self._storage_path}/{event.device_id}/{event.kind}/{event.id}"
         
         # Save complete event data as JSON
-        event_path = os.path.join(event_dir, "event.json")
-        with open(event_path, 'w') as f:
-            json.dump(event_dict, f, default=str, indent=2)
+        event_path = f"{event_dir}/event.json"
+        await self._enqueue(event_path, payload)
+        self._event_dirs[event.id] = event_dir
+        self._missing.pop(event.id, None)
+        self._event_cache.pop(event.id, None)
            
         return True
             
@@ -242,33 +838,131 @@ class FileStorage(IStorage):
         Returns:
             Event data if found, None otherwise
         """
+        cached = self._event_cache.get(event_id)
+        if cached is not None:
+            self._event_cache.move_to_end(event_id)
+            return cached.model_copy()
+        
         # Search for event.json files that match this event_id
-        event_path = os.path.join(self._storage_path, "**", "**", event_id, "event.json")
+        for event_dir in await self._find_event_dirs(event_id):
+            event_data = await asyncio.to_thread(_read_json_file, f"{event_dir}/event.json")
+            if event_data is None:
+                continue
+            
+            # Determine the correct event type model based on the kind field
+            event_class = _EVENT_CLASSES.get(event_data.get("kind", ""), EventData)
+            event = event_class.model_validate(event_data)
+            
+            self._event_cache[event_id] = event
+            if len(self._event_cache) > self.EVENT_CACHE_SIZE:
+                self._event_cache.popitem(last=False)
+            return event.model_copy()
+        
+        return None
+    
+    async def list_events(self) -> List[EventData]:
+        """
+        List every event stored under this storage path.
         
-        # Use fsspec to handle the glob pattern and read the file
-        files = fsspec.open_files(event_path, recursive=True)
-        for file in files:
-            with file.open() as f:
-                event_data = json.load(f)
+        Returns:
+            Events in no particular order; unreadable event files are skipped
+        """
+        pattern = f"{glob.escape(self._storage_path)}/*/*/*/event.json"
+        events = []
+        for event_data in await asyncio.to_thread(_read_event_files, pattern):
+            event_class = _EVENT_CLASSES.get(event_data.get("kind", ""), EventData)
+            events.append(event_class.model_validate(event_data))
+        return events
+    
+    async def _enqueue(self, path: str, payload: Union[bytes, Callable]) -> None:
+        """
+        Queue a file for the batch writer and wait until it is written.
+        
+        Args:
+            path: File to write
+            payload: New contents, or a function updating the file's JSON
+                document (see _write_files); queued writes land in call order
                 
-                # Determine the correct event type model based on the kind field
-                event_kind = event_data.get("kind", "")
-                if event_kind == "ding":
-                    return DingEventData.parse_obj(event_data)
-                elif event_kind == "motion":
-                    return MotionEventData.parse_obj(event_data)
-                elif event_kind == "on_demand":
-                    return OnDemandEventData.parse_obj(event_data)
-                else:
-                    return EventData.parse_obj(event_data)
+        Raises:
+            RuntimeError: If the batch writer is running on another event loop
+        """
+        if not _writer_running(self._writer_task, type(self).__name__):
+            self._queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._write_batches(), name="file-batch-writer")
+            self._writer_task.add_done_callback(functools.partial(self._writer_done, self._queue))
         
-        return None
+        result = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((path, payload, result))
+        await result
+    
+    @staticmethod
+    def _writer_done(queue: asyncio.Queue, task: asyncio.Task) -> None:
+        """Fail the writes left in the queue when the batch writer ends, so no caller waits forever."""
+        error = None if task.cancelled() else task.exception()
+        if error is not None:
+            logger.error("File batch writer failed: %s", error)
+        for _, _, result in _drain(queue):
+            if not result.done():
+                result.set_exception(error or RuntimeError("FileStorage batch writer stopped"))
+    
+    async def _write_batches(self) -> None:
+        """Collect queued event files into batches and write each in one thread call."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        
+        # Writes taken off the queue but not finished yet, failed if this task dies
+        batch: List = []
+        
+        try:
+            while not stopping:
+                item = await self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                
+                # Gather more writes until the batch is full or the window closes
+                deadline = loop.time() + self.BATCH_WINDOW
+                while len(batch) < self.BATCH_SIZE:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                
+                # Repeated writes of one file within a batch are folded into one write
+                writes = [(path, payload) for path, payload, _ in batch]
+                try:
+                    errors = await asyncio.to_thread(_write_files, writes)
+                except Exception as e:
+                    errors = {path: e for path, _ in writes}
+                
+                for path, _, result in batch:
+                    if result.done():
+                        continue
+                    error = errors.get(path)
+                    if error is None:
+                        result.set_result(None)
+                    else:
+                        result.set_exception(error)
+                # Don't hold the last batch's payloads and futures while idle
+                batch, item, writes = [], None, None
+        finally:
+            for _, _, result in batch:
+                if not result.done():
+                    result.set_exception(RuntimeError("FileStorage batch writer stopped"))
 
     async def close(self) -> None:
         """Close file storage and release resources."""
-        # File storage doesn't need any special cleanup
-        # This method is included for interface consistency
-        pass
+        # Let the batch writer flush anything still queued
+        if self._writer_task is not None and not self._writer_task.done():
+            await self._queue.put(None)
+            await self._writer_task
         
     async def save_video(self, event_id: str, video_data: Union[bytes, str, Path], 
                         metadata: Optional[Dict] = None) -> str:
@@ -293,74 +987,78 @@ class FileStorage(IStorage):
             
             if not (device_id and event_type):
                 # Try to find the event to get its device_id and kind
-                event_path_pattern = os.path.join(self._storage_path, "**", "**", event_id, "event.json")
-                files = fsspec.open_files(event_path_pattern, recursive=True)
-                
-                for file in files:
-                    with file.open() as f:
-                        try:
-                            event_data = json.load(f)
-                            device_id = event_data.get("device_id")
-                            event_type = event_data.get("kind")
-                            break
-                        except json.JSONDecodeError:
-                            continue
+                for event_dir in await self._find_event_dirs(event_id):
+                    event_path = f"{event_dir}/event.json"
+                    try:
+                        event_data = await asyncio.to_thread(_read_json_file, event_path)
+                    except orjson.JSONDecodeError:
+                        continue
+                    if event_data is not None:
+                        device_id = event_data.get("device_id")
+                        event_type = event_data.get("kind")
+                        break
             
             # Create a directory structure based on device_id/event_type/event_id
             if device_id and event_type:
-                video_dir = os.path.join(self._storage_path, device_id, event_type, event_id)
+                video_dir = f"{self._storage_path}/{device_id}/{event_type}/{event_id}"
             else:
                 # Fallback if we couldn't determine the path
-                video_dir = os.path.join(self._storage_path, "unknown", "videos", event_id)
-            
-            os.makedirs(video_dir, exist_ok=True)
+                video_dir = f"{self._storage_path}/unknown/videos/{event_id}"
             
             # Create a filename for the video
             filename = f"video.{video_ext}"
-            file_path = os.path.join(video_dir, filename)
+            file_path = f"{video_dir}/{filename}"
             
             # Write the video data to the file
-            if isinstance(video_data, (str, Path)) and os.path.isfile(str(video_data)):
+            if isinstance(video_data, (str, Path)) and await asyncio.to_thread(os.path.isfile, str(video_data)):
                 # If video_data is a path to an existing file, copy it
-                with open(str(video_data), 'rb') as src, open(file_path, 'wb') as dst:
-                    dst.write(src.read())
-            else:
+                await asyncio.to_thread(_copy_file, str(video_data), file_path)
+            elif isinstance(video_data, bytes):
                 # Otherwise, write the bytes directly
-                with open(file_path, 'wb') as f:
-                    if isinstance(video_data, bytes):
-                        f.write(video_data)
-                    else:
-                        # If it's a string but not a file path, treat it as text
-                        f.write(str(video_data).encode('utf-8'))
+                await asyncio.to_thread(_write_file, file_path, video_data)
+            else:
+                # If it's a string but not a file path, treat it as text
+                await asyncio.to_thread(_write_file, file_path, str(video_data).encode('utf-8'))
             
             # If metadata is provided, save it alongside the video
             if metadata:
-                metadata_path = os.path.join(video_dir, "video_metadata.json")
-                with open(metadata_path, 'w') as f:
-                    json.dump(metadata, f, indent=2)
+                metadata_path = f"{video_dir}/video_metadata.json"
+                await asyncio.to_thread(_write_file, metadata_path, _dumps(metadata))
             
             # If we have a corresponding event JSON, update it to include video information
-            event_json_path = os.path.join(video_dir, "event.json")
-            if os.path.exists(event_json_path):
-                with open(event_json_path, 'r') as f:
-                    event_data = json.load(f)
-                
-                # Update the event data to include video information
+            def add_video(event_data: Optional[Dict]) -> Optional[Dict]:
+                if event_data is None:
+                    return None
                 event_data["has_video"] = True
                 event_data["video_path"] = file_path
                 if metadata and "recording_id" in metadata:
                     event_data["recording_id"] = metadata["recording_id"]
-                
-                # Write the updated event data back to the file
-                with open(event_json_path, 'w') as f:
-                    json.dump(event_data, f, default=str, indent=2)
+                return event_data
             
+            # Goes through the batch writer, so it lands after any save_event
+            # of this event queued before it instead of being overwritten by one
+            await self._enqueue(f"{video_dir}/event.json", add_video)
+            
+            self._event_dirs.setdefault(event_id, video_dir)
+            self._video_paths[event_id] = file_path
+            self._missing.pop(event_id, None)
+            self._event_cache.pop(event_id, None)
             return file_path
             
         except Exception as e:
-            print(f"Error saving video to file: {e}")
+            logger.error("Error saving video to file: %s", e)
             return ""
     
+    @staticmethod
+    def _find_video_file(dirs: List[str]) -> Optional[str]:
+        """Return the first video file found in the given event directories."""
+        for event_dir in dirs:
+            # One directory listing per event instead of a stat per extension
+            video_path = _pick_video_file(glob.glob(f"{glob.escape(event_dir)}/video.*"))
+            if video_path is not None:
+                return video_path
+        return None
+    
     async def retrieve_video(self, event_id: str) -> Optional[str]:
         """
         Retrieve video path for an event.
@@ -371,52 +1069,168 @@ class FileStorage(IStorage):
         Returns:
             Path to the video file if found, None otherwise
         """
+        video_path = self._video_paths.get(event_id)
+        if video_path and await asyncio.to_thread(os.path.isfile, video_path):
+            return video_path
+        
         try:
             # First, try to find the event to get its path
-            event_path_pattern = os.path.join(self._storage_path, "**", "**", event_id, "event.json")
-            files = fsspec.open_files(event_path_pattern, recursive=True)
+            dirs = await self._find_event_dirs(event_id)
             
-            for file in files:
+            for event_dir in dirs:
                 try:
-                    with file.open() as f:
-                        event_data = json.load(f)
-                        
-                        # Check if the event has video information
-                        if event_data.get("has_video") and event_data.get("video_path"):
-                            return event_data["video_path"]
+                    event_data = await asyncio.to_thread(_read_json_file, f"{event_dir}/event.json")
+                    
+                    # Check if the event has video information
+                    if event_data and event_data.get("has_video") and event_data.get("video_path"):
+                        return event_data["video_path"]
                 except Exception:
                     continue
             
             # If no video path in event data, try to find a video file directly
-            event_dir_pattern = os.path.join(self._storage_path, "**", "**", event_id)
-            dirs = [d for d in fsspec.filesystem("file").glob(event_dir_pattern)]
-            
-            for event_dir in dirs:
-                # Check for video files in the event directory
-                for ext in ["mp4", "mkv", "mov", "avi"]:
-                    video_path = os.path.join(event_dir, f"video.{ext}")
-                    if os.path.exists(video_path):
-                        return video_path
-            
-            return None
+            return await asyncio.to_thread(self._find_video_file, dirs)
         except Exception as e:
-            print(f"Error retrieving video: {e}")
+            logger.error("Error retrieving video: %s", e)
             return None
 
+def _limit_concurrency(method):
+    """Run a NetworkStorage coroutine method while holding one of its operation slots."""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        async with self._operations:
+            return await method(self, *args, **kwargs)
+    return wrapper
+
+
 class NetworkStorage(IStorage):
     """Network-based storage implementation."""
     
-    def __init__(self, storage_url: str, fs: Optional[fsspec.AbstractFileSystem] = None):
+    # Number of recently read or written JSON documents kept in memory
+    DOCUMENT_CACHE_SIZE = 256
+    
+    # Seconds a cached document is trusted before it's read from the store again,
+    # so writes by other processes or hosts sharing the store show up
+    DOCUMENT_CACHE_TTL = 600
+    
+    # Number of directories remembered as already created
+    KNOWN_DIRS_SIZE = 4096
+    
+    # Maximum number of storage operations in flight at once
+    MAX_CONCURRENT_OPERATIONS = 16
+    
+    # Part size for streamed video uploads (S3 multipart parts must be >= 5 MB)
+    UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+    
+    def __init__(self, storage_url: str, fs: Optional[fsspec.AbstractFileSystem] = None,
+                 session: Optional[aiohttp.ClientSession] = None):
         """
         Initialize the NetworkStorage.
         
         Args:
             storage_url: Base URL for storing event data
             fs: Optional file system object for handling storage operations
+            session: Optional shared aiohttp session for HTTP backends. The caller
+                keeps ownership and is responsible for closing it.
         """
         self._storage_url = storage_url
-        self._fs = fs or fsspec.filesystem('http')
+        self._session = session
+        
+        # Filesystem is built on first use, so no backend setup runs at startup
+        if fs is not None and not fs.async_impl:
+            fs = AsyncFileSystemWrapper(fs)
+        self._fs_instance = fs
+        # event_id -> event directory, filled on save and on lookup
+        self._event_dirs: Dict[str, str] = {}
+        # path -> (raw JSON bytes, monotonic time fetched or written), a
+        # write-through cache of small documents
+        self._documents: "collections.OrderedDict[str, Tuple[bytes, float]]" = collections.OrderedDict()
+        # Directories already created, so repeat writes skip the makedirs round trip
+        self._known_dirs: Set[str] = set()
+        # Caps in-flight requests when many events arrive at once
+        self._operations = asyncio.Semaphore(self.MAX_CONCURRENT_OPERATIONS)
+    
+    @property
+    def _fs(self) -> fsspec.AbstractFileSystem:
+        """The async filesystem for the storage URL's protocol."""
+        if self._fs_instance is None:
+            protocol = fsspec.utils.get_protocol(self._storage_url)
+            self._fs_instance = _get_fs(protocol, self._session)
+        return self._fs_instance
+    
+    async def _ensure_dir(self, path: str) -> None:
+        """Create a directory unless this instance has already created it."""
+        if path in self._known_dirs:
+            return
+        await self._fs._makedirs(path, exist_ok=True)
+        if len(self._known_dirs) >= self.KNOWN_DIRS_SIZE:
+            self._known_dirs.clear()
+        self._known_dirs.add(path)
+    
+    def _upload_options(self) -> Dict[str, Any]:
+        """Backend-specific keyword arguments for chunked _put_file uploads."""
+        protocol = fsspec.utils.get_protocol(self._storage_url)
+        if protocol in ("http", "https"):
+            # Match _pipe_file, which uploads with PUT
+            return {"chunk_size": self.UPLOAD_CHUNK_SIZE, "method": "put"}
+        if protocol in ("s3", "s3a"):
+            return {"chunksize": self.UPLOAD_CHUNK_SIZE}
+        return {}
+    
+    async def _find_event_files(self, event_id: str) -> List[str]:
+        """
+        Locate the event.json documents for an event.
         
+        Uses the in-memory index when possible and otherwise lists only the
+        fixed <device>/<kind>/<event_id> levels rather than the whole store.
+        
+        Args:
+            event_id: ID of the event to look up
+            
+        Returns:
+            Candidate event.json paths, possibly empty
+        """
+        event_dir = self._event_dirs.get(event_id)
+        if event_dir is not None:
+            return [f"{event_dir}/event.json"]
+        
+        files = await self._fs._glob(f"{self._storage_url}/*/*/{event_id}/event.json")
+        if files:
+            self._event_dirs[event_id] = files[0].rsplit("/", 1)[0]
+        return files
+    
+    def _remember(self, path: str, data: bytes) -> None:
+        """Add a document to the cache, evicting the least recently used."""
+        self._documents[path] = (data, time.monotonic())
+        self._documents.move_to_end(path)
+        if len(self._documents) > self.DOCUMENT_CACHE_SIZE:
+            self._documents.popitem(last=False)
+    
+    async def _read_json(self, path: str) -> Dict:
+        """Read and decode a JSON document, from the cache while it's fresh."""
+        cached = self._documents.get(path)
+        if cached is not None and time.monotonic() - cached[1] < self.DOCUMENT_CACHE_TTL:
+            self._documents.move_to_end(path)
+            return orjson.loads(cached[0])
+        
+        try:
+            data = await self._fs._cat_file(path)
+        except FileNotFoundError:
+            # Removed from the store since it was cached
+            self._documents.pop(path, None)
+            raise
+        self._remember(path, data)
+        return orjson.loads(data)
+    
+    async def _write_document(self, path: str, data: bytes) -> None:
+        """Write a JSON document to the network store and the cache."""
+        await self._fs._pipe_file(path, data)
+        self._remember(path, data)
+    
+    async def _write_json(self, path: str, obj) -> None:
+        """Encode and write a JSON document to the network store."""
+        await self._write_document(path, _dumps(obj))
+        
+    @_limit_concurrency
     async def save_event(self, event: EventData) -> bool:
         """
         Save event data to network storage.
@@ -427,20 +1241,21 @@ class NetworkStorage(IStorage):
         Returns:
             True if saved successfully, False if already exists or failed
         """
-        # Convert the entire Pydantic model to dict, keeping all fields
-        event_dict = event.dict()
+        # Serialize the entire Pydantic model, keeping all fields
+        payload = event.model_dump_json(fallback=str).encode('utf-8')
         
         # Create a directory for the event if it doesn't exist
         event_dir = f"{self._storage_url}/{event.device_id}/{event.kind}/{event.id}"
-        self._fs.makedirs(event_dir, exist_ok=True)
+        await self._ensure_dir(event_dir)
         
         # Save complete event data as JSON
         event_path = f"{event_dir}/event.json"
-        with self._fs.open(event_path, 'w') as f:
-            f.write(json.dumps(event_dict, default=str, indent=2))
+        await self._write_document(event_path, payload)
+        self._event_dirs[event.id] = event_dir
                 
         return True
             
+    @_limit_concurrency
     async def retrieve_event(self, event_id: str) -> Optional[EventData]:
         """
         Retrieve event data from network storage.
@@ -452,40 +1267,29 @@ class NetworkStorage(IStorage):
             Event data if found, None otherwise
         """
         # Search for event.json files that match this event_id
-        event_path = f"{self._storage_url}/**/**/{event_id}/event.json"
-        
-        # Use fsspec to handle the glob pattern and read the file
-        files = self._fs.glob(event_path)
-        for file_path in files:
-            with self._fs.open(file_path) as f:
-                event_data = json.load(f)
-                
-                # Determine the correct event type model based on the kind field
-                event_kind = event_data.get("kind", "")
-                if event_kind == "ding":
-                    return DingEventData.parse_obj(event_data)
-                elif event_kind == "motion":
-                    return MotionEventData.parse_obj(event_data)
-                elif event_kind == "on_demand":
-                    return OnDemandEventData.parse_obj(event_data)
-                else:
-                    return EventData.parse_obj(event_data)
+        for file_path in await self._find_event_files(event_id):
+            try:
+                event_data = await self._read_json(file_path)
+            except FileNotFoundError:
+                continue
+            
+            # Determine the correct event type model based on the kind field
+            event_class = _EVENT_CLASSES.get(event_data.get("kind", ""), EventData)
+            return event_class.model_validate(event_data)
         
         return None
 
     async def close(self) -> None:
         """Close network connections and release resources."""
-        if hasattr(self, '_fs') and self._fs is not None:
-            try:
-                # Close any open sessions or connections
-                if hasattr(self._fs, 'close'):
-                    self._fs.close()
-                elif hasattr(self._fs, '_session') and self._fs._session is not None:
-                    self._fs._session.close()
-                print("✓ Network storage connections closed successfully")
-            except Exception as e:
-                print(f"× Error closing network storage connections: {e}")
+        # Filesystems are shared per protocol, so their HTTP sessions are left to
+        # the session owner or, for ones fsspec created, to shutdown cleanup
+        self._fs_instance = None
+        self._event_dirs.clear()
+        self._documents.clear()
+        self._known_dirs.clear()
+        logger.info("✓ Network storage connections closed successfully")
                 
+    @_limit_concurrency
     async def save_video(self, event_id: str, video_data: Union[bytes, str, Path], 
                         metadata: Optional[Dict] = None) -> str:
         """
@@ -509,18 +1313,14 @@ class NetworkStorage(IStorage):
             
             if not (device_id and event_type):
                 # Try to find the event to get its device_id and kind
-                event_path = f"{self._storage_url}/**/**/{event_id}/event.json"
-                files = self._fs.glob(event_path)
-                
-                for file_path in files:
-                    with self._fs.open(file_path) as f:
-                        try:
-                            event_data = json.load(f)
-                            device_id = event_data.get("device_id")
-                            event_type = event_data.get("kind")
-                            break
-                        except json.JSONDecodeError:
-                            continue
+                for file_path in await self._find_event_files(event_id):
+                    try:
+                        event_data = await self._read_json(file_path)
+                        device_id = event_data.get("device_id")
+                        event_type = event_data.get("kind")
+                        break
+                    except (orjson.JSONDecodeError, FileNotFoundError):
+                        continue
             
             # Create a directory structure based on device_id/event_type/event_id
             if device_id and event_type:
@@ -529,7 +1329,7 @@ class NetworkStorage(IStorage):
                 # Fallback if we couldn't determine the path
                 video_dir = f"{self._storage_url}/unknown/videos/{event_id}"
             
-            self._fs.makedirs(video_dir, exist_ok=True)
+            await self._ensure_dir(video_dir)
             
             # Create a filename for the video
             filename = f"video.{video_ext}"
@@ -537,29 +1337,24 @@ class NetworkStorage(IStorage):
             
             # Write the video data to the file
             if isinstance(video_data, (str, Path)) and os.path.isfile(str(video_data)):
-                # If video_data is a path to an existing file, copy it
-                with open(str(video_data), 'rb') as src, self._fs.open(file_path, 'wb') as dst:
-                    dst.write(src.read())
-            else:
+                # If video_data is a path to an existing file, stream it in chunks
+                await self._fs._put_file(str(video_data), file_path, **self._upload_options())
+            elif isinstance(video_data, bytes):
                 # Otherwise, write the bytes directly
-                with self._fs.open(file_path, 'wb') as f:
-                    if isinstance(video_data, bytes):
-                        f.write(video_data)
-                    else:
-                        # If it's a string but not a file path, treat it as text
-                        f.write(str(video_data).encode('utf-8'))
+                await self._fs._pipe_file(file_path, video_data)
+            else:
+                # If it's a string but not a file path, treat it as text
+                await self._fs._pipe_file(file_path, str(video_data).encode('utf-8'))
             
             # If metadata is provided, save it alongside the video
             if metadata:
                 metadata_path = f"{video_dir}/video_metadata.json"
-                with self._fs.open(metadata_path, 'w') as f:
-                    f.write(json.dumps(metadata, indent=2))
+                await self._write_json(metadata_path, metadata)
             
             # If we have a corresponding event JSON, update it to include video information
             event_json_path = f"{video_dir}/event.json"
-            if self._fs.exists(event_json_path):
-                with self._fs.open(event_json_path, 'r') as f:
-                    event_data = json.load(f)
+            if await self._fs._exists(event_json_path):
+                event_data = await self._read_json(event_json_path)
                 
                 # Update the event data to include video information
                 event_data["has_video"] = True
@@ -568,15 +1363,15 @@ class NetworkStorage(IStorage):
                     event_data["recording_id"] = metadata["recording_id"]
                 
                 # Write the updated event data back to the file
-                with self._fs.open(event_json_path, 'w') as f:
-                    f.write(json.dumps(event_data, default=str, indent=2))
+                await self._write_json(event_json_path, event_data)
             
             return file_path
             
         except Exception as e:
-            print(f"Error saving video to network storage: {e}")
+            logger.error("Error saving video to network storage: %s", e)
             return ""
     
+    @_limit_concurrency
     async def retrieve_video(self, event_id: str) -> Optional[str]:
         """
         Retrieve video URL for an event.
@@ -589,32 +1384,22 @@ class NetworkStorage(IStorage):
         """
         try:
             # First, try to find the event to get its path
-            event_path = f"{self._storage_url}/**/**/{event_id}/event.json"
-            files = self._fs.glob(event_path)
+            files = await self._find_event_files(event_id)
             
             for file_path in files:
                 try:
-                    with self._fs.open(file_path) as f:
-                        event_data = json.load(f)
-                        
-                        # Check if the event has video information
-                        if event_data.get("has_video") and event_data.get("video_path"):
-                            return event_data["video_path"]
+                    event_data = await self._read_json(file_path)
+                    
+                    # Check if the event has video information
+                    if event_data.get("has_video") and event_data.get("video_path"):
+                        return event_data["video_path"]
                 except Exception:
                     continue
             
             # If no video path in event data, try to find a video file directly
-            event_dir_pattern = f"{self._storage_url}/**/**/{event_id}"
-            dirs = self._fs.glob(event_dir_pattern)
-            
-            for event_dir in dirs:
-                # Check for video files in the event directory
-                for ext in ["mp4", "mkv", "mov", "avi"]:
-                    video_path = f"{event_dir}/video.{ext}"
-                    if self._fs.exists(video_path):
-                        return video_path
-            
-            return None
+            # A single listing covers every extension (and every candidate directory)
+            event_dir = self._event_dirs.get(event_id, f"{self._storage_url}/*/*/{event_id}")
+            return _pick_video_file(await self._fs._glob(f"{event_dir}/video.*"))
         except Exception as e:
-            print(f"Error retrieving video: {e}")
+            logger.error("Error retrieving video: %s", e)
             return None
@@ -0,0 +1,29 @@
+"""Registry of aiohttp sessions and connectors created by the application."""
+
+import weakref
+from typing import TypeVar, Union
+
+import aiohttp
+
+# Weak references only - tracking never keeps a closed session alive
+SESSIONS: "weakref.WeakSet[aiohttp.ClientSession]" = weakref.WeakSet()
+CONNECTORS: "weakref.WeakSet[aiohttp.TCPConnector]" = weakref.WeakSet()
+
+_T = TypeVar("_T", bound=Union[aiohttp.ClientSession, aiohttp.TCPConnector])
+
+
+def track(obj: _T) -> _T:
+    """
+    Register an aiohttp session or connector so shutdown cleanup can close it.
+
+    Args:
+        obj: The ClientSession or TCPConnector to register
+
+    Returns:
+        The same object, so construction sites can wrap it inline
+    """
+    if isinstance(obj, aiohttp.ClientSession):
+        SESSIONS.add(obj)
+    elif isinstance(obj, aiohttp.TCPConnector):
+        CONNECTORS.add(obj)
+    return obj
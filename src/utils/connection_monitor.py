@@ -2,13 +2,54 @@
 
 import asyncio
 import logging
+import random
+import socket
+import struct
 import time
+import os
 import platform
-import socket
-from typing import Callable, Optional, List
+from typing import Callable, Dict, Optional, List, Set
+
+from .fs import io_executor
 
 logger = logging.getLogger(__name__)
 
+# Port that gets the UDP DNS probe instead of a TCP connect
+DNS_PORT = 53
+
+# Linux sysfs directory with one entry per network interface
+SYS_CLASS_NET = "/sys/class/net"
+
+# systemd-logind object announcing suspend/resume on the system bus
+LOGIN1_SERVICE = "org.freedesktop.login1"
+LOGIN1_PATH = "/org/freedesktop/login1"
+LOGIN1_MANAGER = "org.freedesktop.login1.Manager"
+
+
+class _DnsProbeProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol resolving pending DNS probes by transaction id."""
+    
+    def __init__(self):
+        self.waiters: Dict[int, asyncio.Future] = {}
+    
+    def datagram_received(self, data: bytes, addr) -> None:
+        # Any response (QR bit set) carrying a pending id proves a round trip
+        if len(data) < 12 or not data[2] & 0x80:
+            return
+        waiter = self.waiters.get(int.from_bytes(data[:2], "big"))
+        if waiter is not None and not waiter.done():
+            waiter.set_result(True)
+    
+    def error_received(self, exc: Exception) -> None:
+        # ICMP errors for one host shouldn't fail probes still waiting on others
+        logger.debug("DNS probe error: %s", exc)
+    
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        for waiter in self.waiters.values():
+            if not waiter.done():
+                waiter.set_result(False)
+
+
 class ConnectionMonitor:
     """
     A utility class for monitoring network connection status.
@@ -29,25 +70,42 @@ class ConnectionMonitor:
                  check_interval: float = 15.0, 
                  hosts: Optional[List[str]] = None,
                  port: int = 53,  # DNS port
-                 timeout: float = 3.0):
+                 timeout: float = 3.0,
+                 min_interval: float = 1.0,
+                 max_interval: float = 60.0):
         """
         Initialize the connection monitor.
         
         Args:
-            check_interval: Time in seconds between connectivity checks
+            check_interval: Time in seconds between connectivity checks to start with
             hosts: List of hosts to check for connectivity 
             port: Port to use for connection tests
             timeout: Connection timeout in seconds
+            min_interval: Re-check delay in seconds right after connectivity changes
+            max_interval: Longest delay in seconds the interval backs off to while
+                connectivity stays the same
         """
         self._check_interval = check_interval
+        self._min_interval = min(min_interval, check_interval)
+        self._max_interval = max(max_interval, check_interval)
         self._hosts = hosts or self.DEFAULT_HOSTS
         self._port = port
         self._timeout = timeout
         self._running = False
         self._task = None
         self._last_online = time.time()
-        self._on_wake_callbacks = []
-        self._on_sleep_callbacks = []
+        # Callbacks are split into coroutine and plain functions at registration
+        self._async_wake_callbacks: List[Callable] = []
+        self._sync_wake_callbacks: List[Callable] = []
+        self._async_sleep_callbacks: List[Callable] = []
+        self._sync_sleep_callbacks: List[Callable] = []
+        # UDP endpoint reused by every DNS probe, opened on first use
+        self._dns_transport: Optional[asyncio.DatagramTransport] = None
+        self._dns_protocol: Optional[_DnsProbeProtocol] = None
+        # System bus delivering logind PrepareForSleep signals, when available
+        self._power_bus = None
+        # Callback runs started by those signals, cancelled on stop()
+        self._signal_tasks: Set[asyncio.Task] = set()
         
     async def start(self) -> None:
         """Start the connection monitoring."""
@@ -55,6 +113,8 @@ class ConnectionMonitor:
             return
             
         self._running = True
+        if platform.system() == "Linux":
+            self._power_bus = await self._subscribe_power_events()
         self._task = asyncio.create_task(self._monitor_loop())
         logger.info("Connection monitor started")
         
@@ -71,8 +131,62 @@ class ConnectionMonitor:
             except asyncio.CancelledError:
                 pass
             self._task = None
+        if self._dns_transport is not None:
+            self._dns_transport.close()
+            self._dns_transport = None
+        if self._power_bus is not None:
+            self._power_bus.disconnect()
+            self._power_bus = None
+        if self._signal_tasks:
+            tasks = list(self._signal_tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
         logger.info("Connection monitor stopped")
         
+    async def _subscribe_power_events(self):
+        """
+        Listen for logind's PrepareForSleep signal on the system D-Bus.
+        
+        Returns:
+            The connected message bus, or None if dbus-next is not installed or
+            logind is unreachable, in which case sleep/wake is only inferred by
+            the polling loop
+        """
+        try:
+            from dbus_next import BusType
+            from dbus_next.aio import MessageBus
+        except ImportError:
+            return None
+        
+        bus = None
+        try:
+            bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+            introspection = await bus.introspect(LOGIN1_SERVICE, LOGIN1_PATH)
+            manager = bus.get_proxy_object(
+                LOGIN1_SERVICE, LOGIN1_PATH, introspection
+            ).get_interface(LOGIN1_MANAGER)
+        except Exception as e:
+            logger.debug("logind sleep signals unavailable: %s", e)
+            if bus is not None:
+                bus.disconnect()
+            return None
+        
+        def on_prepare_for_sleep(going_to_sleep: bool) -> None:
+            if going_to_sleep:
+                logger.info("System is going to sleep")
+                task = asyncio.create_task(self._trigger_sleep_callbacks())
+            else:
+                logger.info("System woke from sleep")
+                task = asyncio.create_task(self._trigger_wake_callbacks())
+            # The loop only keeps weak references to tasks, so hold on to it until it's done
+            self._signal_tasks.add(task)
+            task.add_done_callback(self._signal_tasks.discard)
+        
+        manager.on_prepare_for_sleep(on_prepare_for_sleep)
+        logger.info("Listening for logind sleep/wake signals")
+        return bus
+        
     def on_wake(self, callback: Callable) -> None:
         """
         Register a callback to be called when the system wakes from sleep.
@@ -80,7 +194,10 @@ class ConnectionMonitor:
         Args:
             callback: Async function to call when system wakes
         """
-        self._on_wake_callbacks.append(callback)
+        if asyncio.iscoroutinefunction(callback):
+            self._async_wake_callbacks.append(callback)
+        else:
+            self._sync_wake_callbacks.append(callback)
         
     def on_sleep(self, callback: Callable) -> None:
         """
@@ -89,52 +206,80 @@ class ConnectionMonitor:
         Args:
             callback: Async function to call when system appears to sleep
         """
-        self._on_sleep_callbacks.append(callback)
+        if asyncio.iscoroutinefunction(callback):
+            self._async_sleep_callbacks.append(callback)
+        else:
+            self._sync_sleep_callbacks.append(callback)
         
     async def _monitor_loop(self) -> None:
         """Main monitoring loop."""
+        loop = asyncio.get_running_loop()
         was_online = await self._check_connectivity()
         sleep_suspected = False
         
+        # The loop clock is monotonic and stops while the system is suspended,
+        # while the wall clock keeps going; a gap between the two means a sleep
+        last_wall, last_mono = time.time(), loop.time()
+        
+        # Re-check quickly around transitions, back off while nothing changes
+        interval = self._check_interval
+        
         while self._running:
             try:
                 is_online = await self._check_connectivity()
                 
+                wall, mono = time.time(), loop.time()
+                suspended_for = (wall - last_wall) - (mono - last_mono)
+                last_wall, last_mono = wall, mono
+                suspended = suspended_for > self._check_interval
+                
                 # Transition from offline to online - potential wake from sleep
                 if not was_online and is_online:
                     # Calculate offline duration
-                    offline_duration = time.time() - self._last_online
+                    offline_duration = wall - self._last_online
                     
                     # If offline for more than twice our check interval, likely a sleep/wake event
-                    if offline_duration > (self._check_interval * 2) and sleep_suspected:
-                        logger.info(f"System appears to have woken from sleep (offline for {offline_duration:.1f}s)")
+                    if self._power_bus is None and (suspended or (offline_duration > (self._check_interval * 2) and sleep_suspected)):
+                        logger.info("System appears to have woken from sleep (offline for %.1fs)", offline_duration)
                         await self._trigger_wake_callbacks()
                         sleep_suspected = False
                     else:
-                        logger.info(f"Network connection restored after {offline_duration:.1f}s")
+                        logger.info("Network connection restored after %.1fs", offline_duration)
                 
                 # Transition from online to offline - potential sleep event
                 elif was_online and not is_online:
-                    self._last_online = time.time()
+                    self._last_online = wall
                     logger.info("Network connection lost - system may be going to sleep")
                     sleep_suspected = True
-                    await self._trigger_sleep_callbacks()
+                    if self._power_bus is None:
+                        await self._trigger_sleep_callbacks()
+                
+                # Slept and woke between two checks without the network ever looking down
+                elif suspended and is_online and self._power_bus is None:
+                    logger.info("System appears to have woken from sleep (suspended for %.1fs)", suspended_for)
+                    await self._trigger_wake_callbacks()
+                    sleep_suspected = False
+                
+                if is_online != was_online or suspended:
+                    interval = self._min_interval
+                else:
+                    interval = min(interval * 2, self._max_interval)
                 
                 # Update state for next check
                 was_online = is_online
                 
                 # If we're online, update the last_online timestamp
                 if is_online:
-                    self._last_online = time.time()
+                    self._last_online = wall
                 
                 # Wait for the next check
-                await asyncio.sleep(self._check_interval)
+                await asyncio.sleep(interval)
                 
             except asyncio.CancelledError:
                 logger.debug("Connection monitor task cancelled")
                 break
             except Exception as e:
-                logger.error(f"Error in connection monitor: {e}")
+                logger.error("Error in connection monitor: %s", e)
                 await asyncio.sleep(self._check_interval)
     
     async def _check_connectivity(self) -> bool:
@@ -144,44 +289,152 @@ class ConnectionMonitor:
         Returns:
             bool: True if network connectivity available, False otherwise
         """
-        # Try each host in our list
-        for host in self._hosts:
-            try:
-                # Create a socket
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(self._timeout)
-                
-                # Try to connect to the host
-                result = sock.connect_ex((host, self._port))
-                sock.close()
-                
-                # If connection was successful
-                if result == 0:
+        # No interface with link means offline; skip probes that would just time out
+        if not self._has_link():
+            return False
+        
+        # DNS servers answer a single UDP query, cheaper than a TCP handshake
+        if self._port == DNS_PORT:
+            return await self._probe_dns()
+        
+        # Probe every host at once; the first success answers the check, so
+        # a host that times out costs at most one timeout instead of one each
+        probes = [asyncio.create_task(self._probe(host)) for host in self._hosts]
+        try:
+            for probe in asyncio.as_completed(probes):
+                if await probe:
                     return True
-            except:
-                # Catch any connection errors and try the next host
-                continue
-                
-        return False
+            return False
+        finally:
+            for probe in probes:
+                probe.cancel()
+            await asyncio.gather(*probes, return_exceptions=True)
+    
+    @staticmethod
+    def _has_link() -> bool:
+        """
+        Check whether any non-loopback interface reports carrier.
+        
+        Returns:
+            bool: False only when the kernel says every interface is down; True
+            when some interface has link or the state can't be read (e.g. not
+            on Linux)
+        """
+        try:
+            entries = os.scandir(SYS_CLASS_NET)
+        except OSError:
+            return True
+        
+        found = False
+        with entries:
+            for entry in entries:
+                if entry.name == "lo":
+                    continue
+                found = True
+                try:
+                    with open(f"{entry.path}/carrier", "rb") as f:
+                        if f.read(1) == b"1":
+                            return True
+                except OSError:
+                    # Reading carrier fails with EINVAL while the interface is down
+                    continue
+        return not found
+    
+    async def _probe_dns(self) -> bool:
+        """
+        Send one DNS query to every host over a shared UDP socket.
+        
+        Returns:
+            bool: True if any host answered within the timeout
+        """
+        loop = asyncio.get_running_loop()
+        if self._dns_transport is None or self._dns_transport.is_closing():
+            self._dns_transport, self._dns_protocol = await loop.create_datagram_endpoint(
+                _DnsProbeProtocol, family=socket.AF_INET
+            )
+        
+        waiters = self._dns_protocol.waiters
+        txid = random.getrandbits(16)
+        while txid in waiters:
+            txid = random.getrandbits(16)
+        
+        # Header (id, RD flag, one question) + root name, type NS, class IN
+        query = struct.pack("!HHHHHH", txid, 0x0100, 1, 0, 0, 0) + b"\x00" + struct.pack("!HH", 2, 1)
+        
+        waiter = loop.create_future()
+        waiters[txid] = waiter
+        try:
+            for host in self._hosts:
+                try:
+                    self._dns_transport.sendto(query, (host, self._port))
+                except OSError:
+                    continue
+            return await asyncio.wait_for(waiter, timeout=self._timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            waiters.pop(txid, None)
+    
+    async def _probe(self, host: str) -> bool:
+        """
+        Try to open a TCP connection to a host without blocking the event loop.
+        
+        Args:
+            host: Host to connect to on the configured port
+            
+        Returns:
+            bool: True if the connection succeeded within the timeout
+        """
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, self._port), timeout=self._timeout
+            )
+        except (asyncio.TimeoutError, OSError):
+            return False
+        
+        # Close with RST (zero linger) so probes don't leave sockets in TIME_WAIT
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            except OSError:
+                pass
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+    
+    async def _run_callbacks(self, async_callbacks: List[Callable],
+                             sync_callbacks: List[Callable], kind: str) -> None:
+        """
+        Run callbacks concurrently so one slow handler doesn't delay the rest.
+        
+        Coroutine functions are awaited together; plain functions run in the
+        module's I/O pool to keep blocking work off the event loop.
+        
+        Args:
+            async_callbacks: Registered coroutine functions
+            sync_callbacks: Registered plain functions
+            kind: Label used when logging callback failures
+        """
+        if not async_callbacks and not sync_callbacks:
+            return
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(callback() for callback in async_callbacks),
+            *(loop.run_in_executor(io_executor(), callback) for callback in sync_callbacks),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Error in %s callback: %s", kind, result)
     
     async def _trigger_wake_callbacks(self) -> None:
         """Trigger all registered wake callbacks."""
-        for callback in self._on_wake_callbacks:
-            try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback()
-                else:
-                    callback()
-            except Exception as e:
-                logger.error(f"Error in wake callback: {e}")
+        await self._run_callbacks(self._async_wake_callbacks, self._sync_wake_callbacks, "wake")
     
     async def _trigger_sleep_callbacks(self) -> None:
         """Trigger all registered sleep callbacks."""
-        for callback in self._on_sleep_callbacks:
-            try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback()
-                else:
-                    callback()
-            except Exception as e:
-                logger.error(f"Error in sleep callback: {e}")
+        await self._run_callbacks(self._async_sleep_callbacks, self._sync_sleep_callbacks, "sleep")
@@ -6,18 +6,25 @@ This script:
 2. Looks for videos in the live_view directory that match the timestamp
 3. Copies those videos to the appropriate event directory
 4. Updates the event.json file with the video information
+5. Optionally imports the events, with their video information, into a database
 """
 
 import asyncio
 import argparse
+import functools
 import os
-import glob
-import json
 import shutil
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 import sys
+from typing import NamedTuple
+
+import numpy as np
+import orjson
+
+# Maximum number of events fixed at the same time
+FIX_CONCURRENCY = 16
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -28,7 +35,24 @@ project_root = str(Path(__file__).parent)
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from src.storage.storage_impl import FileStorage
+from src.storage.storage_impl import DatabaseStorage, FileStorage
+from src.utils.fs import atomic_open, io_executor, temp_path
+
+
+class EventInfo(NamedTuple):
+    """An event that has no video associated with it yet."""
+    id: str
+    device_id: str
+    kind: str
+    created_at: str
+    timestamp: int
+
+
+class VideoInfo(NamedTuple):
+    """A live view clip that may belong to an event."""
+    path: str
+    timestamp: int
+    time_diff: int
 
 
 async def find_unassociated_events(storage_path, since=None, until=None, device_id=None):
@@ -42,7 +66,7 @@ async def find_unassociated_events(storage_path, since=None, until=None, device_
         device_id: Only look for events from this device
         
     Returns:
-        List of dicts containing event info
+        List of EventInfo tuples
     """
     logger.info(f"Looking for events without videos in {storage_path}")
     
@@ -56,7 +80,10 @@ async def find_unassociated_events(storage_path, since=None, until=None, device_
     # Filter events without videos
     events_without_videos = []
     for event in events:
-        # Apply filters
+        # Apply the cheap attribute filters before parsing any timestamp
+        if event.has_video:
+            continue
+        
         if device_id and event.device_id != device_id:
             continue
             
@@ -68,89 +95,140 @@ async def find_unassociated_events(storage_path, since=None, until=None, device_
         if until and event_time > until:
             continue
             
-        # Check if event has video
-        if not event.has_video:
-            events_without_videos.append({
-                'id': event.id,
-                'device_id': event.device_id,
-                'kind': event.kind,
-                'created_at': event.created_at,
-                'timestamp': int(event_time.timestamp())
-            })
+        events_without_videos.append(EventInfo(
+            id=event.id,
+            device_id=event.device_id,
+            kind=event.kind,
+            created_at=event.created_at,
+            timestamp=int(event_time.timestamp())
+        ))
             
     logger.info(f"Found {len(events_without_videos)} events without videos")
     return events_without_videos
 
 
-def find_matching_videos(storage_path, event_info, time_window_seconds=30):
+def build_video_index(storage_path, device_id):
     """
-    Find videos that might match an event based on timestamps.
+    Index a device's live view clips by timestamp.
     
     Args:
         storage_path: Path to the storage directory
-        event_info: Event information dict
-        time_window_seconds: How many seconds before/after event timestamp to search
+        device_id: Device whose live_view directory to scan
         
     Returns:
-        List of paths to potential matching videos
+        Tuple of (sorted numpy int64 array of clip timestamps, clip paths in the same order)
     """
-    device_id = event_info['device_id']
-    event_timestamp = event_info['timestamp']
-    
     # Path to live_view directory for this device
     live_view_dir = os.path.join(storage_path, device_id, "live_view")
     
-    if not os.path.exists(live_view_dir):
+    timestamps = []
+    paths = []
+    
+    # One directory read; names are <unix timestamp>.mp4, so no per-file stat is needed
+    try:
+        with os.scandir(live_view_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.endswith(".mp4"):
+                    continue
+                try:
+                    timestamps.append(int(name[:-4]))
+                except ValueError:
+                    # Filename doesn't contain a valid timestamp
+                    continue
+                paths.append(entry.path)
+    except FileNotFoundError:
         logger.warning(f"Live view directory doesn't exist: {live_view_dir}")
-        return []
+    
+    ts_array = np.array(timestamps, dtype=np.int64)
+    order = np.argsort(ts_array, kind="stable")
+    return ts_array[order], [paths[i] for i in order]
+
+
+def find_matching_videos(storage_path, event_info, time_window_seconds=30, video_index=None):
+    """
+    Find videos that might match an event based on timestamps.
+    
+    Args:
+        storage_path: Path to the storage directory
+        event_info: EventInfo for the event
+        time_window_seconds: How many seconds before/after event timestamp to search
+        video_index: Optional result of build_video_index for the event's device,
+            so repeated lookups don't rescan the directory
         
-    # Get all MP4 files in the directory
-    video_files = glob.glob(os.path.join(live_view_dir, "*.mp4"))
+    Returns:
+        List of VideoInfo tuples for potential matches, closest first
+    """
+    event_timestamp = event_info.timestamp
     
-    # Look for videos with timestamps close to the event timestamp
-    matching_videos = []
+    if video_index is None:
+        video_index = build_video_index(storage_path, event_info.device_id)
+    ts_array, paths = video_index
     
-    for video_file in video_files:
-        # Extract timestamp from filename
-        video_filename = os.path.basename(video_file)
-        try:
-            video_timestamp = int(os.path.splitext(video_filename)[0])
-            
-            # Check if timestamp is within window
-            if abs(video_timestamp - event_timestamp) <= time_window_seconds:
-                matching_videos.append({
-                    'path': video_file,
-                    'timestamp': video_timestamp,
-                    'time_diff': abs(video_timestamp - event_timestamp)
-                })
-        except ValueError:
-            # Filename doesn't contain a valid timestamp
-            continue
+    # Binary search for the clips inside the window
+    lo = int(np.searchsorted(ts_array, event_timestamp - time_window_seconds, side="left"))
+    hi = int(np.searchsorted(ts_array, event_timestamp + time_window_seconds, side="right"))
+    
+    # Look for videos with timestamps close to the event timestamp
+    matching_videos = [
+        VideoInfo(
+            path=paths[i],
+            timestamp=int(ts_array[i]),
+            time_diff=abs(int(ts_array[i]) - event_timestamp)
+        )
+        for i in range(lo, hi)
+    ]
             
     # Sort by timestamp difference (closest first)
-    matching_videos.sort(key=lambda x: x['time_diff'])
+    matching_videos.sort(key=lambda x: x.time_diff)
     
     return matching_videos
 
 
+def link_or_copy(source_path, dest_path):
+    """
+    Place a video at dest_path, hardlinking it when possible.
+    
+    A hardlink costs no copying or extra disk space. Across filesystems (or
+    where links aren't supported) it falls back to shutil.copy2, which copies
+    inside the kernel where the platform allows. The destination is replaced
+    atomically either way.
+    
+    Args:
+        source_path: Existing video file
+        dest_path: Where the video should appear
+    """
+    tmp_path = temp_path(dest_path)
+    try:
+        try:
+            os.link(source_path, tmp_path)
+        except OSError:
+            shutil.copy2(source_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def fix_event_video(storage_path, event_info, video_info):
     """
     Fix an event by copying the video to the event directory and updating the event.json.
     
     Args:
         storage_path: Path to the storage directory 
-        event_info: Event information dict
-        video_info: Video information dict
+        event_info: EventInfo for the event
+        video_info: VideoInfo for the clip to attach
         
     Returns:
         Path to the copied video if successful, None otherwise
     """
-    device_id = event_info['device_id']
-    event_id = event_info['id']
-    event_type = event_info['kind']
+    device_id = event_info.device_id
+    event_id = event_info.id
+    event_type = event_info.kind
     
     # Source video path
-    source_path = video_info['path']
+    source_path = video_info.path
     
     # Create the event directory
     event_dir = os.path.join(storage_path, device_id, event_type, event_id)
@@ -161,21 +239,21 @@ def fix_event_video(storage_path, event_info, video_info):
     
     # Copy the video file
     try:
-        shutil.copy2(source_path, dest_path)
+        link_or_copy(source_path, dest_path)
         logger.info(f"Copied video from {source_path} to {dest_path}")
         
         # Update event.json
         event_json_path = os.path.join(event_dir, "event.json")
         
-        if os.path.exists(event_json_path):
-            with open(event_json_path, 'r') as f:
-                event_data = json.load(f)
-        else:
+        try:
+            with open(event_json_path, 'rb') as f:
+                event_data = orjson.loads(f.read())
+        except FileNotFoundError:
             # Create a basic event data structure if it doesn't exist
             event_data = {
                 "id": event_id,
                 "kind": event_type,
-                "created_at": event_info['created_at'],
+                "created_at": event_info.created_at,
                 "device_id": device_id
             }
             
@@ -183,9 +261,9 @@ def fix_event_video(storage_path, event_info, video_info):
         event_data["has_video"] = True
         event_data["video_path"] = dest_path
         
-        # Save updated event data
-        with open(event_json_path, 'w') as f:
-            json.dump(event_data, f, default=str, indent=2)
+        # Save updated event data; write then rename so a crash can't leave a torn file
+        with atomic_open(event_json_path) as f:
+            f.write(orjson.dumps(event_data, default=str))
             
         logger.info(f"Updated event.json with video information")
         return dest_path
@@ -194,6 +272,25 @@ def fix_event_video(storage_path, event_info, video_info):
         return None
 
 
+async def import_events(storage_path, database_url):
+    """
+    Import every stored event, including its video information, into a database.
+    
+    Args:
+        storage_path: Path to the storage directory
+        database_url: SQLAlchemy URL of the database to import into
+        
+    Returns:
+        Number of events inserted or updated with video info
+    """
+    events = await FileStorage(storage_path).list_events()
+    database = DatabaseStorage(database_url)
+    try:
+        return await database.bulk_import(events)
+    finally:
+        await database.close()
+
+
 async def main():
     parser = argparse.ArgumentParser(description="Fix missing video associations for Ring events")
     parser.add_argument("--storage", default=os.path.join(project_root, "captured_media"),
@@ -203,6 +300,8 @@ async def main():
     parser.add_argument("--until", help="Only process events before this date (YYYY-MM-DD)")
     parser.add_argument("--window", type=int, default=30,
                         help="Time window in seconds to match videos to events")
+    parser.add_argument("--database",
+                        help="SQLAlchemy database URL to import the events and their videos into")
     parser.add_argument("--dry-run", action="store_true",
                         help="Don't actually fix anything, just show what would be done")
     
@@ -228,35 +327,61 @@ async def main():
             logger.info("No unassociated events found")
             return
             
-        fixed_count = 0
+        # Each device's live_view directory is scanned once, up front
+        device_ids = sorted({event.device_id for event in unassociated_events})
+        loop = asyncio.get_running_loop()
+        indexes = await asyncio.gather(
+            *(loop.run_in_executor(io_executor(), functools.partial(build_video_index, args.storage, device_id))
+              for device_id in device_ids)
+        )
+        video_indexes = dict(zip(device_ids, indexes))
         
-        # Process each unassociated event
-        for event in unassociated_events:
-            logger.info(f"Processing event {event['id']} ({event['kind']} on {event['created_at']})")
+        # Copies are I/O bound, so several run at once in the I/O pool
+        slots = asyncio.Semaphore(FIX_CONCURRENCY)
+        
+        async def process(event):
+            logger.info(f"Processing event {event.id} ({event.kind} on {event.created_at})")
             
             # Find potential matching videos
-            matching_videos = find_matching_videos(args.storage, event, args.window)
+            matching_videos = find_matching_videos(
+                args.storage, event, args.window, video_indexes[event.device_id]
+            )
             
             if not matching_videos:
-                logger.warning(f"No matching videos found for event {event['id']}")
-                continue
+                logger.warning(f"No matching videos found for event {event.id}")
+                return False
                 
             best_match = matching_videos[0]
-            logger.info(f"Found best match: {os.path.basename(best_match['path'])} " +
-                       f"(time difference: {best_match['time_diff']} seconds)")
+            logger.info(f"Found best match: {os.path.basename(best_match.path)} " +
+                       f"(time difference: {best_match.time_diff} seconds)")
             
             if args.dry_run:
-                logger.info(f"[DRY RUN] Would fix event {event['id']} with video {best_match['path']}")
-                continue
+                logger.info(f"[DRY RUN] Would fix event {event.id} with video {best_match.path}")
+                return False
                 
             # Fix the event
-            if fix_event_video(args.storage, event, best_match):
-                fixed_count += 1
+            async with slots:
+                return bool(await loop.run_in_executor(
+                    io_executor(), functools.partial(fix_event_video, args.storage, event, best_match)
+                ))
+        
+        # Process each unassociated event
+        results = await asyncio.gather(*(process(event) for event in unassociated_events))
+        fixed_count = sum(results)
                 
         logger.info(f"Fixed {fixed_count} events out of {len(unassociated_events)} unassociated events")
         
     except Exception as e:
         logger.error(f"Error: {e}")
+        
+    finally:
+        # Backfill the database even when there was nothing to fix
+        if args.database and not args.dry_run:
+            try:
+                imported = await import_events(args.storage, args.database)
+                logger.info(f"Imported {imported} events into {args.database}")
+            except Exception as e:
+                logger.error(f"Error importing events: {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+"""Filesystem helpers and the blocking-I/O thread pool shared across the application."""
+
+import atexit
+import contextlib
+import functools
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, TypeVar
+
+_T = TypeVar("_T")
+
+# Threads in the shared blocking-I/O pool
+IO_WORKERS = 8
+
+
+@functools.lru_cache(maxsize=None)
+def io_executor() -> ThreadPoolExecutor:
+    """
+    Get the bounded thread pool for blocking I/O, such as directory scans,
+    copies and plain sleep/wake callbacks.
+    
+    One pool is shared by every caller so the thread count stays
+    predictable. It's created on first use, so importing a module that uses
+    it starts no threads, and shut down at exit.
+    """
+    executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="ring-io")
+    atexit.register(executor.shutdown, wait=False)
+    return executor
+
+
+@functools.lru_cache(maxsize=4096)
+def ensure_dir(path: str) -> None:
+    """Create a directory once; repeat calls for the same path skip the syscalls."""
+    os.makedirs(path, exist_ok=True)
+
+
+def in_parent_dir(path: str, func: Callable[..., _T], *args) -> _T:
+    """
+    Call a function that creates path, making sure its directory exists.
+
+    The directory is only created the first time it's seen. If it was removed
+    after that, func raises FileNotFoundError; the directory is then created
+    again and func retried once.
+
+    Args:
+        path: File that func creates
+        func: Function to call
+        *args: Arguments for func
+
+    Returns:
+        What func returned
+    """
+    directory = os.path.dirname(path)
+    ensure_dir(directory)
+    try:
+        return func(*args)
+    except FileNotFoundError:
+        # Directory was removed after it was cached
+        os.makedirs(directory, exist_ok=True)
+        return func(*args)
+
+
+def temp_path(path: str) -> str:
+    """
+    Pick a unique temporary file name next to path.
+    
+    Every call gets its own name, so concurrent writers of the same file,
+    in this process or another one sharing the directory, never write
+    into each other's temporary file.
+    """
+    return f"{path}.{uuid.uuid4().hex}.tmp"
+
+
+@contextlib.contextmanager
+def atomic_open(path: str) -> Iterator:
+    """
+    Open a uniquely named temporary file next to path for writing.
+    
+    The directory is created if needed. When the block exits normally the
+    file replaces path in one rename, so readers never see a torn file and
+    the last writer to finish wins. On error the temporary file is removed.
+    
+    Args:
+        path: File to replace
+        
+    Yields:
+        The temporary file, opened for binary writing
+    """
+    tmp_path = temp_path(path)
+    try:
+        with in_parent_dir(path, open, tmp_path, 'xb') as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
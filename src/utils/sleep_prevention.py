@@ -2,15 +2,17 @@
 
 import logging
 import platform
-import subprocess
 import os
-import signal
 import asyncio
-from typing import Optional, Set
+from types import MappingProxyType
+from typing import List, Optional, Set
 from enum import Enum, auto
 
 logger = logging.getLogger(__name__)
 
+# The platform can't change while the process runs, so look it up once
+_PLATFORM = platform.system()
+
 class SleepMode(Enum):
     """Sleep prevention modes."""
     PREVENT_ALL = auto()        # Prevent idle, display, and disk sleep
@@ -18,6 +20,25 @@ class SleepMode(Enum):
     PREVENT_DISK_ONLY = auto()   # Prevent disk sleep only
     CUSTOM = auto()              # Custom configuration based on flags
 
+# caffeinate flags per mode (macOS):
+# -i = prevent idle sleep (system sleep)
+# -d = prevent display sleep
+# -m = prevent disk sleep
+# -s = prevent system sleep (sleep on battery)
+_CAFFEINATE_FLAGS = MappingProxyType({
+    SleepMode.PREVENT_ALL: ("-i", "-d", "-m", "-s"),
+    SleepMode.PREVENT_SYSTEM_ONLY: ("-i", "-s"),  # Allow display sleep
+    SleepMode.PREVENT_DISK_ONLY: ("-m",),
+})
+
+# systemd-inhibit --what values per mode (Linux); possible values are sleep, idle,
+# shutdown, handle-power-key, handle-suspend-key, handle-hibernate-key, handle-lid-switch
+_INHIBIT_WHAT = MappingProxyType({
+    SleepMode.PREVENT_ALL: "sleep:idle:handle-lid-switch",
+    SleepMode.PREVENT_SYSTEM_ONLY: "sleep:idle",  # Allow display sleep
+    SleepMode.PREVENT_DISK_ONLY: "idle",
+})
+
 class SleepPrevention:
     """
     Utility class for preventing system sleep on macOS and Linux platforms.
@@ -35,8 +56,8 @@ class SleepPrevention:
         Args:
             mode: The sleep prevention mode to use
         """
-        self._process = None
-        self._platform = platform.system()
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._command: Optional[List[str]] = None
         self._active = False
         self._mode = mode
         self._custom_flags: Set[str] = set()
@@ -71,7 +92,20 @@ class SleepPrevention:
             logger.info("Setting custom flags automatically sets mode to CUSTOM")
             self._mode = SleepMode.CUSTOM
     
-    def start(self) -> bool:
+    # Seconds stop_async waits for the helper process to exit before killing it
+    STOP_TIMEOUT = 2.0
+    
+    async def _spawn(self, command: List[str]) -> asyncio.subprocess.Process:
+        """Start a helper process without blocking the event loop on fork/exec."""
+        self._process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        self._command = command
+        return self._process
+    
+    async def start(self) -> bool:
         """
         Start sleep prevention based on the configured mode.
         
@@ -83,83 +117,46 @@ class SleepPrevention:
             
         result = False
         try:
-            if self._platform == "Darwin":  # macOS
+            if _PLATFORM == "Darwin":  # macOS
                 # On macOS, use the caffeinate command-line utility
-                # Flag definitions:
-                # -i = prevent idle sleep (system sleep)
-                # -d = prevent display sleep
-                # -m = prevent disk sleep
-                # -s = prevent system sleep (sleep on battery)
-                
-                # Determine flags based on mode
-                flags = []
-                if self._mode == SleepMode.PREVENT_ALL:
-                    flags = ["-i", "-d", "-m", "-s"]
-                elif self._mode == SleepMode.PREVENT_SYSTEM_ONLY:
-                    flags = ["-i", "-s"]  # Prevent idle/system sleep but allow display sleep
-                elif self._mode == SleepMode.PREVENT_DISK_ONLY:
-                    flags = ["-m"]
-                elif self._mode == SleepMode.CUSTOM and self._custom_flags:
+                if self._mode == SleepMode.CUSTOM and self._custom_flags:
                     flags = list(self._custom_flags)
                 else:
                     # Default to system-only prevention if no valid option
-                    flags = ["-i", "-s"]
+                    flags = list(_CAFFEINATE_FLAGS.get(self._mode, _CAFFEINATE_FLAGS[SleepMode.PREVENT_SYSTEM_ONLY]))
                 
                 # Start caffeinate with the selected flags
-                command = ["caffeinate"] + flags
-                self._process = subprocess.Popen(
-                    command,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
+                await self._spawn(["caffeinate"] + flags)
                 logger.info(f"Caffeinate process started with flags {flags} (PID: {self._process.pid})")
                 result = True
-            elif self._platform == "Linux":
+            elif _PLATFORM == "Linux":
                 # On Linux, we can use systemd-inhibit
-                # Possible values for --what: sleep, idle, shutdown, handle-power-key,
-                # handle-suspend-key, handle-hibernate-key, handle-lid-switch
-                
-                # Determine flags based on mode
-                what_flags = ""
-                if self._mode == SleepMode.PREVENT_ALL:
-                    what_flags = "sleep:idle:handle-lid-switch"
-                elif self._mode == SleepMode.PREVENT_SYSTEM_ONLY:
-                    what_flags = "sleep:idle"  # Prevent system sleep but allow display sleep
-                elif self._mode == SleepMode.PREVENT_DISK_ONLY:
-                    what_flags = "idle"
-                elif self._mode == SleepMode.CUSTOM and self._custom_flags:
+                if self._mode == SleepMode.CUSTOM and self._custom_flags:
                     # For Linux custom, we expect the full --what string
                     # e.g., "sleep:idle"
-                    custom_what = next((f for f in self._custom_flags if f), "sleep:idle")
-                    what_flags = custom_what
+                    what_flags = next((f for f in self._custom_flags if f), "sleep:idle")
                 else:
                     # Default to system-only prevention
-                    what_flags = "sleep:idle"
+                    what_flags = _INHIBIT_WHAT.get(self._mode, _INHIBIT_WHAT[SleepMode.PREVENT_SYSTEM_ONLY])
                 
                 try:
-                    self._process = subprocess.Popen(
+                    await self._spawn(
                         ["systemd-inhibit", f"--what={what_flags}", "--who=RingDoorbell", 
-                         "--why=Capturing video from Ring devices", "--mode=block", "sleep", "infinity"],
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL
+                         "--why=Capturing video from Ring devices", "--mode=block", "sleep", "infinity"]
                     )
                     logger.info(f"Sleep inhibit process started with flags '{what_flags}' (PID: {self._process.pid})")
                     result = True
-                except (FileNotFoundError, subprocess.SubprocessError) as e:
+                except OSError as e:
                     logger.warning(f"Failed to start systemd-inhibit: {e}")
                     # Optional fallback if xdg-screensaver is available
                     try:
-                        self._process = subprocess.Popen(
-                            ["xdg-screensaver", "suspend", str(os.getpid())],
-                            stdout=subprocess.DEVNULL,
-                            stderr=subprocess.DEVNULL
-                        )
+                        await self._spawn(["xdg-screensaver", "suspend", str(os.getpid())])
                         logger.info(f"xdg-screensaver suspend process started (PID: {self._process.pid})")
                         result = True
-                    except (FileNotFoundError, subprocess.SubprocessError) as e:
+                    except OSError as e:
                         logger.warning(f"Failed to start xdg-screensaver: {e}")
             else:
-                logger.warning(f"Sleep prevention not supported on {self._platform}")
+                logger.warning(f"Sleep prevention not supported on {_PLATFORM}")
                 
             self._active = result
             return result
@@ -167,26 +164,44 @@ class SleepPrevention:
             logger.error(f"Error starting sleep prevention: {e}")
             return False
     
-    def stop(self) -> None:
-        """Stop sleep prevention."""
+    def stop(self) -> Optional[asyncio.subprocess.Process]:
+        """
+        Stop sleep prevention without waiting for the helper process to exit.
+        
+        Returns:
+            The terminated process, so async callers can wait on it, or None
+        """
         if not self._active or not self._process:
-            return
+            return None
             
+        process = self._process
         try:
-            # Terminate the process
-            os.kill(self._process.pid, signal.SIGTERM)
-            logger.info(f"Sleep prevention process (PID: {self._process.pid}) terminated")
+            process.terminate()
+            logger.info(f"Sleep prevention process (PID: {process.pid}) terminated")
+        except ProcessLookupError:
+            pass
         except Exception as e:
             logger.warning(f"Failed to terminate sleep prevention process: {e}")
         finally:
             self._process = None
+            self._command = None
             self._active = False
+        return process
     
     async def stop_async(self) -> None:
-        """Stop sleep prevention asynchronously."""
-        self.stop()
-        # Allow a moment for process to terminate
-        await asyncio.sleep(0.1)
+        """Stop sleep prevention and wait for the helper process to exit."""
+        process = self.stop()
+        if process is None:
+            return
+        try:
+            await asyncio.wait_for(process.wait(), timeout=self.STOP_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Sleep prevention process (PID: {process.pid}) did not exit - killing it")
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
     
     @property
     def mode(self) -> SleepMode:
@@ -199,12 +214,12 @@ class SleepPrevention:
             return "Sleep prevention: inactive"
             
         mode_str = str(self._mode).split('.')[-1]
-        if self._platform == "Darwin":
+        if _PLATFORM == "Darwin":
             return f"Sleep prevention: active (macOS caffeinate, mode: {mode_str}, PID: {self._process.pid if self._process else 'None'})"
-        elif self._platform == "Linux":
-            return f"Sleep prevention: active (Linux {self._process.args[0] if self._process and hasattr(self._process, 'args') else 'inhibit'}, mode: {mode_str}, PID: {self._process.pid if self._process else 'None'})"
+        elif _PLATFORM == "Linux":
+            return f"Sleep prevention: active (Linux {self._command[0] if self._command else 'inhibit'}, mode: {mode_str}, PID: {self._process.pid if self._process else 'None'})"
         else:
-            return f"Sleep prevention: active (unsupported platform {self._platform})"
+            return f"Sleep prevention: active (unsupported platform {_PLATFORM})"
     
     @property
     def is_active(self) -> bool:
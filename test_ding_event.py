@@ -235,7 +235,7 @@ async def main():
                         event = await storage.retrieve_event(event_id)
                         if event:
                             # Create updated event object
-                            event_dict = event.dict()
+                            event_dict = event.model_dump()
                             event_dict["has_video"] = True
                             event_dict["video_path"] = dest_path
                             
@@ -24,6 +24,27 @@ from src.config import Config
 from src.core.interfaces import EventData, MotionEventData
 
 
+def _scan_mp4s(directory):
+    """List the MP4 files in a directory, newest first, using scandir's cached stats."""
+    with os.scandir(directory) as entries:
+        mp4s = [entry for entry in entries if entry.name.endswith(".mp4")]
+    mp4s.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    return mp4s
+
+
+async def _latest_mp4(directory):
+    """
+    Find the most recent MP4 file in a directory without blocking the event loop.
+    
+    Returns:
+        Tuple of (path, size in bytes), or None if the directory has no MP4 files
+    """
+    mp4s = await asyncio.to_thread(_scan_mp4s, directory)
+    if not mp4s:
+        return None
+    return mp4s[0].path, mp4s[0].stat().st_size
+
+
 async def main():
     """Simulate a motion event and test video recording."""
     logger.info("Starting motion event simulation...")
@@ -50,6 +71,10 @@ async def main():
     event_id = f"test_motion_{timestamp}"
     device_id = "589851570"  # Replace with your actual device ID if different
     
+    # Where the recording lands first, and the event directory it should be moved to
+    live_view_dir = Path(storage_path) / device_id / "live_view"
+    video_path_base = Path(storage_path) / device_id / "motion" / event_id
+    
     try:
         # Initialize auth
         logger.info("Authenticating...")
@@ -68,7 +93,6 @@ async def main():
             
         # Print token information for debugging
         if token:
-            import json
             try:
                 logger.info(f"Token type: {type(token)}")
                 if isinstance(token, dict):
@@ -122,45 +146,36 @@ async def main():
         # Process the event
         await capture_engine.capture(event_data)
         
-        # Wait for recording to be in progress
-        logger.info("Waiting 5 seconds for recording to start...")
-        await asyncio.sleep(5)
+        # Wait for recording and processing to complete, rather than a fixed delay
+        logger.info("Waiting up to 35 seconds for recording and processing to complete...")
+        try:
+            await asyncio.wait_for(capture_engine.wait_for_completion(event_id), timeout=35)
+        except asyncio.TimeoutError:
+            logger.warning("Timed out waiting for the event to finish processing")
         
         # Check if the live_view directory exists
-        live_view_dir = os.path.join(storage_path, device_id, "live_view")
-        if os.path.exists(live_view_dir):
-            files = os.listdir(live_view_dir)
-            mp4_files = [f for f in files if f.endswith(".mp4")]
-            if mp4_files:
-                # Get the most recent MP4 file
-                mp4_files.sort(key=lambda f: os.path.getmtime(os.path.join(live_view_dir, f)), reverse=True)
-                latest_mp4 = mp4_files[0]
-                latest_path = os.path.join(live_view_dir, latest_mp4)
-                file_size = os.path.getsize(latest_path)
-                logger.info(f"Found MP4 file in live_view directory: {latest_mp4}, size: {file_size} bytes")
+        latest = None
+        if live_view_dir.is_dir():
+            latest = await _latest_mp4(live_view_dir)
+            if latest:
+                latest_path, file_size = latest
+                logger.info(f"Found MP4 file in live_view directory: {os.path.basename(latest_path)}, size: {file_size} bytes")
             else:
                 logger.warning("No MP4 files found in live_view directory")
         else:
             logger.warning(f"Live view directory not found: {live_view_dir}")
         
-        # Wait for recording and processing to complete
-        logger.info("Waiting 30 seconds for recording and processing to complete...")
-        await asyncio.sleep(30)
-        
         # Check if video was created in the event directory
         logger.info("Checking for recorded video in the event directory...")
         
-        # Path pattern where the video should be stored
-        video_path_base = os.path.join(storage_path, device_id, "motion", event_id)
-        
-        if os.path.exists(video_path_base):
-            files = os.listdir(video_path_base)
+        if video_path_base.is_dir():
+            files = [entry.name for entry in video_path_base.iterdir()]
             logger.info(f"Event directory contents: {files}")
             
-            video_files = [f for f in files if f.endswith(".mp4")]
+            video_files = list(video_path_base.glob("*.mp4"))
             if video_files:
-                video_path = os.path.join(video_path_base, video_files[0])
-                file_size = os.path.getsize(video_path)
+                video_path = video_files[0]
+                file_size = video_path.stat().st_size
                 logger.info(f"✅ Video recorded successfully: {video_path}, size: {file_size} bytes")
                 
                 # Check if the event was updated with video information
@@ -173,17 +188,10 @@ async def main():
                 logger.warning(f"❌ No video file found in {video_path_base}")
                 logger.info(f"Directory contents: {files}")
                 
-                # Check the live_view directory again
-                if os.path.exists(live_view_dir):
-                    files = os.listdir(live_view_dir)
-                    mp4_files = [f for f in files if f.endswith(".mp4")]
-                    if mp4_files:
-                        # Get the most recent MP4 file
-                        mp4_files.sort(key=lambda f: os.path.getmtime(os.path.join(live_view_dir, f)), reverse=True)
-                        latest_mp4 = mp4_files[0]
-                        latest_path = os.path.join(live_view_dir, latest_mp4)
-                        file_size = os.path.getsize(latest_path)
-                        logger.info(f"Video is in live_view but not moved to event directory: {latest_path}, size: {file_size} bytes")
+                # Reuse the live_view scan from above
+                if latest:
+                    latest_path, file_size = latest
+                    logger.info(f"Video is in live_view but not moved to event directory: {latest_path}, size: {file_size} bytes")
                 
                 # Check if the event was saved properly
                 event = await storage.retrieve_event(event_id)
@@ -194,43 +202,36 @@ async def main():
         else:
             logger.warning(f"❌ Event directory not found: {video_path_base}")
             
-            # Check the live_view directory again
-            if os.path.exists(live_view_dir):
-                files = os.listdir(live_view_dir)
-                mp4_files = [f for f in files if f.endswith(".mp4")]
-                if mp4_files:
-                    # Get the most recent MP4 file
-                    mp4_files.sort(key=lambda f: os.path.getmtime(os.path.join(live_view_dir, f)), reverse=True)
-                    latest_mp4 = mp4_files[0]
-                    latest_path = os.path.join(live_view_dir, latest_mp4)
-                    file_size = os.path.getsize(latest_path)
-                    logger.info(f"Video is in live_view but event directory not created: {latest_path}, size: {file_size} bytes")
+            # Reuse the live_view scan from above
+            if latest:
+                latest_path, file_size = latest
+                logger.info(f"Video is in live_view but event directory not created: {latest_path}, size: {file_size} bytes")
+                
+                # Let's try to manually copy it
+                try:
+                    # Create event directory
+                    await asyncio.to_thread(video_path_base.mkdir, parents=True, exist_ok=True)
+                    dest_path = str(video_path_base / "video.mp4")
+                    
+                    # Copy the file in a worker thread; copy2 uses sendfile on Linux
+                    await asyncio.to_thread(shutil.copy2, latest_path, dest_path)
+                    logger.info(f"✅ Manually copied video to event directory: {dest_path}")
                     
-                    # Let's try to manually copy it
-                    try:
-                        # Create event directory
-                        os.makedirs(video_path_base, exist_ok=True)
-                        dest_path = os.path.join(video_path_base, "video.mp4")
+                    # Update the event with video information
+                    event = await storage.retrieve_event(event_id)
+                    if event:
+                        # Create updated event object
+                        event_dict = event.model_dump()
+                        event_dict["has_video"] = True
+                        event_dict["video_path"] = dest_path
                         
-                        # Copy the file
-                        shutil.copy2(latest_path, dest_path)
-                        logger.info(f"✅ Manually copied video to event directory: {dest_path}")
+                        updated_event = MotionEventData(**event_dict)
                         
-                        # Update the event with video information
-                        event = await storage.retrieve_event(event_id)
-                        if event:
-                            # Create updated event object
-                            event_dict = event.dict()
-                            event_dict["has_video"] = True
-                            event_dict["video_path"] = dest_path
-                            
-                            updated_event = MotionEventData(**event_dict)
-                            
-                            # Save the updated event
-                            await storage.save_event(updated_event)
-                            logger.info(f"✅ Manually updated event with video information")
-                    except Exception as e:
-                        logger.error(f"Error manually copying video: {e}")
+                        # Save the updated event
+                        await storage.save_event(updated_event)
+                        logger.info(f"✅ Manually updated event with video information")
+                except Exception as e:
+                    logger.error(f"Error manually copying video: {e}")
             
     except Exception as e:
         logger.error(f"Error: {e}", exc_info=True)
@@ -4,7 +4,9 @@ import asyncio
 import json
 import os
 import pytest
+import pytest_asyncio
 import time
+from dataclasses import dataclass, field
 from datetime import datetime
 
 from src.core.interfaces import EventData
@@ -13,89 +15,126 @@ from src.models.ring_events import RingEvent
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select
+from sqlalchemy import event, select
 
 
+@dataclass(frozen=True, slots=True)
 class MockEvent:
     """Mock Ring API event."""
-    def __init__(self, id, kind="motion", device_name="Test Device", device_id="123456"):
-        self.id = id
-        self.kind = kind
-        self.now = time.time()
-        self.doorbot_id = device_id
-        self.device_name = device_name
+    id: str
+    kind: str = "motion"
+    device_name: str = "Test Device"
+    doorbot_id: str = "123456"
+    now: float = field(default_factory=time.time)
 
 
-@pytest.fixture
-async def db_storage():
-    """Create a database storage for testing."""
+# Timestamp shared by every event in this module
+_NOW_ISO = datetime.now().isoformat()
+
+# Read-only events built and validated once; use model_copy() before mutating
+_EVENT = EventData(
+    id="test-event-123",
+    kind="motion",
+    created_at=_NOW_ISO,
+    device_id="test-device-456",
+    device_name="Test Device"
+)
+_DING_EVENT = EventData(
+    id="test-ding-123",
+    kind="ding",
+    created_at=_NOW_ISO,
+    device_id="test-device-456",
+    device_name="Test Device"
+)
+_ON_DEMAND_EVENT = EventData(
+    id="test-ondemand-123",
+    kind="on_demand",
+    created_at=_NOW_ISO,
+    device_id="test-device-456",
+    device_name="Test Device"
+)
+_OTHER_EVENT = EventData(
+    id="test-other-123",
+    kind="custom_event",  # A non-standard event type
+    created_at=_NOW_ISO,
+    device_id="test-device-456",
+    device_name="Test Device"
+)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def db_engine():
+    """Create the database engine and tables once for the whole test session."""
     # Use in-memory SQLite database for testing
     db_url = "sqlite+aiosqlite:///:memory:"
     engine = create_async_engine(db_url)
     
+    # pysqlite defers BEGIN, so an outer SAVEPOINT's RELEASE would commit;
+    # emit BEGIN ourselves so per-test rollbacks really discard writes
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
     # Create tables
     from src.models.base import Base
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
-    # Create storage
-    storage = DatabaseStorage(db_url)
-    
-    yield storage
+    yield engine
     
-    # Cleanup
-    await storage.close()
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def db_storage(db_engine):
+    """Create a database storage for testing, rolled back after each test."""
+    async with db_engine.connect() as conn:
+        # Writes commit to savepoints inside this transaction
+        transaction = await conn.begin()
+        storage = DatabaseStorage.from_engine(conn)
+        
+        yield storage
+        
+        # Cleanup
+        await storage.close()
+        await transaction.rollback()
+
+
+@pytest.fixture(scope="module")
+def now_iso():
+    """Timestamp shared by every event in this module."""
+    return _NOW_ISO
 
 
 @pytest.fixture
 def event_data():
-    """Create sample event data for testing."""
-    return EventData(
-        id="test-event-123",
-        kind="motion",
-        created_at=datetime.now().isoformat(),
-        device_id="test-device-456",
-        device_name="Test Device"
-    )
+    """Sample event data for testing."""
+    return _EVENT
 
 
 @pytest.fixture
 def ding_event_data():
-    """Create sample ding event data for testing."""
-    return EventData(
-        id="test-ding-123",
-        kind="ding",
-        created_at=datetime.now().isoformat(),
-        device_id="test-device-456",
-        device_name="Test Device"
-    )
+    """Sample ding event data for testing."""
+    return _DING_EVENT
 
 
 @pytest.fixture
 def on_demand_event_data():
-    """Create sample on-demand event data for testing."""
-    return EventData(
-        id="test-ondemand-123",
-        kind="on_demand",
-        created_at=datetime.now().isoformat(),
-        device_id="test-device-456",
-        device_name="Test Device" 
-    )
+    """Sample on-demand event data for testing."""
+    return _ON_DEMAND_EVENT
 
 
 @pytest.fixture
 def other_event_data():
-    """Create sample event with non-standard type for testing."""
-    return EventData(
-        id="test-other-123",
-        kind="custom_event",  # A non-standard event type
-        created_at=datetime.now().isoformat(),
-        device_id="test-device-456",
-        device_name="Test Device"
-    )
+    """Sample event with non-standard type for testing."""
+    return _OTHER_EVENT
 
 @pytest.mark.asyncio
-async def test_file_storage_handles_errors(tmp_path):
+async def test_file_storage_handles_errors(tmp_path, now_iso):
     """Test that FileStorage handles errors gracefully."""
     # Create a storage with a temporary path
     storage_path = str(tmp_path)
@@ -105,7 +144,7 @@ async def test_file_storage_handles_errors(tmp_path):
     event = EventData(
         id="test-event-456",
         kind="motion",
-        created_at=datetime.now().isoformat(),
+        created_at=now_iso,
         device_id="test-device-789",
         device_name="Test Device"
     )
@@ -115,41 +154,163 @@ async def test_file_storage_handles_errors(tmp_path):
     assert result is True, "Save should return True on success"
     
     # Verify the file was created
-    date_str = datetime.now().strftime("%Y-%m-%d")
+    date_str = now_iso[:10]  # YYYY-MM-DD
     event_dir = os.path.join(storage_path, date_str, event.kind)
     files = os.listdir(event_dir)
     assert len(files) == 1, "One file should be created"
     assert files[0].startswith(event.id), "Filename should start with event ID"
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_db_storage_different_event_types(db_storage, ding_event_data, on_demand_event_data, other_event_data):
     """Test that different event types are saved correctly."""
-    # Save different event types
-    result1 = await db_storage.save_event(ding_event_data)
-    result2 = await db_storage.save_event(on_demand_event_data)
-    result3 = await db_storage.save_event(other_event_data)
+    # Save different event types concurrently, so they share one write batch
+    result1, result2, result3 = await asyncio.gather(
+        db_storage.save_event(ding_event_data),
+        db_storage.save_event(on_demand_event_data),
+        db_storage.save_event(other_event_data)
+    )
     
     assert result1 is True, "Ding event should be saved successfully"
     assert result2 is True, "On-demand event should be saved successfully"
     assert result3 is True, "Other event should be saved successfully"
     
-    # Verify all events are in the database
+    # Verify all events are in the database with a single query
+    ids = [ding_event_data.id, on_demand_event_data.id, other_event_data.id]
     async with db_storage._session_factory() as session:
-        # Check ding event
-        result = await session.execute(select(RingEvent).where(RingEvent.id == ding_event_data.id))
-        ding_event = result.scalar_one_or_none()
-        assert ding_event is not None, "Ding event should be in the database"
-        assert ding_event.kind == "ding", "Event kind should be 'ding'"
-        
-        # Check on-demand event
-        result = await session.execute(select(RingEvent).where(RingEvent.id == on_demand_event_data.id))
-        on_demand_event = result.scalar_one_or_none()
-        assert on_demand_event is not None, "On-demand event should be in the database"
-        assert on_demand_event.kind == "on_demand", "Event kind should be 'on_demand'"
-        
-        # Check other event
-        result = await session.execute(select(RingEvent).where(RingEvent.id == other_event_data.id))
-        other_event = result.scalar_one_or_none()
-        assert other_event is not None, "Other event should be in the database"
-        assert other_event.kind == "custom_event", "Event kind should be 'custom_event'"
+        result = await session.execute(select(RingEvent).where(RingEvent.id.in_(ids)))
+        by_id = {row.id: row for row in result.scalars().all()}
+    
+    # Check ding event
+    ding_event = by_id.get(ding_event_data.id)
+    assert ding_event is not None, "Ding event should be in the database"
+    assert ding_event.kind == "ding", "Event kind should be 'ding'"
+    
+    # Check on-demand event
+    on_demand_event = by_id.get(on_demand_event_data.id)
+    assert on_demand_event is not None, "On-demand event should be in the database"
+    assert on_demand_event.kind == "on_demand", "Event kind should be 'on_demand'"
+    
+    # Check other event
+    other_event = by_id.get(other_event_data.id)
+    assert other_event is not None, "Other event should be in the database"
+    assert other_event.kind == "custom_event", "Event kind should be 'custom_event'"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_db_storage_update_with_video(db_storage, event_data):
+    """Test that re-saving an event with video info updates the stored row."""
+    assert await db_storage.save_event(event_data) is True, "First save should insert the event"
+    assert await db_storage.save_event(event_data) is False, "Duplicate save should be skipped"
+    
+    # Load it once so the cached copy has to be replaced
+    stored = await db_storage.retrieve_event(event_data.id)
+    assert stored.has_video is False, "New event should have no video"
+    
+    updated = event_data.model_copy(update={"has_video": True, "video_path": "/videos/test.mp4"})
+    assert await db_storage.save_event(updated) is True, "Save with video info should update the event"
+    
+    stored = await db_storage.retrieve_event(event_data.id)
+    assert stored.has_video is True, "Updated event should have a video"
+    assert stored.video_path == "/videos/test.mp4", "Updated event should keep the video path"
+    assert await db_storage.retrieve_video(event_data.id) == "/videos/test.mp4"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_db_storage_repeated_event_in_one_batch(db_storage, event_data):
+    """Test that repeated saves of one event in a batch each get their own result."""
+    updated = event_data.model_copy(update={"has_video": True, "video_path": "/videos/test.mp4"})
+    results = await asyncio.gather(
+        db_storage.save_event(event_data),
+        db_storage.save_event(event_data),
+        db_storage.save_event(updated)
+    )
+    
+    assert results == [True, False, True], "Insert, skip, then update with video"
+    assert await db_storage.retrieve_video(event_data.id) == "/videos/test.mp4"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_db_storage_bulk_import_records_videos(db_storage, event_data, ding_event_data):
+    """Test that a bulk import inserts new events and attaches videos to existing ones."""
+    assert await db_storage.save_event(event_data) is True
+    
+    with_video = event_data.model_copy(update={"has_video": True, "video_path": "/videos/test.mp4"})
+    imported = await db_storage.bulk_import([with_video, ding_event_data, ding_event_data])
+    
+    assert imported == 2, "One event should be updated and one inserted"
+    assert await db_storage.retrieve_video(event_data.id) == "/videos/test.mp4"
+    assert (await db_storage.retrieve_event(ding_event_data.id)).kind == "ding"
+
+
+@pytest.mark.asyncio
+async def test_file_storage_update_with_video(tmp_path, event_data):
+    """Test that FileStorage batches saves and keeps the latest copy of an event."""
+    storage = FileStorage(str(tmp_path))
+    updated = event_data.model_copy(update={"has_video": True, "video_path": "/videos/test.mp4"})
+    
+    # Saved together, so both land in one batch and the later payload wins
+    results = await asyncio.gather(storage.save_event(event_data), storage.save_event(updated))
+    assert results == [True, True], "Both saves should succeed"
+    
+    stored = await storage.retrieve_event(event_data.id)
+    assert stored.has_video is True, "Retrieved event should be the updated copy"
+    assert stored.video_path == "/videos/test.mp4"
+    
+    # A later save replaces the file and the cached copy
+    assert await storage.save_event(event_data) is True
+    assert (await storage.retrieve_event(event_data.id)).has_video is False
+    
+    await storage.close()
+    event_path = tmp_path / event_data.device_id / event_data.kind / event_data.id / "event.json"
+    assert json.loads(event_path.read_bytes())["has_video"] is False, "File should hold the last save"
+
+
+@pytest.mark.asyncio
+async def test_file_storage_save_video_after_queued_save(tmp_path, event_data):
+    """Test that a video saved after a queued save_event isn't overwritten by it."""
+    storage = FileStorage(str(tmp_path))
+    assert await storage.save_event(event_data) is True
+    
+    metadata = {"device_id": event_data.device_id, "event_type": event_data.kind}
+    _, video_path = await asyncio.gather(
+        storage.save_event(event_data),
+        storage.save_video(event_data.id, b"video", metadata)
+    )
+    
+    await storage.close()
+    event_path = tmp_path / event_data.device_id / event_data.kind / event_data.id / "event.json"
+    stored = json.loads(event_path.read_bytes())
+    assert stored["has_video"] is True, "The video update should land after the queued save"
+    assert stored["video_path"] == video_path
+    assert not [p for p in event_path.parent.iterdir() if p.suffix == ".tmp"], "No temporary files should be left"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_db_storage_bad_row_only_fails_its_own_save(db_storage, event_data, ding_event_data):
+    """Test that one failing row in a batch doesn't fail the other saves."""
+    # device_name is NOT NULL, so this row makes the batch INSERT fail
+    bad_event = event_data.model_copy(update={"id": "test-bad-123", "device_name": None})
+    results = await asyncio.gather(
+        db_storage.save_event(event_data),
+        db_storage.save_event(bad_event),
+        db_storage.save_event(ding_event_data)
+    )
+    
+    assert results == [True, False, True], "Only the bad row should fail"
+    assert await db_storage.retrieve_event(bad_event.id) is None
+    assert await db_storage.retrieve_event(ding_event_data.id) is not None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_db_storage_queued_saves_fail_when_writer_dies(db_storage, event_data, monkeypatch):
+    """Test that saves still queued when the batch writer dies get a result instead of hanging."""
+    async def crash(session, batch):
+        raise RuntimeError("writer crashed")
+    monkeypatch.setattr(db_storage, "_write_batch", crash)
+    
+    results = await asyncio.wait_for(
+        asyncio.gather(*(db_storage.save_event(event_data) for _ in range(3))),
+        timeout=5
+    )
+    assert results == [False, False, False], "Every queued save should report failure"
@@ -2,6 +2,7 @@
 
 import asyncio
 import pytest
+from dataclasses import dataclass
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.app.app_manager import AppManager
@@ -9,13 +10,20 @@ from src.core.interfaces import IAuthManager, IEventListener, IStorage
 from src.capture.capture_engine import CaptureEngine
 
 
+@dataclass(frozen=True, slots=True)
 class MockEvent:
     """Mock Ring API event."""
-    def __init__(self, id, kind, device_name="Test Device", device_id="123456"):
-        self.id = id
-        self.kind = kind
-        self.doorbot_id = device_id
-        self.device_name = device_name
+    id: str
+    kind: str
+    device_name: str = "Test Device"
+    doorbot_id: str = "123456"
+
+
+# Read-only events shared by every test
+_DING_EVENT = MockEvent(id="test-ding-123", kind="ding")
+_MOTION_EVENT = MockEvent(id="test-motion-123", kind="motion")
+_ON_DEMAND_EVENT = MockEvent(id="test-on-demand-123", kind="on_demand")
+_OTHER_EVENT = MockEvent(id="test-other-123", kind="custom_event")
 
 
 @pytest.fixture
@@ -89,8 +97,8 @@ async def test_initialize_registers_event_handlers(app_manager):
 @pytest.mark.asyncio
 async def test_handle_ding_event(app_manager):
     """Test that ding events are handled correctly."""
-    # Create a mock ding event
-    mock_event = MockEvent(id="test-ding-123", kind="ding")
+    # Use the shared mock ding event
+    mock_event = _DING_EVENT
     
     # Call the handler
     await app_manager._handle_ding_event(mock_event)
@@ -102,8 +110,8 @@ async def test_handle_ding_event(app_manager):
 @pytest.mark.asyncio
 async def test_handle_motion_event(app_manager):
     """Test that motion events are handled correctly."""
-    # Create a mock motion event
-    mock_event = MockEvent(id="test-motion-123", kind="motion")
+    # Use the shared mock motion event
+    mock_event = _MOTION_EVENT
     
     # Call the handler
     await app_manager._handle_motion_event(mock_event)
@@ -115,8 +123,8 @@ async def test_handle_motion_event(app_manager):
 @pytest.mark.asyncio
 async def test_handle_on_demand_event(app_manager):
     """Test that on-demand events are handled correctly."""
-    # Create a mock on-demand event
-    mock_event = MockEvent(id="test-on-demand-123", kind="on_demand")
+    # Use the shared mock on-demand event
+    mock_event = _ON_DEMAND_EVENT
     
     # Call the handler
     await app_manager._handle_on_demand_event(mock_event)
@@ -128,8 +136,8 @@ async def test_handle_on_demand_event(app_manager):
 @pytest.mark.asyncio
 async def test_handle_other_event(app_manager):
     """Test that other event types are handled correctly."""
-    # Create a mock event with an unrecognized type
-    mock_event = MockEvent(id="test-other-123", kind="custom_event")
+    # Use the shared mock event with an unrecognized type
+    mock_event = _OTHER_EVENT
     
     # Call the handler
     await app_manager._handle_other_event(mock_event)
@@ -162,11 +170,11 @@ async def test_event_dispatch_calls_correct_handler(app_manager, mock_event_list
         on_demand_handler = mock_event_listener.event_handlers["on_demand"]
         other_handler = mock_event_listener.event_handlers["other"]
         
-        # Create mock events of different types
-        ding_event = MockEvent(id="test-ding-123", kind="ding")
-        motion_event = MockEvent(id="test-motion-123", kind="motion")
-        on_demand_event = MockEvent(id="test-on-demand-123", kind="on_demand")
-        other_event = MockEvent(id="test-other-123", kind="custom_event")
+        # Mock events of different types
+        ding_event = _DING_EVENT
+        motion_event = _MOTION_EVENT
+        on_demand_event = _ON_DEMAND_EVENT
+        other_event = _OTHER_EVENT
         
         # Call the handlers directly (simulating event dispatch)
         await ding_handler(ding_event)
@@ -0,0 +1,146 @@
+"""Tests for the video sinks."""
+
+import asyncio
+import os
+
+import av
+import numpy as np
+import pytest
+from aiortc.mediastreams import VideoStreamTrack
+
+from src.capture import video_sinks
+from src.capture.video_sinks import CVFanoutSink, RecorderSink, _mp4_end
+
+
+@pytest.mark.asyncio
+async def test_recorder_sink_records_track(tmp_path):
+    """Test that a recorded track ends up as a playable MP4 without preallocated padding."""
+    video_path = str(tmp_path / "live_view" / "clip.mp4")
+    completed = []
+    sink = RecorderSink(video_path, callback=lambda path, size: completed.append((path, size)))
+    
+    # LiveViewClient hands the remote track to the recorder the same way
+    sink._rec.addTrack(VideoStreamTrack())
+    await sink.start()
+    await asyncio.sleep(1)
+    await sink.close()
+    
+    file_size = os.path.getsize(video_path)
+    assert completed == [(video_path, file_size)], "Completion callback should get the final file"
+    assert file_size == _mp4_end(video_path), "Preallocated space should be trimmed"
+    with av.open(video_path) as container:
+        frames = sum(1 for _ in container.decode(video=0))
+    assert frames > 0, "Recording should contain decodable video frames"
+
+
+@pytest.mark.asyncio
+async def test_recorder_falls_back_to_libx264(tmp_path, monkeypatch):
+    """Test that recording falls back to libx264 when the preferred encoder can't open."""
+    monkeypatch.setattr(video_sinks, "_select_h264_encoder", lambda: "h264_unavailable")
+    video_path = str(tmp_path / "clip.mp4")
+    sink = RecorderSink(video_path)
+    
+    sink._rec.addTrack(VideoStreamTrack())
+    await sink.start()
+    await asyncio.sleep(0.5)
+    await sink.close()
+    
+    with av.open(video_path) as container:
+        assert container.streams.video[0].codec_context.name == "h264"
+        assert sum(1 for _ in container.decode(video=0)) > 0
+
+
+@pytest.mark.asyncio
+async def test_recorder_sink_reports_close_without_recording(tmp_path):
+    """Test that on_closed runs even when no usable recording was made."""
+    completed = []
+    closed = []
+    sink = RecorderSink(str(tmp_path / "clip.mp4"),
+                        callback=lambda path, size: completed.append(path),
+                        on_closed=lambda: closed.append(True))
+    
+    await sink.close()
+    
+    assert completed == [], "No recording should be reported without frames"
+    assert closed == [True], "on_closed should run exactly once"
+
+
+class _FrameBackend:
+    """Backend that takes whole frames."""
+    
+    def __init__(self):
+        self.frames = []
+        self.closed = False
+        
+    async def write_frame(self, frame):
+        self.frames.append(frame)
+        
+    async def close(self):
+        self.closed = True
+
+
+class _ViewBackend:
+    """Backend that opts in to the shared luma view."""
+    
+    def __init__(self):
+        self.views = []
+        
+    async def write_frame(self, frame):
+        raise AssertionError("write_frame_view should take precedence")
+        
+    async def write_frame_view(self, view, pts):
+        self.views.append((view, pts))
+
+
+def _video_frame(pts):
+    """Build a small yuv420p frame with the given presentation timestamp."""
+    frame = av.VideoFrame.from_ndarray(np.zeros((48, 64, 3), dtype=np.uint8), format="rgb24")
+    frame = frame.reformat(format="yuv420p")
+    frame.pts = pts
+    return frame
+
+
+@pytest.mark.asyncio
+async def test_cv_fanout_sink_dispatch():
+    """Test that CVFanoutSink gives each backend the frame form it asks for."""
+    frame_backend, view_backend = _FrameBackend(), _ViewBackend()
+    sink = CVFanoutSink(frame_backend, view_backend)
+    
+    frames = [_video_frame(pts) for pts in range(3)]
+    for frame in frames:
+        await sink.write(frame)
+    await sink.write(object())  # Not a video frame, so never forwarded
+    await sink.close()
+    
+    assert frame_backend.frames == frames, "write_frame should get every frame in order"
+    assert [pts for _, pts in view_backend.views] == [0, 1, 2]
+    view = view_backend.views[0][0]
+    assert view.shape == (48, 64), "View should cover the visible luma plane"
+    assert not view.flags.writeable, "Shared view should be read-only"
+    assert frame_backend.closed, "close() should close the backends"
+
+
+@pytest.mark.asyncio
+async def test_cv_fanout_sink_drops_oldest_for_slow_backend():
+    """Test that a backend that can't keep up loses its oldest frames only."""
+    release = asyncio.Event()
+    
+    class SlowBackend(_FrameBackend):
+        async def write_frame(self, frame):
+            await release.wait()
+            await super().write_frame(frame)
+    
+    slow, fast = SlowBackend(), _FrameBackend()
+    sink = CVFanoutSink(slow, fast, buffer_size=2)
+    
+    frames = [_video_frame(pts) for pts in range(5)]
+    for frame in frames:
+        await sink.write(frame)
+        await asyncio.sleep(0)
+    release.set()
+    await sink.close()
+    
+    assert fast.frames == frames, "A fast backend should get every frame"
+    assert slow.frames[0] is frames[0], "The frame in flight should still be written"
+    assert slow.frames[-2:] == frames[-2:], "The newest frames should be kept"
+    assert sink.dropped_frames > 0